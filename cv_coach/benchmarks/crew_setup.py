@@ -0,0 +1,72 @@
+"""
+Measure per-request crew setup time, cold versus warm.
+
+"Cold" builds a new factory for every request, which is what review_cv did
+before the factory existed: a new LLM client, new agents and a new crew each
+time. "Warm" reuses one factory. Search tools and CV text are stubbed out
+because they are cached per CV and would otherwise hit the embedding API.
+No LLM calls are made. Besides the timings, the number of distinct LLM
+objects held by the agents shows whether the client is actually shared.
+
+Usage:
+    poetry run python benchmarks/crew_setup.py [requests]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+from agentic_cv_advisor.crews import CVCrewFactory
+from agentic_cv_advisor.sqlite import CVRecord
+
+# Clients are only constructed, never called
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+CV = CVRecord(1, "benchmark.pdf", "0" * 64, 0, None)
+QUERY = "Tailor my CV for a data engineering role"
+
+
+def _factory():
+    return CVCrewFactory(
+        tools_provider=lambda cv: [], text_provider=lambda cv: "Benchmark CV"
+    )
+
+
+def _time(setup, requests):
+    timings = []
+    llms = set()
+    for _ in range(requests):
+        start = time.perf_counter()
+        crew = setup()
+        timings.append((time.perf_counter() - start) * 1000)
+        llms.update(id(agent.llm) for agent in crew.agents)
+    return timings, len(llms)
+
+
+def _cold():
+    return _factory().build(CV, QUERY)
+
+
+def _warm(factory):
+    with factory.crew(CV, QUERY) as crew:
+        return crew
+
+
+def main(requests=50):
+    warm_factory = _factory()
+    # Prime the warm factory once, like the first request after startup
+    _warm(warm_factory)
+
+    for name, setup in (("cold", _cold), ("warm", lambda: _warm(warm_factory))):
+        timings, llms = _time(setup, requests)
+        print(
+            f"{name}: mean {statistics.mean(timings):.2f} ms, "
+            f"median {statistics.median(timings):.2f} ms, "
+            f"max {max(timings):.2f} ms over {requests} requests, "
+            f"{llms} distinct LLM objects"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,55 @@
+import hashlib
+import os
+import tempfile
+
+# Size of the pieces read from and written to the store
+CHUNK_SIZE = 1024 * 1024
+
+
+class BlobStore:
+    """Content-addressed file store that keeps every distinct payload once."""
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, content_hash):
+        """Return the on-disk location of a blob, fanned out by hash prefix."""
+        return os.path.join(self.root, content_hash[:2], content_hash)
+
+    def put(self, stream):
+        """
+        Store a binary stream chunk by chunk, hashing it on the way.
+
+        Args:
+            stream: File-like object opened in binary mode
+
+        Returns:
+            Tuple of the SHA-256 hex digest and the size in bytes
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                while chunk := stream.read(CHUNK_SIZE):
+                    digest.update(chunk)
+                    tmp_file.write(chunk)
+                    size += len(chunk)
+            content_hash = digest.hexdigest()
+            final_path = self.path_for(content_hash)
+            if os.path.exists(final_path):
+                # Identical payload already stored, keep the existing copy
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(tmp_path, final_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return content_hash, size
+
+    def open(self, content_hash):
+        """Open a stored blob for streaming reads."""
+        return open(self.path_for(content_hash), "rb")
@@ -1,43 +1,252 @@
+import os
+import queue
+import threading
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+
 from agentic_cv_advisor.agents import (
     create_cv_analysis_agent,
     create_targeted_improvement_agent,
 )
+from agentic_cv_advisor.response_cache import get_response_cache
+from agentic_cv_advisor.sqlite import get_cached_analysis, save_analysis
 from agentic_cv_advisor.tasks import (
+    PROMPT_VERSION,
     create_comprehensive_analysis_task,
     create_targeted_improvement_task,
 )
-from crewai import Crew, Process
-from langchain_openai import ChatOpenAI
+from agentic_cv_advisor.tools.cv_search import get_cv_search_tools, get_cv_text
+from crewai import LLM, Crew, Process
+
+MODEL_NAME = "gpt-4"
+TEMPERATURE = 0.3
+# Number of CVs whose idle analysis agents are kept, least recently used dropped first
+AGENT_POOL_SIZE = int(os.getenv("CV_COACH_AGENT_POOL_SIZE", "8"))
+
+# Event emitted while a review runs. `kind` is "step" for intermediate agent
+# output, "task" when a task finishes and "final" for the answer itself.
+ReviewEvent = namedtuple("ReviewEvent", ["kind", "text"])
+_DONE = object()
+
+
+class CVCrewFactory:
+    """
+    Warm, thread-safe factory for CV review crews
+
+    One crewai LLM is created and shared by every agent, and analysis agents
+    are kept in a per-CV pool, bounded to the most recently used CVs, so
+    consecutive requests reuse them. Only the tasks, the
+    query-specific agent and the crew itself are built per request. When a
+    comprehensive analysis is already known, the crew only runs the targeted
+    task with that analysis as context.
+    """
+
+    def __init__(
+        self,
+        model_name=MODEL_NAME,
+        temperature=TEMPERATURE,
+        tools_provider=get_cv_search_tools,
+        text_provider=get_cv_text,
+        pool_size=AGENT_POOL_SIZE,
+    ):
+        self.model_name = model_name
+        self.temperature = temperature
+        self.pool_size = pool_size
+        self._tools_provider = tools_provider
+        self._text_provider = text_provider
+        self._lock = threading.Lock()
+        self._llm = None
+        self._idle_agents = OrderedDict()
+
+    def get_llm(self):
+        """Return the shared language model"""
+        with self._lock:
+            if self._llm is None:
+                # Agents keep a crewai LLM as is but wrap any other model in a
+                # new LLM of their own, so only this shares one client
+                self._llm = LLM(model=self.model_name, temperature=self.temperature)
+            return self._llm
+
+    def _acquire_analysis_agent(self, cv, cv_tools):
+        # An agent is only ever used by one crew at a time
+        with self._lock:
+            idle = self._idle_agents.get(cv.content_hash)
+            if idle:
+                agent = idle.pop()
+                if not idle:
+                    del self._idle_agents[cv.content_hash]
+                # The crew about to run installs its own step callback
+                agent.step_callback = None
+                return agent
+        return create_cv_analysis_agent(self.get_llm(), cv_tools)
+
+    def _release_analysis_agent(self, cv, agent):
+        # A crew only sets the step callback of agents that have none, so the
+        # callback of the finished crew (and its event queue) must not stay on
+        # the pooled agent
+        agent.step_callback = None
+        with self._lock:
+            self._idle_agents.setdefault(cv.content_hash, []).append(agent)
+            self._idle_agents.move_to_end(cv.content_hash)
+            while len(self._idle_agents) > self.pool_size:
+                self._idle_agents.popitem(last=False)
+
+    def build(self, cv, query=None, analysis_agent=None, analysis=None, **crew_kwargs):
+        """Create a crew for CV review and improvement"""
+        llm = self.get_llm()
+
+        # Text and search tools are built once per CV content and shared by both agents
+        cv_tools = self._tools_provider(cv)
+
+        agents = []
+        tasks = []
+        if analysis is None:
+            if analysis_agent is None:
+                analysis_agent = create_cv_analysis_agent(llm, cv_tools)
+            cv_text = self._text_provider(cv)
+            agents.append(analysis_agent)
+            tasks.append(create_comprehensive_analysis_task(analysis_agent, cv_text))
+
+        # If a specific query is provided, create a targeted improvement task
+        if query:
+            improvement_agent = create_targeted_improvement_agent(llm, cv_tools, query)
+            targeted_task = create_targeted_improvement_task(
+                improvement_agent, query, analysis=analysis
+            )
+            agents.append(improvement_agent)
+            tasks.append(targeted_task)
+
+        # Configure and return crew
+        return Crew(
+            agents=agents,
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True,
+            **crew_kwargs,
+        )
+
+    @contextmanager
+    def crew(self, cv, query=None, analysis=None, **crew_kwargs):
+        """Build a crew from pooled agents and return them to the pool afterwards"""
+        if analysis is not None:
+            # Only the targeted task runs, no analysis agent is needed
+            yield self.build(cv, query, analysis=analysis, **crew_kwargs)
+            return
 
+        analysis_agent = self._acquire_analysis_agent(cv, self._tools_provider(cv))
+        try:
+            yield self.build(cv, query, analysis_agent=analysis_agent, **crew_kwargs)
+        finally:
+            self._release_analysis_agent(cv, analysis_agent)
 
-def create_cv_review_crew(cv_content, query=None):
+
+_crew_factory = None
+_crew_factory_lock = threading.Lock()
+
+
+def get_crew_factory():
+    """Return the process-wide crew factory"""
+    global _crew_factory
+    with _crew_factory_lock:
+        if _crew_factory is None:
+            _crew_factory = CVCrewFactory()
+        return _crew_factory
+
+
+def create_cv_review_crew(cv, query=None):
     """Create a crew for CV review and improvement"""
-    # Initialize language model
-    llm = ChatOpenAI(model_name="gpt-4", temperature=0.3)
+    return get_crew_factory().build(cv, query)
+
+
+def _step_text(step):
+    """Extract the human readable part of an agent step"""
+    return getattr(step, "thought", None) or getattr(step, "text", None) or str(step)
+
 
-    # Create agents
-    analysis_agent = create_cv_analysis_agent(llm, cv_content)
+def stream_review_cv(cv, query=None):
+    """
+    Run a CV review and yield ReviewEvents as the crew makes progress
 
-    # Create tasks
-    comprehensive_task = create_comprehensive_analysis_task(analysis_agent, cv_content)
+    The crew runs in a background thread and reports through step and task
+    callbacks, so the caller can render partial output while it works. The
+    last event is always the "final" one.
 
-    # If a specific query is provided, create a targeted improvement task
-    targeted_tasks = []
+    Only agent steps and finished tasks are streamed, not LLM tokens: each
+    step arrives once the model has returned its whole completion, so the
+    first event still comes after the first full LLM round trip.
+
+    Args:
+        cv (CVRecord): Metadata of the CV
+        query (str): Specific user question
+
+    Yields:
+        ReviewEvent for every agent step, finished task and the final answer,
+        never for partial tokens
+    """
+    factory = get_crew_factory()
+
+    # Repeated questions on the same CV are answered without running the crew
+    response_cache = get_response_cache()
     if query:
-        improvement_agent = create_targeted_improvement_agent(llm, cv_content, query)
-        targeted_task = create_targeted_improvement_task(improvement_agent, query)
-        targeted_tasks.append(targeted_task)
+        cached = response_cache.get(
+            cv.content_hash, query, factory.model_name, PROMPT_VERSION
+        )
+        if cached is not None:
+            yield ReviewEvent("final", cached)
+            return
+
+    # The comprehensive analysis only depends on the CV, the model and the
+    # prompts, so follow-up questions reuse it and only run the targeted task.
+    analysis = get_cached_analysis(cv.content_hash, factory.model_name, PROMPT_VERSION)
+    if analysis is not None and not query:
+        yield ReviewEvent("final", analysis)
+        return
 
-    # Configure and return crew
-    return Crew(
-        agents=[analysis_agent],
-        tasks=[comprehensive_task] + targeted_tasks,
-        process=Process.sequential,
-        verbose=True,
-    )
+    events = queue.Queue()
+    result = {}
+
+    def run():
+        try:
+            with factory.crew(
+                cv,
+                query,
+                analysis=analysis,
+                step_callback=lambda step: events.put(
+                    ReviewEvent("step", _step_text(step))
+                ),
+                task_callback=lambda output: events.put(
+                    ReviewEvent("task", output.raw)
+                ),
+            ) as cv_crew:
+                result["output"] = cv_crew.kickoff()
+        except Exception as e:
+            result["error"] = e
+        finally:
+            events.put(_DONE)
+
+    threading.Thread(target=run, name="cv-review", daemon=True).start()
+    while (event := events.get()) is not _DONE:
+        yield event
+
+    if "error" in result:
+        raise result["error"]
+    output = result["output"]
+    if analysis is None:
+        save_analysis(
+            cv.content_hash,
+            factory.model_name,
+            PROMPT_VERSION,
+            output.tasks_output[0].raw,
+        )
+    if query:
+        response_cache.put(
+            cv.content_hash, query, factory.model_name, PROMPT_VERSION, output.raw
+        )
+    yield ReviewEvent("final", output.raw)
 
 
-def review_cv(cv_content, query=None):
+def review_cv(cv, query=None):
     """Main function to initiate CV review process"""
-    cv_crew = create_cv_review_crew(cv_content, query)
-    return cv_crew.kickoff()
+    for event in stream_review_cv(cv, query):
+        if event.kind == "final":
+            return event.text
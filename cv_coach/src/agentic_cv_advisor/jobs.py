@@ -0,0 +1,88 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from agentic_cv_advisor import sqlite
+from agentic_cv_advisor.crews import stream_review_cv
+from agentic_cv_advisor.repository import get_repository
+
+# Maximum number of CV reviews running at the same time in this process
+REVIEW_WORKERS = int(os.getenv("CV_COACH_REVIEW_WORKERS", "4"))
+
+
+class ReviewJobQueue:
+    """
+    Runs CV reviews on a bounded worker pool, outside the Streamlit script thread
+
+    Jobs are persisted in the review_jobs table. A worker atomically claims a
+    job before running it, so a job is never executed twice, and the answer is
+    written to chat_history in the same transaction that marks the job done.
+    Jobs left running by a previous process are picked up again on startup,
+    which assumes a single server process owns the database.
+    """
+
+    def __init__(self, max_workers=REVIEW_WORKERS, repository=None):
+        self._repository = repository or get_repository()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="cv-review-job"
+        )
+        self._lock = threading.Lock()
+        self._recovered = False
+
+    def _recover(self):
+        with self._lock:
+            if self._recovered:
+                return
+            self._recovered = True
+        sqlite.requeue_running_review_jobs()
+        for job_id in sqlite.get_queued_review_jobs():
+            self._executor.submit(self._run, job_id)
+
+    def submit(self, cv_id, query):
+        """Enqueue a review and return the job ID, reusing an identical active job"""
+        self._recover()
+        job_id, created = sqlite.create_review_job(cv_id, query)
+        if created:
+            self._executor.submit(self._run, job_id)
+        return job_id
+
+    def get(self, job_id):
+        """Return the current state of a job, or None if there is no such job"""
+        # After a restart the first poll resumes the jobs queued by the previous process
+        self._recover()
+        return sqlite.get_review_job(job_id)
+
+    def _run(self, job_id):
+        if not sqlite.claim_review_job(job_id):
+            return
+        job = sqlite.get_review_job(job_id)
+        try:
+            cv = self._repository.get_cv_metadata(job.cv_id)
+            progress = []
+            response = None
+            for event in stream_review_cv(cv, job.query):
+                if event.kind == "final":
+                    response = event.text
+                else:
+                    progress.append(event.text)
+                    sqlite.update_review_job_partial(job_id, "\n\n".join(progress))
+            if response is None:
+                raise RuntimeError("the review ended without an answer")
+            self._repository.complete_review_job(job, response)
+        except Exception as e:
+            logging.error(f"Review job {job_id} failed: {e}")
+            sqlite.fail_review_job(job_id, str(e))
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """Return the process-wide review job queue"""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = ReviewJobQueue()
+        return _job_queue
@@ -1,21 +1,64 @@
 import sys
 from time import sleep
-from agentic_cv_advisor.crews import review_cv
 import streamlit as st
 import streamlit.web.cli as stcli
 import logging
-from agentic_cv_advisor.sqlite import (
-    get_chat_history,
-    init_db,
-    save_chat_to_db,
-    save_cv_to_db,
-    get_all_cvs,
-    get_cv_content,
-)
+from agentic_cv_advisor.jobs import get_job_queue
+from agentic_cv_advisor.repository import get_repository
+from agentic_cv_advisor.response_cache import get_response_cache
 
 # Setup logging to direct output to terminal
 logging.basicConfig(level=logging.INFO)
 
+# Seconds between status checks of a running review job
+JOB_POLL_INTERVAL = 1
+
+
+def history_to_messages(turns):
+    """Convert stored chat turns into chat messages for display"""
+    messages = []
+    for user_msg, assistant_msg, _ in turns:
+        if user_msg:
+            messages.append({"role": "user", "content": user_msg})
+        if assistant_msg:
+            messages.append({"role": "assistant", "content": assistant_msg})
+    return messages
+
+
+def reload_chat_history(repository, cv_id):
+    """Replace the displayed turns with the latest stored page, keeping the greeting"""
+    turns, cursor = repository.get_chat_history_page(cv_id)
+    st.session_state.messages[1:] = history_to_messages(turns)
+    st.session_state.history_cursor = cursor
+
+
+def show_pending_review(job_queue, repository):
+    """Show the progress of the pending review job, polling until it finishes"""
+    job = job_queue.get(st.session_state.pending_job_id)
+    if job is None:
+        # The job is gone from the review_jobs table, show what was actually stored
+        del st.session_state.pending_job_id
+        logging.warning("Pending review job not found, reloading the chat history")
+        reload_chat_history(repository, st.session_state.selected_cv_id)
+        st.rerun()
+    elif job.status == "done":
+        # The worker already saved the answer to the chat history
+        del st.session_state.pending_job_id
+        st.session_state.messages.append({"role": "assistant", "content": job.result})
+        with st.chat_message("assistant"):
+            st.write(job.result)
+    elif job.status == "failed":
+        del st.session_state.pending_job_id
+        logging.error(f"Error processing query: {job.error}")
+        st.error("An error occurred while processing your request. Please try again.")
+    else:
+        with st.chat_message("assistant"):
+            with st.spinner("Analyzing your CV..."):
+                if job.partial:
+                    st.markdown(job.partial)
+                sleep(JOB_POLL_INTERVAL)
+        st.rerun()
+
 
 # App logic
 def CV_Coach():
@@ -27,8 +70,9 @@ def CV_Coach():
         "This application stores your data, included any uploaded CVs, but does not share it with anyone."
     )
 
-    # Initialize the database
-    init_db()
+    # Reads go through the process-wide cache, only writes reach the database
+    repository = get_repository()
+    repository.init_db()
 
     # Sidebar for CV upload and selection
     with st.sidebar:
@@ -37,17 +81,19 @@ def CV_Coach():
         )
         if uploaded_file and st.button("Save CV"):
 
-            save_cv_to_db(uploaded_file)
+            repository.save_cv(uploaded_file)
             st.sidebar.success("CV uploaded successfully!")
 
         st.sidebar.markdown("### Uploaded CVs")
-        cvs = get_all_cvs()
+        cvs = repository.get_all_cvs()
         if cvs:
             for cv_id, filename, uploaded_at in cvs:
                 st.sidebar.write(f"**{filename}** (Uploaded: {uploaded_at})")
                 if st.sidebar.button(f"Select {filename}", key=f"select_{cv_id}"):
                     # Clear previous messages and load new chat history
                     st.session_state.selected_cv_id = cv_id
+                    # A pending review keeps running and lands in its own CV's history
+                    st.session_state.pop("pending_job_id", None)
                     st.session_state.messages = [
                         {
                             "role": "assistant",
@@ -55,18 +101,10 @@ def CV_Coach():
                         }
                     ]
 
-                    # Retrieve chat history for this specific CV
-                    saved_history = get_chat_history(cv_id)
-                    saved_history = get_chat_history(cv_id)
-                    for user_msg, assistant_msg, _ in saved_history:
-                        if user_msg:
-                            st.session_state.messages.append(
-                                {"role": "user", "content": user_msg}
-                            )
-                        if assistant_msg:
-                            st.session_state.messages.append(
-                                {"role": "assistant", "content": assistant_msg}
-                            )
+                    # Load only the most recent page of chat history for this CV
+                    turns, cursor = repository.get_chat_history_page(cv_id)
+                    st.session_state.messages.extend(history_to_messages(turns))
+                    st.session_state.history_cursor = cursor
         else:
             st.sidebar.info("No CVs uploaded yet.")
 
@@ -79,6 +117,16 @@ def CV_Coach():
             }
         ]
 
+    # Older turns are only fetched when the user asks for them
+    if st.session_state.get("history_cursor") and st.button("Load older messages"):
+        turns, cursor = repository.get_chat_history_page(
+            st.session_state.selected_cv_id,
+            before=st.session_state.history_cursor,
+        )
+        # Keep the greeting first and insert the older turns right after it
+        st.session_state.messages[1:1] = history_to_messages(turns)
+        st.session_state.history_cursor = cursor
+
     # Display previous conversation
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
@@ -86,49 +134,40 @@ def CV_Coach():
 
     # Handle chat input
     if "selected_cv_id" in st.session_state:
-        selected_cv_content = get_cv_content(st.session_state.selected_cv_id)
-        if selected_cv_content:
-            if prompt := st.chat_input("Your question"):
+        selected_cv = repository.get_cv_metadata(st.session_state.selected_cv_id)
+        if selected_cv:
+            job_queue = get_job_queue()
+            if prompt := st.chat_input(
+                "Your question", disabled="pending_job_id" in st.session_state
+            ):
                 st.session_state.messages.append({"role": "user", "content": prompt})
                 with st.chat_message("user"):
                     st.write(prompt)
 
-                # Simulate assistant response
-                with st.chat_message("assistant"):
-                    with st.spinner("Analyzing your CV..."):
-                        try:
-                            # Get CV content from database
-                            selected_cv_content = get_cv_content(
-                                st.session_state.selected_cv_id
-                            )
-
-                            # Perform CV review
-                            response = review_cv(selected_cv_content, prompt)
-
-                            st.session_state.messages.append(
-                                {"role": "assistant", "content": response}
-                            )
-                            st.write(response)
-
-                            # Save conversation to database
-                            save_chat_to_db(
-                                user_message=prompt,
-                                assistant_message=response,
-                                cv_id=st.session_state.selected_cv_id,
-                            )
-                        except Exception as e:
-                            logging.error(f"Error processing query: {e}")
-                            st.error(
-                                "An error occurred while processing your request. Please try again."
-                            )
+                try:
+                    # The review runs on the background worker pool, this rerun only enqueues it
+                    st.session_state.pending_job_id = job_queue.submit(
+                        selected_cv.id, prompt
+                    )
+                except Exception as e:
+                    logging.error(f"Error processing query: {e}")
+                    st.error(
+                        "An error occurred while processing your request. Please try again."
+                    )
+
+            if "pending_job_id" in st.session_state:
+                show_pending_review(job_queue, repository)
         else:
             st.warning("Selected CV could not be loaded. Please choose another.")
     else:
         st.info("Please upload or select a CV to start.")
 
+    logging.debug(f"CV repository cache stats: {repository.stats()}")
+    logging.debug(f"Response cache stats: {get_response_cache().stats()}")
+
 
 def run():
-    init_db()
+    get_repository().init_db()
     sys.argv = ["streamlit", "run", "src/agentic_cv_advisor/main.py"]
     sys.exit(stcli.main())
 
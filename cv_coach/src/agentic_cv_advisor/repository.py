@@ -0,0 +1,157 @@
+import os
+import threading
+from collections import OrderedDict
+
+from agentic_cv_advisor import sqlite
+
+# Maximum number of cached chat history pages, least recently used first out
+CHAT_PAGE_CACHE_SIZE = int(os.getenv("CV_COACH_CHAT_PAGE_CACHE_SIZE", "256"))
+
+
+class CVRepository:
+    """
+    Process-wide read-through cache over the SQLite helpers.
+
+    Reads are served from memory until a write through this repository
+    invalidates them, so a Streamlit rerun without writes never touches the
+    database. Writes made by other processes are not observed. Every
+    invalidation bumps a generation counter, and a value loaded while the
+    generation changed is returned but not cached, so a load racing with a
+    write never puts a stale result back.
+    """
+
+    def __init__(self, page_cache_size=CHAT_PAGE_CACHE_SIZE):
+        self._lock = threading.RLock()
+        self._schema_ready = False
+        self._generation = 0
+        self._cvs = None
+        self._metadata = {}
+        self._pages = OrderedDict()
+        self.page_cache_size = page_cache_size
+        self.hits = 0
+        self.misses = 0
+
+    def init_db(self):
+        """Create the schema once per process."""
+        with self._lock:
+            if not self._schema_ready:
+                sqlite.init_db()
+                self._schema_ready = True
+
+    def _lookup(self, cache, key, load, max_entries=None):
+        with self._lock:
+            if key in cache:
+                self.hits += 1
+                if max_entries is not None:
+                    cache.move_to_end(key)
+                return cache[key]
+            self.misses += 1
+            generation = self._generation
+        value = load()
+        with self._lock:
+            if self._generation == generation:
+                cache[key] = value
+                if max_entries is not None:
+                    while len(cache) > max_entries:
+                        cache.popitem(last=False)
+        return value
+
+    def get_all_cvs(self):
+        """Retrieve all uploaded CVs, cached until the next upload."""
+        with self._lock:
+            if self._cvs is not None:
+                self.hits += 1
+                return self._cvs
+            self.misses += 1
+            generation = self._generation
+        cvs = sqlite.get_all_cvs()
+        with self._lock:
+            if self._generation == generation:
+                self._cvs = cvs
+        return cvs
+
+    def get_cv_metadata(self, cv_id):
+        """Retrieve CV metadata, which never changes once uploaded."""
+        record = self._lookup(
+            self._metadata, cv_id, lambda: sqlite.get_cv_metadata(cv_id)
+        )
+        if record is None:
+            # Do not remember misses, the CV may be uploaded later
+            with self._lock:
+                self._metadata.pop(cv_id, None)
+        return record
+
+    def get_cv_path(self, cv_id):
+        """Retrieve the on-disk path of a CV payload."""
+        record = self.get_cv_metadata(cv_id)
+        return sqlite.get_blob_path(record.content_hash) if record else None
+
+    def get_cv_content(self, cv_id):
+        """Read CV content straight from the blob store."""
+        path = self.get_cv_path(cv_id)
+        if path is None:
+            return None
+        with open(path, "rb") as blob:
+            return blob.read()
+
+    def get_chat_history_page(self, cv_id, limit=sqlite.CHAT_PAGE_SIZE, before=None):
+        """Retrieve a page of chat history, cached until the next chat write."""
+        return self._lookup(
+            self._pages,
+            (cv_id, limit, before),
+            lambda: sqlite.get_chat_history_page(cv_id, limit=limit, before=before),
+            max_entries=self.page_cache_size,
+        )
+
+    def save_cv(self, file):
+        """Save an uploaded CV and invalidate the CV listing."""
+        cv_id = sqlite.save_cv_to_db(file)
+        with self._lock:
+            self._generation += 1
+            self._cvs = None
+        return cv_id
+
+    def save_chat(self, cv_id, user_message, assistant_message):
+        """Save a chat turn and invalidate the affected history pages."""
+        sqlite.save_chat_to_db(
+            cv_id=cv_id,
+            user_message=user_message,
+            assistant_message=assistant_message,
+        )
+        self._invalidate_latest_page(cv_id)
+
+    def _invalidate_latest_page(self, cv_id):
+        with self._lock:
+            self._generation += 1
+            # New turns only ever land on the latest page, older pages are
+            # addressed by a keyset cursor and stay valid.
+            for key in [k for k in self._pages if k[0] == cv_id and k[2] is None]:
+                del self._pages[key]
+
+    def complete_review_job(self, job, assistant_message):
+        """Persist the answer of a review job and invalidate the affected history pages."""
+        sqlite.complete_review_job(job.id, job.cv_id, job.query, assistant_message)
+        self._invalidate_latest_page(job.cv_id)
+
+    def stats(self):
+        """Return cache hit/miss counters and the hit rate."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def get_repository():
+    """Return the process-wide CV repository."""
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            _repository = CVRepository()
+        return _repository
@@ -0,0 +1,160 @@
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from langchain_openai import OpenAIEmbeddings
+
+# Maximum number of cached responses and how long they stay valid
+RESPONSE_CACHE_SIZE = int(os.getenv("CV_COACH_RESPONSE_CACHE_SIZE", "512"))
+RESPONSE_CACHE_TTL = int(os.getenv("CV_COACH_RESPONSE_CACHE_TTL", str(24 * 3600)))
+# Cosine similarity above which a differently worded question counts as a hit,
+# unset to only serve exact (normalized) matches
+SIMILARITY_THRESHOLD = os.getenv("CV_COACH_RESPONSE_SIMILARITY_THRESHOLD")
+
+
+def normalize_query(query):
+    """Normalize a question so trivially different wordings share a cache key"""
+    query = re.sub(r"[^\w\s]", " ", query.lower())
+    return " ".join(query.split())
+
+
+def _cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of review answers
+
+    Entries are keyed by CV content hash, normalized question, model and
+    prompt version. When an embedding function and a similarity threshold
+    are given, a miss on the exact key falls back to the most similar cached
+    question for the same CV, model and prompt version.
+    """
+
+    def __init__(
+        self,
+        max_entries=RESPONSE_CACHE_SIZE,
+        ttl=RESPONSE_CACHE_TTL,
+        embed_fn=None,
+        similarity_threshold=None,
+        clock=time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._vectors = {}
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    def _similarity_enabled(self):
+        return self.embed_fn is not None and self.similarity_threshold is not None
+
+    def _vector(self, normalized):
+        with self._lock:
+            if normalized in self._vectors:
+                return self._vectors[normalized]
+        vector = self.embed_fn(normalized)
+        with self._lock:
+            self._vectors[normalized] = vector
+        return vector
+
+    def _evict(self, now):
+        # Called with the lock held
+        for key in [k for k, (_, expires_at) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        live = {key[1] for key in self._entries}
+        for normalized in [q for q in self._vectors if q not in live]:
+            del self._vectors[normalized]
+
+    def get(self, content_hash, query, model, prompt_version):
+        """Return a cached answer for the question, or None"""
+        normalized = normalize_query(query)
+        key = (content_hash, normalized, model, prompt_version)
+        now = self._clock()
+        with self._lock:
+            self._evict(now)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            candidates = [
+                k
+                for k in self._entries
+                if (k[0], k[2], k[3]) == (content_hash, model, prompt_version)
+            ]
+
+        if candidates and self._similarity_enabled():
+            vector = self._vector(normalized)
+            best_key, best_score = None, self.similarity_threshold
+            for candidate in candidates:
+                score = _cosine(vector, self._vector(candidate[1]))
+                if score >= best_score:
+                    best_key, best_score = candidate, score
+            with self._lock:
+                if best_key in self._entries:
+                    self._entries.move_to_end(best_key)
+                    self.similar_hits += 1
+                    return self._entries[best_key][0]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, content_hash, query, model, prompt_version, response):
+        """Cache the answer to a question"""
+        normalized = normalize_query(query)
+        if self._similarity_enabled():
+            # Embed now so later lookups only need to embed the new question
+            self._vector(normalized)
+        key = (content_hash, normalized, model, prompt_version)
+        now = self._clock()
+        with self._lock:
+            self._entries[key] = (response, now + self.ttl)
+            self._entries.move_to_end(key)
+            self._evict(now)
+
+    def stats(self):
+        """Return hit/miss counters and the hit rate"""
+        with self._lock:
+            hits = self.hits + self.similar_hits
+            total = hits + self.misses
+            return {
+                "hits": self.hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "hit_rate": hits / total if total else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Return the process-wide response cache"""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            embed_fn = None
+            threshold = None
+            if SIMILARITY_THRESHOLD:
+                embed_fn = OpenAIEmbeddings().embed_query
+                threshold = float(SIMILARITY_THRESHOLD)
+            _response_cache = ResponseCache(
+                embed_fn=embed_fn, similarity_threshold=threshold
+            )
+        return _response_cache
@@ -1,111 +1,545 @@
-import sqlite3
+import atexit
+import io
 import os
+import queue
+import sqlite3
+import threading
+from collections import namedtuple
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from agentic_cv_advisor.blobstore import BlobStore
 
 # Set the database path inside the 'db' folder of the current package
 PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_DIR = os.path.join(PACKAGE_DIR, "db")
 os.makedirs(DB_DIR, exist_ok=True)  # Ensure the 'db' folder exists
 DB_PATH = os.path.join(DB_DIR, "cv_coach.db")
+# CV payloads live outside the database, keyed by their SHA-256
+BLOB_DIR = os.path.join(DB_DIR, "blobs")
+
+# Maximum number of connections handed out at the same time
+POOL_SIZE = int(os.getenv("CV_COACH_DB_POOL_SIZE", "8"))
+# Maximum number of chat inserts committed in a single transaction
+CHAT_BATCH_SIZE = 64
+# Number of chat turns loaded per page of history
+CHAT_PAGE_SIZE = 20
+
+# Applied to every connection. WAL lets readers run while a write transaction
+# is open, and synchronous=NORMAL is still crash-safe in WAL mode.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",
+)
+
+CVRecord = namedtuple(
+    "CVRecord", ["id", "filename", "content_hash", "size", "uploaded_at"]
+)
+ReviewJob = namedtuple(
+    "ReviewJob", ["id", "cv_id", "query", "status", "partial", "result", "error"]
+)
+
+INSERT_CHAT_SQL = """
+    INSERT INTO chat_history (cv_id, user_message, assistant_message)
+    VALUES (?, ?, ?);
+"""
+
+
+def _connect(path):
+    """Open a connection with the tuned pragmas applied."""
+    conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    """Thread-safe pool of persistent SQLite connections."""
+
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection, committing on success and rolling back on error."""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = _connect(self.path)
+            try:
+                with conn:
+                    yield conn
+            finally:
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Close all idle connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+# Queued by ChatWriter.close to stop the writer thread
+_STOP = object()
+
+
+class ChatWriter:
+    """Single background writer that groups concurrent chat inserts into one transaction."""
+
+    def __init__(self, path, batch_size=CHAT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, cv_id, user_message, assistant_message):
+        """Queue a chat insert and return a Future resolved once it is committed."""
+        future = Future()
+        self._ensure_started()
+        self._queue.put(((cv_id, user_message, assistant_message), future))
+        return future
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="cv-coach-chat-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        conn = _connect(self.path)
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = batch[-1] is _STOP
+                if stop:
+                    batch.pop()
+                if batch:
+                    self._write(conn, batch)
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def close(self):
+        """Commit the inserts still queued and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            # Queued behind every pending insert, so they are all committed first
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _write(self, conn, batch):
+        try:
+            with conn:
+                conn.executemany(INSERT_CHAT_SQL, [row for row, _ in batch])
+        except sqlite3.IntegrityError:
+            # A single bad row aborts the whole batch, so retry row by row and
+            # only fail the callers whose rows are actually invalid.
+            for row, future in batch:
+                try:
+                    with conn:
+                        conn.execute(INSERT_CHAT_SQL, row)
+                except sqlite3.Error as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(None)
+        except sqlite3.Error as e:
+            for _, future in batch:
+                future.set_exception(e)
+        else:
+            for _, future in batch:
+                future.set_result(None)
+
+
+_pool = ConnectionPool(DB_PATH)
+_chat_writer = ChatWriter(DB_PATH)
+# The writer thread is a daemon, so flush queued inserts before the interpreter exits
+atexit.register(_chat_writer.close)
+_blob_store = BlobStore(BLOB_DIR)
+
+
+def _migrate_cv_files(conn):
+    """Move CV payloads stored inline by older versions into the blob store."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(cv_files)")}
+    if "content_hash" not in columns:
+        conn.execute("ALTER TABLE cv_files ADD COLUMN content_hash TEXT")
+    if "size" not in columns:
+        conn.execute("ALTER TABLE cv_files ADD COLUMN size INTEGER")
+
+    legacy_ids = [
+        row[0]
+        for row in conn.execute("SELECT id FROM cv_files WHERE content_hash IS NULL")
+    ]
+    for cv_id in legacy_ids:
+        (content,) = conn.execute(
+            "SELECT content FROM cv_files WHERE id = ?", (cv_id,)
+        ).fetchone()
+        content_hash, size = _blob_store.put(io.BytesIO(content))
+        conn.execute(
+            "UPDATE cv_files SET content = x'', content_hash = ?, size = ? WHERE id = ?",
+            (content_hash, size, cv_id),
+        )
 
 
 def init_db():
     """Initialize SQLite database with necessary tables."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
+    with _pool.connection() as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cv_files (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                filename TEXT NOT NULL,
+                content BLOB NOT NULL,
+                uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                content_hash TEXT,
+                size INTEGER
+            )
         """
-        CREATE TABLE IF NOT EXISTS cv_files (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            filename TEXT NOT NULL,
-            content BLOB NOT NULL,
-            uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
-    """
-    )
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS chat_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            cv_id INTEGER NOT NULL,
-            user_message TEXT,
-            assistant_message TEXT,
-            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (cv_id) REFERENCES cv_files (id)
-        );
-        """
-    )
-    conn.commit()
-    conn.close()
+        # `content` is kept empty for new rows, the payload is in the blob store
+        _migrate_cv_files(conn)
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_cv_files_content_hash
+            ON cv_files (content_hash);
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS chat_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                cv_id INTEGER NOT NULL,
+                user_message TEXT,
+                assistant_message TEXT,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (cv_id) REFERENCES cv_files (id)
+            );
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cv_analyses (
+                content_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                analysis TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (content_hash, model, prompt_version)
+            );
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS review_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                cv_id INTEGER NOT NULL,
+                query TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                partial TEXT,
+                result TEXT,
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (cv_id) REFERENCES cv_files (id)
+            );
+            """
+        )
+        # At most one active job per CV and question, so resubmitting the
+        # same question while it is still being answered does not repeat work
+        conn.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_review_jobs_active
+            ON review_jobs (cv_id, query) WHERE status IN ('queued', 'running');
+            """
+        )
+        # Serves both the per-CV history scan and keyset pagination on
+        # (timestamp, id) without touching the table rows.
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_chat_history_cv_id_timestamp
+            ON chat_history (cv_id, timestamp, id);
+            """
+        )
 
 
 def save_cv_to_db(file):
-    """Save uploaded CV to the database."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT INTO cv_files (filename, content) VALUES (?, ?)
-    """,
-        (file.name, file.read()),
-    )
-    conn.commit()
-    conn.close()
+    """Save uploaded CV to the database and return its ID."""
+    # Stream the upload into the blob store, identical CVs share one payload
+    content_hash, size = _blob_store.put(file)
+    with _pool.connection() as conn:
+        cursor = conn.execute(
+            """
+            INSERT INTO cv_files (filename, content, content_hash, size)
+            VALUES (?, x'', ?, ?)
+        """,
+            (file.name, content_hash, size),
+        )
+        return cursor.lastrowid
 
 
 def get_all_cvs():
     """Retrieve all uploaded CVs from the database."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id, filename, uploaded_at FROM cv_files ORDER BY uploaded_at DESC"
-    )
-    files = cursor.fetchall()
-    conn.close()
-    return files
+    with _pool.connection() as conn:
+        return conn.execute(
+            "SELECT id, filename, uploaded_at FROM cv_files ORDER BY uploaded_at DESC"
+        ).fetchall()
+
+
+def get_cv_metadata(cv_id):
+    """Retrieve CV metadata by ID without touching the payload."""
+    with _pool.connection() as conn:
+        row = conn.execute(
+            """
+            SELECT id, filename, content_hash, size, uploaded_at
+            FROM cv_files WHERE id = ?
+            """,
+            (cv_id,),
+        ).fetchone()
+    return CVRecord(*row) if row else None
+
+
+def get_blob_path(content_hash):
+    """Return the on-disk path of a CV payload by its content hash."""
+    return _blob_store.path_for(content_hash)
+
+
+def get_cv_path(cv_id):
+    """Retrieve the on-disk path of a CV payload by ID."""
+    record = get_cv_metadata(cv_id)
+    return get_blob_path(record.content_hash) if record else None
+
+
+def open_cv_content(cv_id):
+    """Open CV content by ID for streaming reads."""
+    record = get_cv_metadata(cv_id)
+    return _blob_store.open(record.content_hash) if record else None
 
 
 def get_cv_content(cv_id):
     """Retrieve CV content by ID."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT content FROM cv_files WHERE id = ?", (cv_id,))
-    content = cursor.fetchone()
-    conn.close()
-    return content[0] if content else None
+    blob = open_cv_content(cv_id)
+    if blob is None:
+        return None
+    with blob:
+        return blob.read()
 
 
 def save_chat_to_db(cv_id, user_message, assistant_message):
     """Save chat messages associated with a specific CV."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    # Inserts go through the shared writer so concurrent sessions commit
+    # together instead of contending for the write lock.
+    future = _chat_writer.submit(cv_id, user_message, assistant_message)
     try:
-        cursor.execute(
-            """
-            INSERT INTO chat_history (cv_id, user_message, assistant_message)
-            VALUES (?, ?, ?);
-            """,
-            (cv_id, user_message, assistant_message),
-        )
-        conn.commit()
+        future.result()
     except sqlite3.IntegrityError as e:
         raise ValueError(f"Error saving chat: {e}")
-    finally:
-        conn.close()
 
 
 def get_chat_history(cv_id):
     """Retrieve chat history for a specific CV."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT user_message, assistant_message, timestamp 
-        FROM chat_history 
+    with _pool.connection() as conn:
+        return conn.execute(
+            """
+            SELECT user_message, assistant_message, timestamp
+            FROM chat_history
+            WHERE cv_id = ?
+            ORDER BY timestamp, id;
+            """,
+            (cv_id,),
+        ).fetchall()
+
+
+def get_chat_history_page(cv_id, limit=CHAT_PAGE_SIZE, before=None):
+    """
+    Retrieve the latest chat turns for a CV, older than `before` if given.
+
+    Args:
+        cv_id (int): ID of the CV the chat belongs to
+        limit (int): Maximum number of turns to return
+        before (tuple): Cursor returned by a previous call
+
+    Returns:
+        Tuple of the turns in chronological order and the cursor for the next
+        older page, or None when no older turns are left
+    """
+    query = """
+        SELECT id, user_message, assistant_message, timestamp
+        FROM chat_history
         WHERE cv_id = ?
-        ORDER BY timestamp;
-        """,
-        (cv_id,),
-    )
-    history = cursor.fetchall()
-    conn.close()
-    return history
+    """
+    params = [cv_id]
+    if before is not None:
+        query += " AND (timestamp, id) < (?, ?)"
+        params.extend(before)
+    query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+    # Fetch one extra row to know whether an older page exists
+    params.append(limit + 1)
+
+    with _pool.connection() as conn:
+        rows = conn.execute(query, params).fetchall()
+
+    cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        cursor = (rows[-1][3], rows[-1][0])
+    turns = [(user_msg, assistant_msg, ts) for _, user_msg, assistant_msg, ts in rows]
+    turns.reverse()
+    return turns, cursor
+
+
+def get_cached_analysis(content_hash, model, prompt_version):
+    """Retrieve a stored comprehensive analysis of a CV, if any."""
+    with _pool.connection() as conn:
+        row = conn.execute(
+            """
+            SELECT analysis FROM cv_analyses
+            WHERE content_hash = ? AND model = ? AND prompt_version = ?
+            """,
+            (content_hash, model, prompt_version),
+        ).fetchone()
+    return row[0] if row else None
+
+
+def save_analysis(content_hash, model, prompt_version, analysis):
+    """Store the comprehensive analysis of a CV for reuse by follow-up questions."""
+    with _pool.connection() as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO cv_analyses
+                (content_hash, model, prompt_version, analysis)
+            VALUES (?, ?, ?, ?)
+            """,
+            (content_hash, model, prompt_version, analysis),
+        )
+
+
+def create_review_job(cv_id, query):
+    """
+    Enqueue a review job, reusing the active job for the same question.
+
+    Returns:
+        Tuple of the job ID and whether a new job was created
+    """
+    with _pool.connection() as conn:
+        try:
+            cursor = conn.execute(
+                "INSERT INTO review_jobs (cv_id, query) VALUES (?, ?)",
+                (cv_id, query),
+            )
+            return cursor.lastrowid, True
+        except sqlite3.IntegrityError as e:
+            row = conn.execute(
+                """
+                SELECT id FROM review_jobs
+                WHERE cv_id = ? AND query = ? AND status IN ('queued', 'running')
+                """,
+                (cv_id, query),
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Error creating review job: {e}")
+            return row[0], False
+
+
+def get_review_job(job_id):
+    """Retrieve a review job by ID."""
+    with _pool.connection() as conn:
+        row = conn.execute(
+            """
+            SELECT id, cv_id, query, status, partial, result, error
+            FROM review_jobs WHERE id = ?
+            """,
+            (job_id,),
+        ).fetchone()
+    return ReviewJob(*row) if row else None
+
+
+def get_queued_review_jobs():
+    """Retrieve the IDs of all jobs waiting for a worker, oldest first."""
+    with _pool.connection() as conn:
+        rows = conn.execute(
+            "SELECT id FROM review_jobs WHERE status = 'queued' ORDER BY id"
+        ).fetchall()
+    return [row[0] for row in rows]
+
+
+def requeue_running_review_jobs():
+    """Put jobs left running by a previous process back into the queue."""
+    with _pool.connection() as conn:
+        conn.execute(
+            """
+            UPDATE review_jobs SET status = 'queued', updated_at = CURRENT_TIMESTAMP
+            WHERE status = 'running'
+            """
+        )
+
+
+def claim_review_job(job_id):
+    """Atomically mark a queued job as running, returning False if already taken."""
+    with _pool.connection() as conn:
+        cursor = conn.execute(
+            """
+            UPDATE review_jobs SET status = 'running', updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status = 'queued'
+            """,
+            (job_id,),
+        )
+        return cursor.rowcount == 1
+
+
+def update_review_job_partial(job_id, partial):
+    """Store the partial output of a running job for status polling."""
+    with _pool.connection() as conn:
+        conn.execute(
+            """
+            UPDATE review_jobs SET partial = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            """,
+            (partial, job_id),
+        )
+
+
+def complete_review_job(job_id, cv_id, user_message, assistant_message):
+    """Save the answer of a job to the chat history and mark it done atomically."""
+    with _pool.connection() as conn:
+        conn.execute(INSERT_CHAT_SQL, (cv_id, user_message, assistant_message))
+        conn.execute(
+            """
+            UPDATE review_jobs
+            SET status = 'done', result = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            """,
+            (assistant_message, job_id),
+        )
+
+
+def fail_review_job(job_id, error):
+    """Mark a job as failed."""
+    with _pool.connection() as conn:
+        conn.execute(
+            """
+            UPDATE review_jobs
+            SET status = 'failed', error = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            """,
+            (error, job_id),
+        )
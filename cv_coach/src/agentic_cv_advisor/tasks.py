@@ -1,5 +1,8 @@
 from crewai import Task
 
+# Bump whenever a task prompt changes so cached analyses are not reused
+PROMPT_VERSION = "1"
+
 
 def create_comprehensive_analysis_task(agent, cv_content):
     """
@@ -7,13 +10,13 @@ def create_comprehensive_analysis_task(agent, cv_content):
 
     Args:
         agent (Agent): CV analysis agent
-        cv_content (str): Content of the CV
+        cv_content (str): Extracted text of the CV
 
     Returns:
         Task for comprehensive CV review
     """
     return Task(
-        description=f"Perform a comprehensive analysis of the CV...",
+        description=f"Perform a comprehensive analysis of the CV below.\n\n{cv_content}",
         agent=agent,
         expected_output="""
         Detailed CV analysis including:
@@ -25,19 +28,23 @@ def create_comprehensive_analysis_task(agent, cv_content):
     )
 
 
-def create_targeted_improvement_task(agent, query):
+def create_targeted_improvement_task(agent, query, analysis=None):
     """
     Create a task for targeted CV improvement
 
     Args:
         agent (Agent): Improvement agent
         query (str): Specific user question
+        analysis (str): Previously computed comprehensive analysis of the CV
 
     Returns:
         Task for targeted CV improvement
     """
+    description = f"Address specific CV improvement query: {query}"
+    if analysis:
+        description += f"\n\nComprehensive analysis of the CV for context:\n\n{analysis}"
     return Task(
-        description=f"Address specific CV improvement query: {query}",
+        description=description,
         agent=agent,
         expected_output="Specific, actionable recommendations addressing the user's query",
     )
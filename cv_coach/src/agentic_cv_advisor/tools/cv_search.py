@@ -0,0 +1,103 @@
+import os
+import threading
+
+import docx2txt
+from crewai_tools import DOCXSearchTool, PDFSearchTool
+from pypdf import PdfReader
+
+from agentic_cv_advisor.sqlite import DB_DIR, get_blob_path
+
+# Extracted text and embeddings are persisted next to cv_coach.db, keyed by
+# the CV content hash, so they survive process restarts.
+TEXT_DIR = os.path.join(DB_DIR, "text")
+EMBEDDINGS_DIR = os.path.join(DB_DIR, "embeddings")
+
+_lock = threading.Lock()
+_texts = {}
+_tools = {}
+
+
+def detect_cv_format(path):
+    """Detect whether a stored CV is a PDF or a DOCX file from its magic bytes."""
+    with open(path, "rb") as blob:
+        header = blob.read(4)
+    if header.startswith(b"%PDF"):
+        return "pdf"
+    if header == b"PK\x03\x04":
+        return "docx"
+    raise ValueError(f"Unsupported CV format: {path}")
+
+
+def _extract_text(path):
+    if detect_cv_format(path) == "pdf":
+        reader = PdfReader(path)
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+    return docx2txt.process(path)
+
+
+def get_cv_text(cv):
+    """
+    Return the plain text of a CV, extracting it at most once per content hash
+
+    Args:
+        cv (CVRecord): Metadata of the CV
+
+    Returns:
+        Extracted text of the CV
+    """
+    with _lock:
+        if cv.content_hash in _texts:
+            return _texts[cv.content_hash]
+
+    text_path = os.path.join(TEXT_DIR, f"{cv.content_hash}.txt")
+    if os.path.exists(text_path):
+        with open(text_path, encoding="utf-8") as text_file:
+            text = text_file.read()
+    else:
+        text = _extract_text(get_blob_path(cv.content_hash))
+        os.makedirs(TEXT_DIR, exist_ok=True)
+        tmp_path = f"{text_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as text_file:
+            text_file.write(text)
+        os.replace(tmp_path, text_path)
+
+    with _lock:
+        _texts[cv.content_hash] = text
+    return text
+
+
+def get_cv_search_tools(cv):
+    """
+    Return the search tools for a CV, shared by all agents working on it
+
+    The vector store collection is persistent and named after the content
+    hash, so chunks that were embedded before are not embedded again.
+
+    Args:
+        cv (CVRecord): Metadata of the CV
+
+    Returns:
+        List of search tools bound to the CV
+    """
+    with _lock:
+        if cv.content_hash in _tools:
+            return _tools[cv.content_hash]
+
+    path = get_blob_path(cv.content_hash)
+    config = {
+        "vectordb": {
+            "provider": "chroma",
+            "config": {
+                "collection_name": f"cv-{cv.content_hash[:32]}",
+                "dir": EMBEDDINGS_DIR,
+            },
+        }
+    }
+    if detect_cv_format(path) == "pdf":
+        tools = [PDFSearchTool(pdf=path, config=config)]
+    else:
+        tools = [DOCXSearchTool(docx=path, config=config)]
+
+    with _lock:
+        # Another thread may have built the tools meanwhile, keep the first
+        return _tools.setdefault(cv.content_hash, tools)
@@ -0,0 +1,38 @@
+"""
+Helpers pointing the SQLite helpers at a fresh database for a single test.
+"""
+import os
+import tempfile
+from unittest.mock import patch
+
+from agentic_cv_advisor import sqlite
+from agentic_cv_advisor.blobstore import BlobStore
+
+
+def use_temp_database(test, init=True):
+    """
+    Replace the module-level connection pool, chat writer and blob store of
+    agentic_cv_advisor.sqlite with ones over a temporary directory, undone
+    when the test finishes.
+
+    Returns:
+        The temporary directory holding cv_coach.db and the blobs/ folder
+    """
+    tmp_dir = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp_dir.cleanup)
+    path = os.path.join(tmp_dir.name, "cv_coach.db")
+    pool = sqlite.ConnectionPool(path)
+    test.addCleanup(pool.close)
+    chat_writer = sqlite.ChatWriter(path)
+    test.addCleanup(chat_writer.close)
+    for name, value in (
+        ("_pool", pool),
+        ("_chat_writer", chat_writer),
+        ("_blob_store", BlobStore(os.path.join(tmp_dir.name, "blobs"))),
+    ):
+        patcher = patch.object(sqlite, name, value)
+        patcher.start()
+        test.addCleanup(patcher.stop)
+    if init:
+        sqlite.init_db()
+    return tmp_dir.name
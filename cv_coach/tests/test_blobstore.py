@@ -0,0 +1,97 @@
+import os
+import sys
+
+# Add the src directory to sys.path to ensure imports work correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import hashlib
+import io
+import tempfile
+import unittest
+
+from agentic_cv_advisor import blobstore, sqlite
+from agentic_cv_advisor.blobstore import BlobStore
+from sqlite_fixtures import use_temp_database
+
+
+def stored_files(root):
+    return sorted(os.path.relpath(os.path.join(d, name), root) for d, _, names in os.walk(root) for name in names)
+
+
+class FailingStream(io.BytesIO):
+    def read(self, size=-1):
+        if self.tell():
+            raise OSError("connection reset")
+        return super().read(size)
+
+
+class TestBlobStore(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.store = BlobStore(os.path.join(tmp_dir.name, "blobs"))
+
+    def test_put_streams_to_a_content_addressed_path(self):
+        data = b"x" * (blobstore.CHUNK_SIZE + 10)
+        content_hash, size = self.store.put(io.BytesIO(data))
+
+        self.assertEqual((content_hash, size), (hashlib.sha256(data).hexdigest(), len(data)))
+        self.assertEqual(stored_files(self.store.root), [os.path.join(content_hash[:2], content_hash)])
+        with self.store.open(content_hash) as blob:
+            self.assertEqual(blob.read(), data)
+
+    def test_identical_payloads_are_stored_once(self):
+        first = self.store.put(io.BytesIO(b"same CV"))
+        second = self.store.put(io.BytesIO(b"same CV"))
+        self.assertEqual(first, second)
+        self.assertEqual(len(stored_files(self.store.root)), 1)
+
+    def test_failed_write_leaves_no_temporary_file(self):
+        with self.assertRaises(OSError):
+            self.store.put(FailingStream(b"x" * (blobstore.CHUNK_SIZE * 2)))
+        self.assertEqual(stored_files(self.store.root), [])
+
+
+class TestCVStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = use_temp_database(self, init=False)
+
+    def test_uploads_share_blobs(self):
+        sqlite.init_db()
+        ids = []
+        for name in ("a.pdf", "b.pdf"):
+            file = io.BytesIO(b"same CV")
+            file.name = name
+            ids.append(sqlite.save_cv_to_db(file))
+
+        self.assertEqual(len(stored_files(os.path.join(self.tmp_dir, "blobs"))), 1)
+        self.assertEqual([sqlite.get_cv_content(cv_id) for cv_id in ids], [b"same CV", b"same CV"])
+        self.assertEqual(sqlite.get_cv_metadata(ids[1]).size, len(b"same CV"))
+
+    def test_inline_payloads_are_migrated_to_the_blob_store(self):
+        # The schema and data of versions storing the payload in the row
+        with sqlite._pool.connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE cv_files (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    filename TEXT NOT NULL,
+                    content BLOB NOT NULL,
+                    uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            conn.execute("INSERT INTO cv_files (filename, content) VALUES ('old.pdf', ?)", (b"old CV",))
+
+        sqlite.init_db()
+        sqlite.init_db()  # Running it again finds nothing left to migrate
+
+        record = sqlite.get_cv_metadata(1)
+        self.assertEqual((record.content_hash, record.size), (hashlib.sha256(b"old CV").hexdigest(), 6))
+        self.assertEqual(sqlite.get_cv_content(1), b"old CV")
+        with sqlite._pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT content FROM cv_files").fetchone()[0], b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
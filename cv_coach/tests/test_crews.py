@@ -0,0 +1,114 @@
+import os
+import sys
+
+# Add the src directory to sys.path to ensure imports work correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from agentic_cv_advisor import crews
+from agentic_cv_advisor.response_cache import ResponseCache
+from agentic_cv_advisor.sqlite import CVRecord
+from sqlite_fixtures import use_temp_database
+
+CV = CVRecord(1, "cv.pdf", "a" * 64, 0, None)
+
+
+class FakeCrew:
+    """Runs like crewai's Crew: agents keep a step callback they already have."""
+
+    def __init__(self, agents, tasks, step_callback=None, task_callback=None, **kwargs):
+        self.agents = agents
+        self.step_callback = step_callback
+        self.task_callback = task_callback
+
+    def kickoff(self):
+        for agent in self.agents:
+            if not agent.step_callback:
+                agent.step_callback = self.step_callback
+        for agent in self.agents:
+            agent.step_callback(SimpleNamespace(thought="thinking"))
+        output = SimpleNamespace(raw="analysis")
+        self.task_callback(output)
+        return SimpleNamespace(raw="analysis", tasks_output=[output])
+
+
+class TestStreamReviewCV(unittest.TestCase):
+    def setUp(self):
+        self.factory = crews.CVCrewFactory(
+            tools_provider=lambda cv: [], text_provider=lambda cv: "CV text"
+        )
+        patches = [
+            patch.object(crews, "get_crew_factory", return_value=self.factory),
+            patch.object(crews, "get_cached_analysis", return_value=None),
+            patch.object(crews, "save_analysis"),
+            patch.object(crews, "Crew", FakeCrew),
+            patch.object(crews, "create_comprehensive_analysis_task"),
+            patch.object(
+                crews,
+                "create_cv_analysis_agent",
+                side_effect=lambda llm, tools: SimpleNamespace(step_callback=None),
+            ),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_pooled_agent_streams_steps_on_every_run(self):
+        for _ in range(2):
+            events = list(crews.stream_review_cv(CV))
+            self.assertIn(crews.ReviewEvent("step", "thinking"), events)
+            self.assertEqual(events[-1], crews.ReviewEvent("final", "analysis"))
+        # Both runs used the same pooled agent
+        self.assertEqual(crews.create_cv_analysis_agent.call_count, 1)
+
+
+
+class TestCachedAnalysisReuse(unittest.TestCase):
+    def setUp(self):
+        use_temp_database(self)
+        factory = crews.CVCrewFactory(
+            tools_provider=lambda cv: [], text_provider=lambda cv: "CV text"
+        )
+        patches = [
+            patch.object(crews, "get_crew_factory", return_value=factory),
+            patch.object(crews, "get_response_cache", return_value=ResponseCache()),
+            patch.object(crews, "Crew", FakeCrew),
+            patch.object(crews, "create_comprehensive_analysis_task"),
+            patch.object(crews, "create_targeted_improvement_task"),
+            patch.object(crews, "create_targeted_improvement_agent"),
+            patch.object(
+                crews,
+                "create_cv_analysis_agent",
+                side_effect=lambda llm, tools: SimpleNamespace(step_callback=None),
+            ),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_analysis_runs_once_per_cv(self):
+        self.assertEqual(crews.review_cv(CV), "analysis")
+        self.assertEqual(crews.review_cv(CV), "analysis")
+        crews.create_comprehensive_analysis_task.assert_called_once()
+
+    def test_follow_up_only_runs_the_targeted_task(self):
+        crews.review_cv(CV)
+        crews.review_cv(CV, "Improve my summary")
+
+        crews.create_comprehensive_analysis_task.assert_called_once()
+        self.assertEqual(
+            crews.create_targeted_improvement_task.call_args.kwargs["analysis"], "analysis"
+        )
+
+    def test_new_prompt_version_runs_the_analysis_again(self):
+        crews.review_cv(CV)
+        with patch.object(crews, "PROMPT_VERSION", "2"):
+            crews.review_cv(CV)
+        self.assertEqual(crews.create_comprehensive_analysis_task.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import sys
+
+# Add the src directory to sys.path to ensure imports work correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from agentic_cv_advisor.sqlite import CVRecord
+from agentic_cv_advisor.tools import cv_search
+
+CV = CVRecord(1, "cv.pdf", "a" * 64, 0, None)
+
+
+class TestDetectCVFormat(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+
+    def blob(self, content):
+        path = os.path.join(self.tmp_dir, "blob")
+        with open(path, "wb") as blob:
+            blob.write(content)
+        return path
+
+    def test_pdf(self):
+        self.assertEqual(cv_search.detect_cv_format(self.blob(b"%PDF-1.7\n...")), "pdf")
+
+    def test_docx(self):
+        self.assertEqual(cv_search.detect_cv_format(self.blob(b"PK\x03\x04rest of the zip")), "docx")
+
+    def test_unsupported_format(self):
+        for content in (b"{\\rtf1", b"PK", b""):
+            with self.subTest(content=content), self.assertRaises(ValueError):
+                cv_search.detect_cv_format(self.blob(content))
+
+
+class TestGetCVText(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.text_dir = os.path.join(tmp_dir.name, "text")
+        patches = [
+            patch.object(cv_search, "TEXT_DIR", self.text_dir),
+            patch.object(cv_search, "_texts", {}),
+            patch.object(cv_search, "get_blob_path", return_value="blob"),
+            patch.object(cv_search, "_extract_text", return_value="CV text"),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_text_is_extracted_once(self):
+        self.assertEqual(cv_search.get_cv_text(CV), "CV text")
+        self.assertEqual(cv_search.get_cv_text(CV), "CV text")
+        cv_search._extract_text.assert_called_once_with("blob")
+        self.assertEqual(os.listdir(self.text_dir), [f"{CV.content_hash}.txt"])
+
+    def test_persisted_text_survives_a_restart(self):
+        cv_search.get_cv_text(CV)
+        cv_search._texts.clear()
+
+        self.assertEqual(cv_search.get_cv_text(CV), "CV text")
+        cv_search._extract_text.assert_called_once()
+
+
+class TestGetCVSearchTools(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            patch.object(cv_search, "_tools", {}),
+            patch.object(cv_search, "get_blob_path", return_value="blob"),
+            patch.object(cv_search, "detect_cv_format", return_value="pdf"),
+            patch.object(cv_search, "PDFSearchTool"),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_tools_are_shared_per_content_hash(self):
+        tools = cv_search.get_cv_search_tools(CV)
+        self.assertIs(cv_search.get_cv_search_tools(CV), tools)
+        cv_search.PDFSearchTool.assert_called_once()
+        config = cv_search.PDFSearchTool.call_args.kwargs["config"]["vectordb"]["config"]
+        self.assertEqual(config["collection_name"], f"cv-{CV.content_hash[:32]}")
+        self.assertEqual(config["dir"], cv_search.EMBEDDINGS_DIR)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+
+# Add the src directory to sys.path to ensure imports work correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import io
+import unittest
+from unittest.mock import patch
+
+from agentic_cv_advisor import jobs, sqlite
+from agentic_cv_advisor.crews import ReviewEvent
+from agentic_cv_advisor.repository import CVRepository
+from sqlite_fixtures import use_temp_database
+
+
+def upload(name="cv.pdf", data=b"%PDF cv"):
+    file = io.BytesIO(data)
+    file.name = name
+    return sqlite.save_cv_to_db(file)
+
+
+class TestReviewJobQueue(unittest.TestCase):
+    def setUp(self):
+        use_temp_database(self)
+        self.cv_id = upload()
+        self.queue = jobs.ReviewJobQueue(max_workers=1, repository=CVRepository())
+        self.addCleanup(self.queue._executor.shutdown)
+
+    def run_job(self, events):
+        with patch.object(jobs, "stream_review_cv", return_value=iter(events)):
+            job_id = self.queue.submit(self.cv_id, "How is my CV?")
+            self.queue._executor.shutdown(wait=True)
+        return self.queue.get(job_id)
+
+    def test_answer_is_saved_to_the_chat_history(self):
+        job = self.run_job([ReviewEvent("step", "thinking"), ReviewEvent("final", "Looks good")])
+        self.assertEqual((job.status, job.partial, job.result), ("done", "thinking", "Looks good"))
+        turns, _ = sqlite.get_chat_history_page(self.cv_id)
+        self.assertEqual([turn[:2] for turn in turns], [("How is my CV?", "Looks good")])
+
+    def test_review_without_an_answer_fails(self):
+        job = self.run_job([ReviewEvent("step", "thinking")])
+        self.assertEqual(job.status, "failed")
+        self.assertIn("without an answer", job.error)
+        self.assertEqual(sqlite.get_chat_history_page(self.cv_id)[0], [])
+
+    def test_missing_job_is_none(self):
+        self.assertIsNone(self.queue.get(12345))
+
+    def test_first_poll_resumes_jobs_of_a_previous_process(self):
+        # Left running when the previous process stopped
+        job_id, _ = sqlite.create_review_job(self.cv_id, "How is my CV?")
+        sqlite.claim_review_job(job_id)
+        with patch.object(jobs, "stream_review_cv", return_value=iter([ReviewEvent("final", "Resumed")])):
+            self.queue.get(job_id)
+            self.queue._executor.shutdown(wait=True)
+        self.assertEqual(self.queue.get(job_id).result, "Resumed")
+
+
+if __name__ == "__main__":
+    unittest.main()
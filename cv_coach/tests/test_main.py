@@ -0,0 +1,54 @@
+import os
+import sys
+
+# Add the src directory to sys.path to ensure imports work correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from agentic_cv_advisor import main
+
+
+class SessionState(dict):
+    """Dictionary with attribute access, like st.session_state."""
+
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+    __delattr__ = dict.__delitem__
+
+
+class TestShowPendingReview(unittest.TestCase):
+    def setUp(self):
+        self.st = MagicMock()
+        self.st.session_state = SessionState(
+            pending_job_id=7,
+            selected_cv_id=1,
+            messages=[{"role": "assistant", "content": "Welcome"}, {"role": "user", "content": "How is my CV?"}],
+        )
+        patcher = patch.object(main, "st", self.st)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_missing_job_reloads_the_chat_history(self):
+        job_queue, repository = MagicMock(), MagicMock()
+        job_queue.get.return_value = None
+        repository.get_chat_history_page.return_value = ([("Earlier question", "Earlier answer", "ts")], None)
+
+        main.show_pending_review(job_queue, repository)
+
+        self.assertNotIn("pending_job_id", self.st.session_state)
+        repository.get_chat_history_page.assert_called_once_with(1)
+        self.assertEqual(
+            self.st.session_state.messages,
+            [
+                {"role": "assistant", "content": "Welcome"},
+                {"role": "user", "content": "Earlier question"},
+                {"role": "assistant", "content": "Earlier answer"},
+            ],
+        )
+        self.st.rerun.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
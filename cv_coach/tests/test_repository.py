@@ -0,0 +1,72 @@
+import os
+import sys
+
+# Add the src directory to sys.path to ensure imports work correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import unittest
+from unittest.mock import patch
+
+from agentic_cv_advisor.repository import CVRepository
+
+
+class RepositoryTest(unittest.TestCase):
+    def setUp(self):
+        self.repository = CVRepository(page_cache_size=2)
+
+    def test_reads_are_cached_until_invalidated(self):
+        with patch("agentic_cv_advisor.sqlite.get_all_cvs", return_value=["a"]) as load, \
+                patch("agentic_cv_advisor.sqlite.save_cv_to_db", return_value=2):
+            self.assertEqual(self.repository.get_all_cvs(), ["a"])
+            self.assertEqual(self.repository.get_all_cvs(), ["a"])
+            self.assertEqual(load.call_count, 1)
+
+            self.repository.save_cv(object())
+            self.repository.get_all_cvs()
+        self.assertEqual(load.call_count, 2)
+
+    def test_load_racing_with_an_upload_is_not_cached(self):
+        listings = iter([["a"], ["a", "b"]])
+
+        def racing_load():
+            listing = next(listings)
+            if listing == ["a"]:
+                self.repository.save_cv(object())
+            return listing
+
+        with patch("agentic_cv_advisor.sqlite.get_all_cvs", side_effect=racing_load), \
+                patch("agentic_cv_advisor.sqlite.save_cv_to_db", return_value=2):
+            self.assertEqual(self.repository.get_all_cvs(), ["a"])
+            self.assertEqual(self.repository.get_all_cvs(), ["a", "b"])
+
+    def test_page_load_racing_with_a_chat_write_is_not_cached(self):
+        pages = iter([["old"], ["old", "new"]])
+
+        def racing_load(cv_id, limit, before):
+            page = next(pages)
+            if page == ["old"]:
+                self.repository.save_chat(1, "question", "answer")
+            return page
+
+        with patch("agentic_cv_advisor.sqlite.get_chat_history_page", side_effect=racing_load), \
+                patch("agentic_cv_advisor.sqlite.save_chat_to_db"):
+            self.assertEqual(self.repository.get_chat_history_page(1), ["old"])
+            self.assertEqual(self.repository.get_chat_history_page(1), ["old", "new"])
+            self.assertEqual(self.repository.get_chat_history_page(1), ["old", "new"])
+        self.assertEqual(self.repository.stats()["hits"], 1)
+
+    def test_chat_pages_are_bounded_lru(self):
+        with patch("agentic_cv_advisor.sqlite.get_chat_history_page", side_effect=lambda cv_id, limit, before: [cv_id]) as load:
+            for cv_id in (1, 2, 1, 3):
+                self.repository.get_chat_history_page(cv_id)
+            self.assertEqual(load.call_count, 3)
+            # 2 was the least recently used page when 3 was cached
+            self.repository.get_chat_history_page(1)
+            self.assertEqual(load.call_count, 3)
+            self.repository.get_chat_history_page(2)
+        self.assertEqual(load.call_count, 4)
+        self.assertEqual(len(self.repository._pages), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import sys
+
+# Add the src directory to sys.path to ensure imports work correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import unittest
+
+from agentic_cv_advisor.response_cache import ResponseCache, normalize_query
+
+CV_A = "a" * 64
+CV_B = "b" * 64
+
+VECTORS = {
+    "improve my summary": [1.0, 0.0, 0.0],
+    "make my summary better": [0.95, 0.3, 0.0],
+    "tailor for data engineer": [0.0, 0.0, 1.0],
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestNormalizeQuery(unittest.TestCase):
+    def test_case_punctuation_and_spacing_are_ignored(self):
+        self.assertEqual(normalize_query("  Improve my   SUMMARY?! "), "improve my summary")
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_exact_hit_on_the_normalized_question(self):
+        cache = ResponseCache(clock=self.clock)
+        cache.put(CV_A, "Improve my summary", "gpt-4", "1", "answer")
+
+        self.assertEqual(cache.get(CV_A, "improve my summary?", "gpt-4", "1"), "answer")
+        self.assertIsNone(cache.get(CV_B, "Improve my summary", "gpt-4", "1"))
+        self.assertIsNone(cache.get(CV_A, "Improve my summary", "gpt-4o", "1"))
+        self.assertIsNone(cache.get(CV_A, "Improve my summary", "gpt-4", "2"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 3)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResponseCache(max_entries=2, clock=self.clock)
+        cache.put(CV_A, "first", "gpt-4", "1", "1")
+        cache.put(CV_A, "second", "gpt-4", "1", "2")
+        cache.get(CV_A, "first", "gpt-4", "1")
+        cache.put(CV_A, "third", "gpt-4", "1", "3")
+
+        self.assertEqual(cache.get(CV_A, "first", "gpt-4", "1"), "1")
+        self.assertIsNone(cache.get(CV_A, "second", "gpt-4", "1"))
+        self.assertEqual(cache.get(CV_A, "third", "gpt-4", "1"), "3")
+        self.assertEqual(cache.stats()["entries"], 2)
+
+    def test_entries_expire_after_the_ttl(self):
+        cache = ResponseCache(ttl=60, clock=self.clock)
+        cache.put(CV_A, "question", "gpt-4", "1", "answer")
+
+        self.clock.now = 59
+        self.assertEqual(cache.get(CV_A, "question", "gpt-4", "1"), "answer")
+        self.clock.now = 60
+        self.assertIsNone(cache.get(CV_A, "question", "gpt-4", "1"))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_similar_question_is_served_above_the_threshold(self):
+        embedded = []
+
+        def embed(text):
+            embedded.append(text)
+            return VECTORS[text]
+
+        cache = ResponseCache(embed_fn=embed, similarity_threshold=0.9, clock=self.clock)
+        cache.put(CV_A, "Improve my summary", "gpt-4", "1", "answer")
+
+        self.assertEqual(cache.get(CV_A, "Make my summary better", "gpt-4", "1"), "answer")
+        self.assertIsNone(cache.get(CV_A, "Tailor for data engineer", "gpt-4", "1"))
+        # Similar questions are only matched against the same CV
+        self.assertIsNone(cache.get(CV_B, "Make my summary better", "gpt-4", "1"))
+        # Every question is embedded once
+        self.assertEqual(sorted(embedded), sorted(VECTORS))
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["similar_hits"], stats["misses"]), (0, 1, 2))
+        self.assertAlmostEqual(stats["hit_rate"], 1 / 3)
+
+    def test_similarity_is_disabled_without_a_threshold(self):
+        cache = ResponseCache(embed_fn=VECTORS.__getitem__, clock=self.clock)
+        cache.put(CV_A, "Improve my summary", "gpt-4", "1", "answer")
+        self.assertIsNone(cache.get(CV_A, "Make my summary better", "gpt-4", "1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+import os
+import sys
+
+# Add the src directory to sys.path to ensure imports work correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import sqlite3
+import threading
+import time
+import unittest
+
+from agentic_cv_advisor import sqlite
+from sqlite_fixtures import use_temp_database
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(use_temp_database(self), "pool.db")
+        self.pool = sqlite.ConnectionPool(self.path, size=1)
+        self.addCleanup(self.pool.close)
+
+    def test_connections_are_reused_with_pragmas(self):
+        with self.pool.connection() as conn:
+            first = conn
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 5000)
+        with self.pool.connection() as conn:
+            self.assertIs(conn, first)
+
+    def test_commits_on_success_and_rolls_back_on_error(self):
+        with self.pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+        with self.assertRaises(RuntimeError):
+            with self.pool.connection() as conn:
+                conn.execute("INSERT INTO t VALUES (2)")
+                raise RuntimeError("boom")
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT x FROM t").fetchall(), [(1,)])
+
+    def test_size_bounds_the_connections_in_use(self):
+        borrowed = threading.Event()
+
+        def borrow():
+            with self.pool.connection():
+                borrowed.set()
+
+        with self.pool.connection():
+            thread = threading.Thread(target=borrow)
+            thread.start()
+            # The only connection is in use, so the other thread has to wait
+            self.assertFalse(borrowed.wait(0.2))
+        self.assertTrue(borrowed.wait(5))
+        thread.join()
+
+
+class TestChatWriter(unittest.TestCase):
+    def setUp(self):
+        use_temp_database(self)
+        self.writer = sqlite._chat_writer
+        self.batches = []
+        self.release = threading.Event()
+        write = self.writer._write
+
+        def recording_write(conn, batch):
+            self.batches.append(len(batch))
+            # Hold the first batch back so the following inserts queue up
+            self.release.wait(5)
+            write(conn, batch)
+
+        self.writer._write = recording_write
+
+    def rows(self):
+        with sqlite._pool.connection() as conn:
+            return conn.execute("SELECT cv_id, user_message FROM chat_history ORDER BY id").fetchall()
+
+    def test_concurrent_inserts_are_committed_in_one_batch(self):
+        futures = [self.writer.submit(1, "first", "answer")]
+        while not self.batches:
+            time.sleep(0.01)
+        futures += [self.writer.submit(1, f"queued {i}", "answer") for i in range(5)]
+        self.release.set()
+        for future in futures:
+            future.result(timeout=5)
+        self.assertEqual(self.batches, [1, 5])
+        self.assertEqual(len(self.rows()), 6)
+
+    def test_invalid_row_only_fails_its_own_insert(self):
+        futures = [self.writer.submit(1, "ok", "answer"), self.writer.submit(None, "no CV", "answer")]
+        self.release.set()
+        futures[0].result(timeout=5)
+        with self.assertRaises(sqlite3.IntegrityError):
+            futures[1].result(timeout=5)
+        self.assertEqual(self.rows(), [(1, "ok")])
+
+    def test_close_flushes_queued_inserts(self):
+        futures = [self.writer.submit(1, f"turn {i}", "answer") for i in range(3)]
+        self.release.set()
+        self.writer.close()
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual(len(self.rows()), 3)
+        self.assertIsNone(self.writer._thread)
+
+    def test_save_chat_waits_for_the_commit(self):
+        self.release.set()
+        sqlite.save_chat_to_db(1, "question", "answer")
+        self.assertEqual(self.rows(), [(1, "question")])
+        with self.assertRaises(ValueError):
+            sqlite.save_chat_to_db(None, "question", "answer")
+
+
+class TestChatHistoryPages(unittest.TestCase):
+    def setUp(self):
+        use_temp_database(self)
+
+    def insert(self, cv_id, message, timestamp):
+        with sqlite._pool.connection() as conn:
+            conn.execute(
+                "INSERT INTO chat_history (cv_id, user_message, assistant_message, timestamp) VALUES (?, ?, ?, ?)",
+                (cv_id, message, "answer", timestamp),
+            )
+
+    def all_pages(self, cv_id, limit):
+        pages, cursor = [], None
+        while True:
+            turns, cursor = sqlite.get_chat_history_page(cv_id, limit=limit, before=cursor)
+            pages.append([turn[0] for turn in turns])
+            if cursor is None:
+                return pages
+
+    def test_pages_go_back_in_time_in_chronological_order(self):
+        for timestamp in ["2024-01-01 10:00:03", "2024-01-01 10:00:01", "2024-01-01 10:00:02"]:
+            self.insert(1, f"turn at {timestamp[-2:]}", timestamp)
+        self.insert(2, "other CV", "2024-01-01 10:00:04")
+
+        self.assertEqual(
+            self.all_pages(1, limit=2),
+            [["turn at 02", "turn at 03"], ["turn at 01"]],
+        )
+
+    def test_turns_with_the_same_timestamp_are_ordered_by_id(self):
+        # Turns saved within the same second share CURRENT_TIMESTAMP
+        for i in range(5):
+            self.insert(1, f"turn {i}", "2024-01-01 10:00:00")
+
+        pages = self.all_pages(1, limit=2)
+        self.assertEqual(pages, [["turn 3", "turn 4"], ["turn 1", "turn 2"], ["turn 0"]])
+
+    def test_last_page_has_no_cursor(self):
+        self.insert(1, "only turn", "2024-01-01 10:00:00")
+        self.assertEqual(sqlite.get_chat_history_page(1, limit=1)[1], None)
+        self.assertEqual(sqlite.get_chat_history_page(3), ([], None))
+
+
+
+class TestCachedAnalysis(unittest.TestCase):
+    def setUp(self):
+        use_temp_database(self)
+
+    def test_analysis_is_keyed_by_hash_model_and_prompt_version(self):
+        sqlite.save_analysis("a" * 64, "gpt-4", "1", "analysis")
+
+        self.assertEqual(sqlite.get_cached_analysis("a" * 64, "gpt-4", "1"), "analysis")
+        self.assertIsNone(sqlite.get_cached_analysis("b" * 64, "gpt-4", "1"))
+        self.assertIsNone(sqlite.get_cached_analysis("a" * 64, "gpt-4o", "1"))
+        self.assertIsNone(sqlite.get_cached_analysis("a" * 64, "gpt-4", "2"))
+
+    def test_saving_again_replaces_the_analysis(self):
+        sqlite.save_analysis("a" * 64, "gpt-4", "1", "old")
+        sqlite.save_analysis("a" * 64, "gpt-4", "1", "new")
+        self.assertEqual(sqlite.get_cached_analysis("a" * 64, "gpt-4", "1"), "new")
+
+
+if __name__ == "__main__":
+    unittest.main()
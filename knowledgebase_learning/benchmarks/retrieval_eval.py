@@ -0,0 +1,91 @@
+"""
+Evaluate vector-only against hybrid (BM25 + vector) retrieval end to end.
+
+Indexes the given PDFs once, then asks every question of a question file with
+each retrieval mode and reports, per question and on average, the number of
+search tool calls the agent made, the answer latency, and whether the answer
+contains the expected text. This calls the OpenAI API (OPENAI_API_KEY).
+
+The question file is a JSON list of objects with a "question" and an optional
+"expected" string, e.g. [{"question": "What does Article 5 prohibit?", "expected": "social scoring"}].
+
+Usage:
+    poetry run python benchmarks/retrieval_eval.py questions.json lecture1.pdf lecture2.pdf
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+# crew.py imports its siblings without the package prefix, as when run by Streamlit
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/learning_pdf_agent")))
+
+from learning_pdf_agent.crew import create_learning_pdf_coach_crew  # noqa: E402
+from learning_pdf_agent.tools.pdf_search import load_data  # noqa: E402
+
+MODES = {"vector": False, "hybrid": True}
+
+
+class LocalUpload(io.BytesIO):
+    """
+    A local file presented like a Streamlit UploadedFile.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            super().__init__(f.read())
+        self.name = os.path.basename(path)
+
+
+def ask(agent, question):
+    tool_calls = []
+    # Every agent step that names a tool is one tool call
+    agent.step_callback = lambda step: tool_calls.append(step) if getattr(step, "tool", None) else None
+    crew = create_learning_pdf_coach_crew(agent)
+    start = time.perf_counter()
+    answer = crew.kickoff(inputs={"user_question": question})
+    return str(answer), len(tool_calls), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("questions", help="JSON file with the evaluation questions")
+    parser.add_argument("pdfs", nargs="+", help="PDF files to index")
+    args = parser.parse_args()
+
+    with open(args.questions) as f:
+        questions = json.load(f)
+    agent = load_data([LocalUpload(path) for path in args.pdfs])
+    if agent is None:
+        sys.exit("None of the PDFs could be indexed.")
+    search_tool = agent.tools[0]
+
+    totals = {mode: {"tool_calls": [], "latency": [], "correct": []} for mode in MODES}
+    for item in questions:
+        print(item["question"])
+        for mode, hybrid in MODES.items():
+            search_tool.hybrid = hybrid
+            answer, tool_calls, latency = ask(agent, item["question"])
+            correct = item["expected"].lower() in answer.lower() if item.get("expected") else None
+            totals[mode]["tool_calls"].append(tool_calls)
+            totals[mode]["latency"].append(latency)
+            if correct is not None:
+                totals[mode]["correct"].append(correct)
+            correct_text = "" if correct is None else f"   expected found: {correct}"
+            print(f"  {mode:<7} tool calls {tool_calls:2d}   latency {latency:6.1f} s{correct_text}")
+
+    print("\nAverage per question")
+    for mode, values in totals.items():
+        accuracy = f"   accuracy {statistics.mean(values['correct']):.0%}" if values["correct"] else ""
+        print(
+            f"  {mode:<7} tool calls {statistics.mean(values['tool_calls']):4.1f}   "
+            f"latency {statistics.mean(values['latency']):6.1f} s{accuracy}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import numpy as np
+
+# Number of lists probed per query, the main recall/latency trade-off
+DEFAULT_NPROBE = 16
+# Number of k-means iterations used to train the coarse quantizer
+KMEANS_ITERATIONS = 10
+# Number of training vectors sampled per list
+TRAINING_SAMPLES_PER_LIST = 64
+# Rows scored at once when assigning vectors to lists, to bound memory use
+ASSIGN_BLOCK_SIZE = 8192
+
+
+def default_nlist(n):
+    """
+    Picks a number of lists for n vectors, following the usual rule of thumb of a
+    small multiple of sqrt(n).
+
+    Args:
+        n (int): Number of indexed vectors.
+
+    Returns:
+        int: The number of lists.
+    """
+    return max(1, min(n, int(2 * np.sqrt(n))))
+
+
+class IVFIndex:
+    """
+    An inverted file (IVF) index for approximate cosine similarity search over
+    L2-normalized vectors. A k-means quantizer splits the vectors into nlist lists;
+    a query only scores the vectors in the nprobe lists whose centroids are closest,
+    so nprobe trades recall for latency (nprobe == nlist is exact search).
+    Vectors are stored grouped by list, so every probed list is one contiguous slice.
+    """
+
+    def __init__(self, nlist=None, nprobe=DEFAULT_NPROBE, seed=0):
+        """
+        Args:
+            nlist (int): Number of lists, chosen from the number of vectors if not given.
+            nprobe (int): Default number of lists probed per query.
+            seed (int): Seed of the k-means initialization, for reproducible indexes.
+        """
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.seed = seed
+        self.centroids = None
+        self._vectors = None  # Vectors grouped by list
+        self._ids = None  # Original position of every vector in self._vectors
+        self._offsets = None  # self._vectors[self._offsets[i]:self._offsets[i + 1]] is list i
+
+    def __len__(self):
+        return 0 if self._ids is None else len(self._ids)
+
+    def _assign(self, vectors):
+        return np.concatenate([
+            np.argmax(vectors[start:start + ASSIGN_BLOCK_SIZE] @ self.centroids.T, axis=1)
+            for start in range(0, len(vectors), ASSIGN_BLOCK_SIZE)
+        ]) if len(vectors) else np.empty(0, dtype=np.int64)
+
+    def _train(self, vectors):
+        rng = np.random.default_rng(self.seed)
+        nlist = self.nlist or default_nlist(len(vectors))
+        nlist = min(nlist, len(vectors))
+        sample_size = min(len(vectors), nlist * TRAINING_SAMPLES_PER_LIST)
+        sample = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=nlist)
+            # Reseed empty lists with random training vectors
+            empty = counts == 0
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+        self.nlist = nlist
+        self.centroids = centroids
+
+    def _layout(self, vectors, ids, assignments):
+        order = np.argsort(assignments, kind="stable")
+        self._vectors = np.ascontiguousarray(vectors[order], dtype=np.float32)
+        self._ids = ids[order]
+        self._offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=self.nlist))])
+
+    def build(self, vectors):
+        """
+        Trains the quantizer on the vectors and indexes them.
+
+        Args:
+            vectors (np.ndarray): L2-normalized vectors, one per row. Row positions are the IDs
+                returned by search.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self._train(vectors)
+        self._layout(vectors, np.arange(len(vectors)), self._assign(vectors))
+
+    def add(self, vectors):
+        """
+        Adds vectors to the trained index without retraining the quantizer. Their IDs
+        continue after the already indexed vectors.
+
+        Args:
+            vectors (np.ndarray): L2-normalized vectors, one per row.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.centroids is None:
+            raise ValueError("The index must be built before vectors can be added.")
+        ids = np.arange(len(self), len(self) + len(vectors))
+        old_assignments = np.repeat(np.arange(self.nlist), np.diff(self._offsets))
+        self._layout(
+            np.vstack([self._vectors, vectors]),
+            np.concatenate([self._ids, ids]),
+            np.concatenate([old_assignments, self._assign(vectors)]),
+        )
+
+    def remove(self, removed):
+        """
+        Drops vectors from their lists without retraining the quantizer. The remaining
+        vectors are renumbered in order, so their IDs stay their positions once the
+        removed rows are deleted from the caller's arrays.
+
+        Args:
+            removed (np.ndarray): Boolean mask over IDs, True for the vectors to drop.
+        """
+        removed = np.asarray(removed, dtype=bool)
+        if len(removed) != len(self):
+            raise ValueError("The mask needs exactly one entry per indexed vector.")
+        new_ids = np.cumsum(~removed) - 1
+        keep = ~removed[self._ids]
+        # Lists stay contiguous and in order, so the kept rows need no new layout
+        assignments = np.repeat(np.arange(self.nlist), np.diff(self._offsets))[keep]
+        self._vectors = self._vectors[keep]
+        self._ids = new_ids[self._ids[keep]]
+        self._offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=self.nlist))])
+
+    def search(self, query_vector, k, nprobe=None, allowed=None):
+        """
+        Finds approximately the k vectors most similar to a query.
+
+        Args:
+            query_vector (np.ndarray): The L2-normalized query.
+            k (int): Maximum number of results.
+            nprobe (int): Number of lists to probe, the index default if not given.
+            allowed (np.ndarray): Optional boolean mask over IDs; other vectors are skipped.
+
+        Returns:
+            tuple: (ids, scores) arrays ordered by decreasing cosine similarity.
+        """
+        if not len(self):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        centroid_scores = self.centroids @ query_vector
+        lists = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        slices = [slice(self._offsets[i], self._offsets[i + 1]) for i in lists]
+        ids = np.concatenate([self._ids[s] for s in slices])
+        scores = np.concatenate([self._vectors[s] @ query_vector for s in slices])
+        if allowed is not None:
+            keep = allowed[ids]
+            ids, scores = ids[keep], scores[keep]
+        k = min(k, len(scores))
+        if k == 0:
+            return ids[:0], scores[:0]
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return ids[top], scores[top]
+
+    def save(self, path):
+        """
+        Saves the index to a NumPy .npz file.
+
+        Args:
+            path (str): Location of the file, or a binary file object.
+        """
+        np.savez(
+            path,
+            centroids=self.centroids,
+            vectors=self._vectors,
+            ids=self._ids,
+            offsets=self._offsets,
+            params=np.array([self.nlist, self.nprobe, self.seed]),
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads an index saved with save().
+
+        Args:
+            path (str): Location of the file.
+
+        Returns:
+            IVFIndex: The loaded index.
+        """
+        with np.load(path) as data:
+            nlist, nprobe, seed = (int(value) for value in data["params"])
+            index = cls(nlist=nlist, nprobe=nprobe, seed=seed)
+            index.centroids = data["centroids"]
+            index._vectors = data["vectors"]
+            index._ids = data["ids"]
+            index._offsets = data["offsets"]
+        return index
@@ -0,0 +1,101 @@
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+# BM25 term frequency saturation and document length normalization
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Words joined by dots or hyphens stay one term, so "5.2", "e-mail" or "GDPR-compliant" match exactly
+TOKEN_PATTERN = re.compile(r"\w+(?:[.\-]\w+)*")
+
+
+def tokenize(text):
+    """
+    Splits text into lowercase terms for lexical search.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        list: The terms, in order.
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    An inverted index scoring chunks with Okapi BM25. Every term maps to the IDs of
+    the chunks containing it and its frequency there, so a query only touches the
+    postings of its own terms. Chunk IDs are assigned in insertion order, matching
+    the positions of the chunks in the DocumentIndex.
+    """
+
+    def __init__(self, k1=BM25_K1, b=BM25_B):
+        """
+        Args:
+            k1 (float): Term frequency saturation.
+            b (float): Strength of the document length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings = {}  # term -> ([chunk IDs], [term frequencies])
+        self._lengths = []
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def add(self, texts):
+        """
+        Indexes chunk texts, giving them the next chunk IDs.
+
+        Args:
+            texts (list): The chunk texts.
+        """
+        for text in texts:
+            chunk_id = len(self._lengths)
+            terms = tokenize(text)
+            for term, frequency in Counter(terms).items():
+                ids, frequencies = self._postings.setdefault(term, ([], []))
+                ids.append(chunk_id)
+                frequencies.append(frequency)
+            self._lengths.append(len(terms))
+            self._total_length += len(terms)
+
+    def search(self, query, k, allowed=None):
+        """
+        Finds the chunks with the highest BM25 score for a query.
+
+        Args:
+            query (str): The query text.
+            k (int): Maximum number of results.
+            allowed (np.ndarray): Optional boolean mask over chunk IDs; other chunks are skipped.
+
+        Returns:
+            tuple: (ids, scores) arrays ordered by decreasing score, only chunks sharing a term with the query.
+        """
+        count = len(self._lengths)
+        if not count:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        lengths = np.asarray(self._lengths, dtype=np.float64)
+        average_length = self._total_length / count or 1.0
+        scores = np.zeros(count)
+        for term in set(tokenize(query)):
+            if term not in self._postings:
+                continue
+            ids, frequencies = self._postings[term]
+            ids = np.asarray(ids)
+            frequencies = np.asarray(frequencies, dtype=np.float64)
+            idf = math.log(1 + (count - len(ids) + 0.5) / (len(ids) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths[ids] / average_length)
+            scores[ids] += idf * frequencies * (self.k1 + 1) / (frequencies + norm)
+        if allowed is not None:
+            scores[~allowed] = 0.0
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return candidates, scores[candidates]
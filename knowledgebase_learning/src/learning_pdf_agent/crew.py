@@ -1,6 +1,12 @@
 from crewai import Crew, Process, Task
 from agent import create_learning_pdf_coach
 
+# The question (with its conversation context) is passed as kickoff(inputs={"user_question": ...})
+TASK_DESCRIPTION = (
+    "Use the tool 'Search a PDF's content' to find relevant information in the uploaded documents "
+    "and answer the user's question.\n\n{user_question}"
+)
+
 def create_learning_pdf_coach_crew(agent):
     """
     Creates a Crew for handling PDF-based tasks using the provided agent.
@@ -15,9 +21,10 @@ def create_learning_pdf_coach_crew(agent):
     """
     
     # Define the task for the agent, specifying that it should use the PDF search tool.
-    # The description should guide the agent on what actions to perform.
+    # The description should guide the agent on what actions to perform. CrewAI fills
+    # {user_question} from the inputs of every kickoff, so one crew serves every question.
     task = Task(
-        description="Use the tool 'Search a PDF's content' to find relevant information in the uploaded documents.",
+        description=TASK_DESCRIPTION,
         expected_output="A friendly, conversational response that answers the user's question based on the document content. Summarize it always to the key points.",
         agent=agent,
         verbose=True  # Enable verbose logging to capture each step of the task execution
@@ -0,0 +1,258 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from learning_pdf_agent.ann import IVFIndex
+from learning_pdf_agent.bm25 import BM25Index
+from learning_pdf_agent.embedding_cache import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Number of chunks returned by a search
+DEFAULT_TOP_K = 5
+# Number of chunks from which searches go through the approximate (IVF) index
+ANN_THRESHOLD = 20000
+# Directory of the trained IVF indexes, so a restarted process loads them instead of retraining
+ANN_CACHE_DIR = os.getenv("ANN_CACHE_DIR", os.path.join(CACHE_DIR, "ann"))
+# Number of saved IVF indexes kept in ANN_CACHE_DIR, least recently used removed first.
+# Sessions with different chunk sets share the directory, so it holds more than one.
+ANN_CACHE_MAX_INDEXES = int(os.getenv("ANN_CACHE_MAX_INDEXES", "8"))
+# Number of candidates each retriever contributes to the fused ranking, per requested result
+FUSION_CANDIDATES_PER_RESULT = 4
+# Rank offset of reciprocal rank fusion, damping the weight of the very first ranks
+RRF_K = 60
+
+SearchResult = namedtuple("SearchResult", ["score", "chunk"])
+
+
+class DocumentIndex:
+    """
+    A single in-memory vector index over the chunks of all uploaded documents.
+    Embeddings are stored L2-normalized in one matrix, so a search is one matrix-vector
+    product followed by a partial sort, regardless of how many documents are indexed.
+    Every chunk keeps its document ID and source, which allows filtering by document
+    and attributing results. Once the index holds ann_threshold chunks, searches use
+    an IVF index instead of scoring every chunk; it is retrained when the index has
+    doubled in size since it was last trained. Trained IVF indexes are saved in
+    ann_cache_dir under a fingerprint of the chunk set they were trained on, so the
+    same corpus is only trained once across process restarts; the least recently used
+    ones are removed once there are more than ann_cache_size. A BM25 inverted index over the same
+    chunks allows hybrid search: lexical and vector rankings are combined with
+    reciprocal rank fusion, so exact terms (article numbers, formula names) are found
+    even when their embeddings are not the closest.
+    """
+
+    def __init__(self, ann_threshold=ANN_THRESHOLD, ann_cache_dir=ANN_CACHE_DIR, ann_cache_size=ANN_CACHE_MAX_INDEXES):
+        """
+        Args:
+            ann_threshold (int): Number of chunks from which approximate search is used.
+            ann_cache_dir (str): Directory of the trained IVF indexes, or None to keep
+                them in memory only.
+            ann_cache_size (int): Maximum number of IVF indexes kept in ann_cache_dir.
+        """
+        self.ann_threshold = ann_threshold
+        self.ann_cache_dir = ann_cache_dir
+        self.ann_cache_size = ann_cache_size
+        self._ann = None
+        self._ann_trained_size = 0
+        self._bm25 = BM25Index()
+        self._lock = threading.RLock()
+        self._chunks = []
+        self._doc_codes = np.empty(0, dtype=np.int32)  # Position of each chunk's document in self._doc_ids
+        self._vectors = None
+        self._doc_ids = []
+        self._sources = {}
+
+    def __len__(self):
+        return len(self._chunks)
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def documents(self):
+        """
+        Returns:
+            dict: The source name of every indexed document, keyed by document ID.
+        """
+        with self._lock:
+            return dict(self._sources)
+
+    def add_document(self, doc_id, source, chunks, vectors):
+        """
+        Adds the chunks of one document and their embeddings to the index.
+
+        Args:
+            doc_id (str): The ID of the document.
+            source (str): The name of the document, used for attribution.
+            chunks (list): The Chunk objects of the document.
+            vectors (list): One embedding per chunk, in the same order.
+        """
+        if len(chunks) != len(vectors):
+            raise ValueError("Every chunk needs exactly one embedding.")
+        if not chunks:
+            return
+        with self._lock:
+            if doc_id not in self._sources:
+                self._doc_ids.append(doc_id)
+                self._sources[doc_id] = source
+            code = self._doc_ids.index(doc_id)
+            normalized = self._normalize(vectors)
+            self._vectors = normalized if self._vectors is None else np.vstack([self._vectors, normalized])
+            self._chunks.extend(chunks)
+            self._bm25.add([chunk.text for chunk in chunks])
+            self._doc_codes = np.concatenate([self._doc_codes, np.full(len(chunks), code, dtype=np.int32)])
+            self._update_ann(normalized)
+
+    def remove_document(self, doc_id):
+        """
+        Removes the chunks of one document from the index. The remaining chunks are
+        compacted and the lexical index is rebuilt over them since it addresses chunks
+        by position; the IVF index drops the removed rows from its lists and keeps its
+        trained quantizer.
+
+        Args:
+            doc_id (str): The ID of the document.
+
+        Returns:
+            bool: True if the document was indexed, False otherwise.
+        """
+        with self._lock:
+            if doc_id not in self._sources:
+                return False
+            code = self._doc_ids.index(doc_id)
+            keep = self._doc_codes != code
+            self._chunks = [chunk for chunk, kept in zip(self._chunks, keep) if kept]
+            self._vectors = self._vectors[keep] if self._chunks else None
+            self._doc_codes = self._doc_codes[keep]
+            self._doc_codes[self._doc_codes > code] -= 1
+            del self._doc_ids[code]
+            del self._sources[doc_id]
+            self._bm25 = BM25Index()
+            self._bm25.add([chunk.text for chunk in self._chunks])
+            if self._ann is not None and len(self._chunks) >= self.ann_threshold:
+                self._ann.remove(~keep)
+            else:
+                self._ann = None
+                self._ann_trained_size = 0
+            return True
+
+    def _update_ann(self, new_vectors):
+        if len(self._chunks) < self.ann_threshold:
+            return
+        if self._ann is None or len(self._chunks) >= 2 * self._ann_trained_size:
+            # Train on everything indexed so far, the quantizer follows the corpus as it grows
+            self._ann = self._load_or_train_ann()
+            self._ann_trained_size = len(self._chunks)
+        else:
+            self._ann.add(new_vectors)
+
+    def _ann_path(self):
+        # The IVF index addresses chunks by position, so the fingerprint covers the vectors in order
+        fingerprint = hashlib.sha256(self._vectors.tobytes()).hexdigest()
+        return os.path.join(self.ann_cache_dir, f"ivf-{fingerprint}.npz")
+
+    def _load_or_train_ann(self):
+        path = self._ann_path() if self.ann_cache_dir else None
+        if path and os.path.exists(path):
+            try:
+                ann = IVFIndex.load(path)
+                # The modification time orders the saved indexes by last use
+                os.utime(path)
+                return ann
+            except (OSError, ValueError, KeyError) as exc:
+                logger.warning("Could not load the IVF index %s, retraining it: %s", path, exc)
+        ann = IVFIndex()
+        ann.build(self._vectors)
+        if path:
+            self._save_ann(ann, path)
+        return ann
+
+    def _save_ann(self, ann, path):
+        try:
+            os.makedirs(self.ann_cache_dir, exist_ok=True)
+            # Written next to the target and renamed, so a crash never leaves a partial index
+            fd, tmp_path = tempfile.mkstemp(suffix=".npz", dir=self.ann_cache_dir)
+            with os.fdopen(fd, "wb") as f:
+                ann.save(f)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning("Could not save the IVF index to %s: %s", path, exc)
+            return
+        self._evict_saved_anns()
+
+    def _evict_saved_anns(self):
+        # Other sessions may be saving, loading or evicting in the same directory, so
+        # files can disappear at any point; a missing file is simply skipped.
+        saved = []
+        for name in os.listdir(self.ann_cache_dir):
+            if name.startswith("ivf-"):
+                path = os.path.join(self.ann_cache_dir, name)
+                try:
+                    saved.append((os.path.getmtime(path), path))
+                except OSError:
+                    pass
+        saved.sort(reverse=True)
+        for _, path in saved[self.ann_cache_size:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _vector_search(self, query_vector, k, allowed):
+        if self._ann is not None:
+            ids, scores = self._ann.search(query_vector, k, allowed=allowed)
+            # Fall back to exact search if the probed lists hold too few allowed chunks
+            if len(ids) == min(k, len(self._chunks) if allowed is None else int(allowed.sum())):
+                return ids, scores
+        scores = self._vectors @ query_vector
+        if allowed is not None:
+            scores = np.where(allowed, scores, -np.inf)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        top = top[np.isfinite(scores[top])]
+        return top, scores[top]
+
+    def search(self, query_vector, k=DEFAULT_TOP_K, doc_ids=None, query_text=None):
+        """
+        Finds the chunks most relevant to a query across all (or the selected) documents.
+
+        Args:
+            query_vector (list): The embedding of the query.
+            k (int): Maximum number of results.
+            doc_ids (iterable): Optional document IDs to restrict the search to.
+            query_text (str): Optional query text. If given, BM25 and vector rankings are
+                fused (hybrid search); otherwise results are ranked by vector similarity only.
+
+        Returns:
+            list: SearchResult objects ordered by decreasing relevance. Scores are cosine
+            similarities, or reciprocal rank fusion scores for hybrid search.
+        """
+        with self._lock:
+            if self._vectors is None:
+                return []
+            query_vector = self._normalize(query_vector)
+            allowed = None
+            if doc_ids is not None:
+                codes = [self._doc_ids.index(doc_id) for doc_id in doc_ids if doc_id in self._sources]
+                allowed = np.isin(self._doc_codes, codes)
+            if not query_text:
+                ids, scores = self._vector_search(query_vector, k, allowed)
+                return [SearchResult(float(score), self._chunks[i]) for i, score in zip(ids, scores)]
+
+            candidates = k * FUSION_CANDIDATES_PER_RESULT
+            fused = {}
+            for ids, _ in (self._vector_search(query_vector, candidates, allowed), self._bm25.search(query_text, candidates, allowed)):
+                for rank, chunk_id in enumerate(ids.tolist(), start=1):
+                    fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (RRF_K + rank)
+            best = sorted(fused.items(), key=lambda item: (-item[1], item[0]))[:k]
+            return [SearchResult(score, self._chunks[chunk_id]) for chunk_id, score in best]
@@ -0,0 +1,235 @@
+import logging
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+from learning_pdf_agent.document_index import DEFAULT_TOP_K, DocumentIndex
+
+# Number of documents no session uses any more that stay indexed, so they can be reattached without reprocessing
+MAX_UNREFERENCED_DOCUMENTS = int(os.getenv("MAX_UNREFERENCED_DOCUMENTS", "20"))
+
+
+class SharedDocumentStore:
+    """
+    A process-wide document index shared by all sessions. Every document is parsed,
+    embedded and held in memory once, however many sessions upload it. Documents are
+    reference-counted by the sessions' views; documents without references are kept
+    for reuse and evicted least recently released first beyond max_unreferenced.
+    """
+
+    def __init__(self, index=None, max_unreferenced=MAX_UNREFERENCED_DOCUMENTS):
+        """
+        Args:
+            index (DocumentIndex): The shared index, a new one if not given.
+            max_unreferenced (int): Maximum number of unreferenced documents kept indexed.
+        """
+        self.index = index or DocumentIndex()
+        self.max_unreferenced = max_unreferenced
+        self._lock = threading.Lock()
+        self._refcounts = {}
+        self._sizes = {}  # Number of chunks of every document
+        self._unreferenced = OrderedDict()  # Unreferenced documents, least recently released first
+
+    def __contains__(self, doc_id):
+        with self._lock:
+            return doc_id in self._sizes
+
+    def view(self):
+        """
+        Returns:
+            DocumentView: A new, empty view for one session.
+        """
+        return DocumentView(self)
+
+    def acquire(self, doc_id):
+        """
+        Adds a reference to an indexed document.
+
+        Args:
+            doc_id (str): The ID of the document.
+
+        Returns:
+            bool: True if the document is indexed, False if it has to be added first.
+        """
+        with self._lock:
+            if doc_id not in self._sizes:
+                return False
+            self._refcounts[doc_id] = self._refcounts.get(doc_id, 0) + 1
+            self._unreferenced.pop(doc_id, None)
+            return True
+
+    def add_and_acquire(self, doc_id, source, chunks, vectors):
+        """
+        Indexes a document, unless another session indexed it meanwhile, and adds a reference to it.
+
+        Args:
+            doc_id (str): The ID of the document.
+            source (str): The name of the document, used for attribution.
+            chunks (list): The Chunk objects of the document.
+            vectors (list): One embedding per chunk, in the same order.
+        """
+        with self._lock:
+            if doc_id not in self._sizes:
+                self.index.add_document(doc_id, source, chunks, vectors)
+                self._sizes[doc_id] = len(chunks)
+            self._refcounts[doc_id] = self._refcounts.get(doc_id, 0) + 1
+            self._unreferenced.pop(doc_id, None)
+
+    def release(self, doc_ids):
+        """
+        Removes one reference from each document and evicts the least recently released
+        unreferenced documents beyond the limit.
+
+        Args:
+            doc_ids (iterable): The IDs of the documents.
+        """
+        with self._lock:
+            for doc_id in doc_ids:
+                if doc_id not in self._refcounts:
+                    continue
+                self._refcounts[doc_id] -= 1
+                if self._refcounts[doc_id] == 0:
+                    del self._refcounts[doc_id]
+                    self._unreferenced[doc_id] = None
+            while len(self._unreferenced) > self.max_unreferenced:
+                doc_id, _ = self._unreferenced.popitem(last=False)
+                self.index.remove_document(doc_id)
+                del self._sizes[doc_id]
+                logging.info(f"Evicted unreferenced document {doc_id} from the shared index.")
+
+    def size(self, doc_id):
+        """
+        Returns:
+            int: The number of chunks of an indexed document, 0 if it is not indexed.
+        """
+        with self._lock:
+            return self._sizes.get(doc_id, 0)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of indexed, referenced and unreferenced documents and of chunks.
+        """
+        with self._lock:
+            return {
+                "documents": len(self._sizes),
+                "referenced": len(self._refcounts),
+                "unreferenced": len(self._unreferenced),
+                "chunks": len(self.index),
+            }
+
+
+class DocumentView:
+    """
+    One session's view of the shared store: the set of document IDs the session uses.
+    It offers the same search interface as a DocumentIndex, restricted to its own
+    documents. When the view is garbage-collected (the session ended), its references
+    are released.
+    """
+
+    def __init__(self, store):
+        """
+        Args:
+            store (SharedDocumentStore): The store the documents live in.
+        """
+        self.store = store
+        self._doc_ids = set()
+        self._sources = {}
+        # The finalizer holds the set, not the view, so the view can be collected
+        self._finalizer = weakref.finalize(self, store.release, self._doc_ids)
+
+    def __len__(self):
+        return sum(self.store.size(doc_id) for doc_id in self._doc_ids)
+
+    def documents(self):
+        """
+        Returns:
+            dict: The source name of every document in the view, keyed by document ID.
+        """
+        return dict(self._sources)
+
+    def attach(self, doc_id, source):
+        """
+        Adds a document to the view if it is already in the shared store, with no processing.
+
+        Args:
+            doc_id (str): The ID of the document.
+            source (str): The name under which this session uploaded it.
+
+        Returns:
+            bool: True if the document was attached, False if it still has to be processed.
+        """
+        if doc_id in self._doc_ids:
+            return True
+        if not self.store.acquire(doc_id):
+            return False
+        self._doc_ids.add(doc_id)
+        self._sources[doc_id] = source
+        return True
+
+    def add_document(self, doc_id, source, chunks, vectors):
+        """
+        Adds a newly processed document to the shared store and to the view.
+
+        Args:
+            doc_id (str): The ID of the document.
+            source (str): The name of the document, used for attribution.
+            chunks (list): The Chunk objects of the document.
+            vectors (list): One embedding per chunk, in the same order.
+        """
+        if doc_id in self._doc_ids or not chunks:
+            return
+        self.store.add_and_acquire(doc_id, source, chunks, vectors)
+        self._doc_ids.add(doc_id)
+        self._sources[doc_id] = source
+
+    def remove_document(self, doc_id):
+        """
+        Removes a document from the view and releases the session's reference to it.
+
+        Args:
+            doc_id (str): The ID of the document.
+
+        Returns:
+            bool: True if the document was in the view, False otherwise.
+        """
+        if doc_id not in self._doc_ids:
+            return False
+        self._doc_ids.discard(doc_id)
+        del self._sources[doc_id]
+        self.store.release([doc_id])
+        return True
+
+    def search(self, query_vector, k=DEFAULT_TOP_K, doc_ids=None, query_text=None):
+        """
+        Searches the documents of the view, see DocumentIndex.search.
+        """
+        allowed = set(self._doc_ids) if doc_ids is None else self._doc_ids.intersection(doc_ids)
+        if not allowed:
+            return []
+        return self.store.index.search(query_vector, k=k, doc_ids=allowed, query_text=query_text)
+
+    def close(self):
+        """
+        Releases all documents of the view at once, e.g. when documents are reprocessed from scratch.
+        """
+        self._finalizer()
+        self._doc_ids.clear()
+        self._sources.clear()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_document_store():
+    """
+    Returns:
+        SharedDocumentStore: The process-wide document store, created on first use.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SharedDocumentStore()
+        return _store
@@ -0,0 +1,195 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+
+# The cache lives in the 'db' folder of the package, next to other local state
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "db")
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(CACHE_DIR, "embedding_cache.sqlite3"))
+# Maximum number of cached embeddings, least recently used ones are evicted first
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+
+
+def cache_key(model, text):
+    """
+    Builds the cache key of a chunk, so the same text embedded with another model is a
+    different entry.
+
+    Args:
+        model (str): Name of the embedding model.
+        text (str): The chunk text.
+
+    Returns:
+        str: The hex SHA-256 digest of model and text.
+    """
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    A persistent, size-bounded cache of embeddings stored in SQLite. Entries are keyed by
+    chunk text hash and embedding model, so identical chunks are embedded only once across
+    sessions and restarts, no matter which document they come from.
+    """
+
+    def __init__(self, path=EMBEDDING_CACHE_PATH, max_entries=EMBEDDING_CACHE_MAX_ENTRIES):
+        """
+        Args:
+            path (str): Location of the SQLite database file.
+            max_entries (int): Maximum number of embeddings kept on disk.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+
+    def get_many(self, model, texts):
+        """
+        Looks up the cached embeddings of several texts at once.
+
+        Args:
+            model (str): Name of the embedding model.
+            texts (list): The chunk texts.
+
+        Returns:
+            dict: The embeddings found, keyed by text. Missing texts are left out.
+        """
+        keys = {cache_key(model, text): text for text in texts}
+        found = {}
+        with self._lock:
+            key_list = list(keys)
+            # Stay below SQLite's limit on the number of query parameters
+            for start in range(0, len(key_list), 500):
+                batch = key_list[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for key, vector in rows:
+                    found[keys[key]] = array("f", vector).tolist()
+            if found:
+                now = time.time()
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                        [(now, cache_key(model, text)) for text in found],
+                    )
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, model, texts, vectors):
+        """
+        Stores the embeddings of several texts and evicts the least recently used entries
+        beyond the size limit.
+
+        Args:
+            model (str): Name of the embedding model.
+            texts (list): The chunk texts.
+            vectors (list): One embedding per text, in the same order.
+        """
+        now = time.time()
+        rows = [(cache_key(model, text), model, array("f", vector).tobytes(), now) for text, vector in zip(texts, vectors)]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings (key, model, vector, last_used) VALUES (?, ?, ?, ?)", rows)
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+                self.evictions += excess
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of entries, size on disk, and hit/miss/eviction counters of this process.
+        """
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            total = self.hits + self.misses
+            return {
+                "entries": entries,
+                "size_bytes": os.path.getsize(self.path),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+class CachedEmbedder:
+    """
+    Wraps an embedder so only texts missing from the cache are sent to the embedding API.
+    Duplicate texts within one call are embedded once as well.
+    """
+
+    def __init__(self, embedder, cache):
+        """
+        Args:
+            embedder (Embedder): The embedder used for cache misses.
+            cache (EmbeddingCache): The cache to read from and write to.
+        """
+        self.embedder = embedder
+        self.cache = cache
+        self.model = embedder.model
+
+    def embed(self, texts):
+        """
+        Embeds a list of texts, using cached embeddings where available.
+
+        Args:
+            texts (list): The texts to embed.
+
+        Returns:
+            list: One embedding vector per text, in input order.
+        """
+        vectors = self.cache.get_many(self.model, texts)
+        missing = list(dict.fromkeys(text for text in texts if text not in vectors))
+        if missing:
+            new_vectors = self.embedder.embed(missing)
+            self.cache.put_many(self.model, missing, new_vectors)
+            vectors.update(zip(missing, new_vectors))
+        return [vectors[text] for text in texts]
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache():
+    """
+    Returns:
+        EmbeddingCache: The process-wide embedding cache, opened on first use.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmbeddingCache()
+        return _cache
+
+
+if __name__ == "__main__":
+    # Print a report of the on-disk cache, e.g. `python -m learning_pdf_agent.embedding_cache`
+    for name, value in get_embedding_cache().stats().items():
+        print(f"{name}: {value}")
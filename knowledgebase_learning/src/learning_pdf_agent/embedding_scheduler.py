@@ -0,0 +1,191 @@
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Maximum number of texts sent per embedding request
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "256"))
+# Maximum (estimated) number of tokens per request, below the provider's per-request limit
+EMBED_BATCH_TOKENS = int(os.getenv("EMBED_BATCH_TOKENS", "250000"))
+# Maximum number of embedding requests in flight at the same time
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+# How often a rate-limited or failed request is retried before giving up
+EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "6"))
+# First backoff delay in seconds, doubled on every retry
+EMBED_BACKOFF_SECONDS = 1.0
+# Status codes worth retrying: rate limits and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def estimate_tokens(text):
+    """
+    Roughly estimates the number of tokens in a text (about four characters per token
+    for English), which is good enough to keep batches below the request limit.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        int: The estimated token count.
+    """
+    return len(text) // 4 + 1
+
+
+def _status_code(exc):
+    # OpenAI errors carry 'status_code', urllib's HTTPError carries 'code'
+    return getattr(exc, "status_code", None) or getattr(exc, "code", None)
+
+
+def _retry_after(exc):
+    # The Retry-After header tells how long the provider wants us to wait, in seconds
+    headers = getattr(getattr(exc, "response", None), "headers", None) or getattr(exc, "headers", None)
+    try:
+        return float(headers.get("retry-after")) if headers else None
+    except (TypeError, ValueError):
+        return None
+
+
+class EmbeddingScheduler:
+    """
+    Schedules embedding requests: texts are coalesced into batches bounded by count and
+    estimated tokens, a fixed number of requests run concurrently, and rate-limited (429)
+    or transient failures are retried with exponential backoff. A rate limit pauses all
+    workers, not just the one that hit it, so the scheduler does not keep hammering the
+    provider. Throughput is tracked as chunks and tokens per second.
+    """
+
+    def __init__(
+        self,
+        embed_batch,
+        batch_size=EMBED_BATCH_SIZE,
+        max_batch_tokens=EMBED_BATCH_TOKENS,
+        max_in_flight=EMBED_CONCURRENCY,
+        max_retries=EMBED_MAX_RETRIES,
+        backoff=EMBED_BACKOFF_SECONDS,
+    ):
+        """
+        Args:
+            embed_batch (callable): Function embedding one batch of texts, returning a tuple
+                (vectors, token_count). token_count may be None if the provider does not report it.
+            batch_size (int): Maximum number of texts per request.
+            max_batch_tokens (int): Maximum estimated number of tokens per request.
+            max_in_flight (int): Maximum number of concurrent requests.
+            max_retries (int): Number of retries of a failing request.
+            backoff (float): First backoff delay in seconds.
+        """
+        self.embed_batch = embed_batch
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self._resume_at = 0.0  # Until when all workers pause after a rate limit
+        self._chunks = 0
+        self._tokens = 0
+        self._requests = 0
+        self._retries = 0
+        self._rate_limited = 0
+        self._seconds = 0.0
+
+    def make_batches(self, texts):
+        """
+        Coalesces texts into as few requests as the count and token limits allow.
+
+        Args:
+            texts (list): The texts to embed.
+
+        Returns:
+            list: Lists of texts, in input order.
+        """
+        batches = []
+        batch, batch_tokens = [], 0
+        for text in texts:
+            tokens = estimate_tokens(text)
+            if batch and (len(batch) >= self.batch_size or batch_tokens + tokens > self.max_batch_tokens):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(text)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _wait_for_rate_limit(self):
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _run_batch(self, batch):
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_rate_limit()
+            try:
+                vectors, tokens = self.embed_batch(batch)
+            except Exception as exc:
+                status = _status_code(exc)
+                if status not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                    raise
+                # Honour Retry-After if given, otherwise back off exponentially with jitter
+                delay = _retry_after(exc)
+                if delay is None:
+                    delay = self.backoff * (2 ** attempt) * (1 + random.random() / 2)
+                logging.warning(f"Embedding request failed with status {status}, retrying in {delay:.1f}s.")
+                with self._lock:
+                    self._retries += 1
+                    if status == 429:
+                        self._rate_limited += 1
+                    self._resume_at = max(self._resume_at, time.monotonic() + delay)
+                continue
+            if len(vectors) != len(batch):
+                raise ValueError(f"Expected {len(batch)} embeddings, got {len(vectors)}.")
+            with self._lock:
+                self._requests += 1
+                self._chunks += len(batch)
+                self._tokens += tokens if tokens is not None else sum(estimate_tokens(text) for text in batch)
+            return vectors
+
+    def run(self, texts):
+        """
+        Embeds a list of texts.
+
+        Args:
+            texts (list): The texts to embed.
+
+        Returns:
+            list: One embedding vector per text, in input order.
+        """
+        if not texts:
+            return []
+        batches = self.make_batches(texts)
+        started = time.monotonic()
+        try:
+            if len(batches) == 1:
+                results = [self._run_batch(batches[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_in_flight, len(batches))) as executor:
+                    results = list(executor.map(self._run_batch, batches))
+        finally:
+            with self._lock:
+                self._seconds += time.monotonic() - started
+        return [vector for batch in results for vector in batch]
+
+    def metrics(self):
+        """
+        Returns:
+            dict: Totals of chunks, tokens, requests, retries and rate limits, the time spent
+            embedding, and the resulting throughput in chunks/s and tokens/s.
+        """
+        with self._lock:
+            return {
+                "chunks": self._chunks,
+                "tokens": self._tokens,
+                "requests": self._requests,
+                "retries": self._retries,
+                "rate_limited": self._rate_limited,
+                "seconds": self._seconds,
+                "chunks_per_second": self._chunks / self._seconds if self._seconds else 0.0,
+                "tokens_per_second": self._tokens / self._seconds if self._seconds else 0.0,
+            }
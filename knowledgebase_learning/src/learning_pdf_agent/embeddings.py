@@ -0,0 +1,61 @@
+import threading
+
+from openai import OpenAI
+
+from learning_pdf_agent.embedding_scheduler import EMBED_BATCH_SIZE, EMBED_CONCURRENCY, EmbeddingScheduler
+
+
+class Embedder:
+    """
+    Embeds texts through the OpenAI embeddings API. Requests go through an
+    EmbeddingScheduler, which batches texts, bounds the number of concurrent requests
+    and backs off when the provider rate-limits us.
+    """
+
+    def __init__(self, model, api_key=None, base_url=None, batch_size=EMBED_BATCH_SIZE, max_in_flight=EMBED_CONCURRENCY):
+        """
+        Args:
+            model (str): Name of the embedding model, e.g. "text-embedding-ada-002".
+            api_key (str): OpenAI API key, read from the environment if not given.
+            base_url (str): Optional URL of an OpenAI-compatible API, e.g. a local test server.
+            batch_size (int): Maximum number of texts sent per request.
+            max_in_flight (int): Maximum number of concurrent requests.
+        """
+        self.model = model
+        self.api_key = api_key
+        self.base_url = base_url
+        self.scheduler = EmbeddingScheduler(self._embed_batch, batch_size=batch_size, max_in_flight=max_in_flight)
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        # Created lazily so building an Embedder never needs network or credentials.
+        # The client does not retry on its own, retries and backoff are left to the scheduler.
+        with self._lock:
+            if self._client is None:
+                self._client = OpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+            return self._client
+
+    def _embed_batch(self, batch):
+        response = self._get_client().embeddings.create(model=self.model, input=batch)
+        usage = getattr(response, "usage", None)
+        return [item.embedding for item in response.data], getattr(usage, "total_tokens", None)
+
+    def embed(self, texts):
+        """
+        Embeds a list of texts.
+
+        Args:
+            texts (list): The texts to embed.
+
+        Returns:
+            list: One embedding vector (list of floats) per text, in input order.
+        """
+        return self.scheduler.run(texts)
+
+    def metrics(self):
+        """
+        Returns:
+            dict: Throughput metrics of the embedding requests made so far.
+        """
+        return self.scheduler.metrics()
@@ -0,0 +1,183 @@
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pypdf import PdfReader
+
+# Size of a chunk and the overlap between consecutive chunks, in characters
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+# Maximum number of PDFs parsed at the same time, one process each
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+
+# A piece of a document, with enough metadata to attribute search results
+Chunk = namedtuple("Chunk", ["doc_id", "source", "page", "text"])
+
+
+def document_id(data):
+    """
+    Derives a stable document ID from the document content, so the same PDF uploaded
+    twice (under any name) maps to the same ID.
+
+    Args:
+        data (bytes-like): The raw content of the document, e.g. bytes, a memoryview or an mmap.
+
+    Returns:
+        str: The hex SHA-256 digest of the content.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def stream_document_id(stream):
+    """
+    Derives the document ID of a seekable binary stream without copying its content:
+    in-memory streams are hashed through their buffer, memory-mapped files directly.
+
+    Args:
+        stream: A BytesIO (such as a Streamlit UploadedFile) or an mmap.
+
+    Returns:
+        str: The hex SHA-256 digest of the content.
+    """
+    if hasattr(stream, "getbuffer"):
+        # Release the view right away, a BytesIO with an exported buffer cannot be resized
+        with stream.getbuffer() as view:
+            return document_id(view)
+    return document_id(stream)
+
+
+def chunk_text(text, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
+    """
+    Splits text into overlapping fixed-size chunks after normalizing whitespace.
+
+    Args:
+        text (str): The text to split.
+        chunk_size (int): Maximum number of characters per chunk.
+        overlap (int): Number of characters shared by consecutive chunks.
+
+    Returns:
+        list: The chunks, empty if the text has no content.
+    """
+    text = " ".join(text.split())
+    if not text:
+        return []
+    step = chunk_size - overlap
+    return [text[start:start + chunk_size] for start in range(0, max(len(text) - overlap, 1), step)]
+
+
+def parse_pdf(source, stream):
+    """
+    Extracts the text of a PDF page by page and splits it into chunks. The PDF is read
+    straight from the given stream, so no copy of the document is made.
+    This is a module-level function so it can run in a worker process.
+
+    Args:
+        source (str): The name of the document, used for attribution.
+        stream: The PDF as a seekable binary stream: a BytesIO (such as a Streamlit
+            UploadedFile) or an mmap.
+
+    Returns:
+        list: The Chunk objects of the document, in page order.
+    """
+    doc_id = stream_document_id(stream)
+    stream.seek(0)
+    reader = PdfReader(stream)
+    chunks = []
+    for page_number, page in enumerate(reader.pages, start=1):
+        for text in chunk_text(page.extract_text() or ""):
+            chunks.append(Chunk(doc_id, source, page_number, text))
+    return chunks
+
+
+def parse_spill_file(source, path):
+    """
+    Parses a PDF spilled to disk by memory-mapping it, so the worker process reads the
+    pages from the OS page cache instead of receiving a pickled copy of the upload.
+
+    Args:
+        source (str): The name of the document, used for attribution.
+        path (str): Location of the spill file.
+
+    Returns:
+        list: The Chunk objects of the document, in page order.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return parse_pdf(source, mapped)
+
+
+def spill_upload(uploaded_file, spill_dir):
+    """
+    Writes an upload to a spill file straight from its memory buffer, for handing it
+    to a worker process by path.
+
+    Args:
+        uploaded_file (UploadedFile): The uploaded file.
+        spill_dir (str): Directory the spill file is created in.
+
+    Returns:
+        str: Location of the spill file. The caller is responsible for removing it.
+    """
+    fd, path = tempfile.mkstemp(suffix=".pdf", dir=spill_dir)
+    with os.fdopen(fd, "wb") as f, uploaded_file.getbuffer() as view:
+        f.write(view)
+    return path
+
+
+def parse_documents(uploaded_files, progress_callback=None, max_workers=PARSE_WORKERS, spill_dir=None):
+    """
+    Parses and chunks the uploaded PDF files. A single file (or a single worker) is parsed
+    in this process, directly from the upload's memory buffer. Several files are parsed in
+    parallel on a process pool, since text extraction is CPU-bound: every upload is spilled
+    once to a file that the worker memory-maps, and each spill file is removed as soon as
+    its file has been parsed, whether parsing succeeded or not.
+
+    Args:
+        uploaded_files (list): List of uploaded PDF files from the user interface.
+        progress_callback (callable): Optional function called as
+            progress_callback(done, total, file_name) after each file, from the calling thread.
+        max_workers (int): Maximum number of worker processes.
+        spill_dir (str): Parent directory for spill files, typically owned by the user session,
+            defaulting to the system temporary directory. The spill files of one call live in
+            their own temporary directory, which is removed when the call returns.
+
+    Returns:
+        dict: The chunks of every successfully parsed file, keyed by upload position.
+    """
+    chunks_by_index = {}
+    if not uploaded_files:
+        return chunks_by_index
+
+    def finish(done, index, parse):
+        file_name = uploaded_files[index].name
+        try:
+            chunks_by_index[index] = parse()
+        except Exception as e:
+            # Skip the broken file and keep the others
+            logging.error(f"Error processing {file_name}: {e}")
+        if progress_callback:
+            progress_callback(done, len(uploaded_files), file_name)
+
+    workers = min(max_workers, len(uploaded_files))
+    if workers <= 1:
+        for done, (index, uploaded_file) in enumerate(enumerate(uploaded_files), start=1):
+            finish(done, index, lambda: parse_pdf(uploaded_file.name, uploaded_file))
+        return chunks_by_index
+
+    with tempfile.TemporaryDirectory(prefix="learning_pdf_spill_", dir=spill_dir) as call_dir:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for index, uploaded_file in enumerate(uploaded_files):
+                path = spill_upload(uploaded_file, call_dir)
+                futures[executor.submit(parse_spill_file, uploaded_file.name, path)] = (index, path)
+            # Report progress as files finish, in whatever order that happens
+            for done, future in enumerate(as_completed(futures), start=1):
+                index, path = futures[future]
+                try:
+                    finish(done, index, future.result)
+                finally:
+                    os.remove(path)
+    return chunks_by_index
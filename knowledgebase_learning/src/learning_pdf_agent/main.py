@@ -1,7 +1,9 @@
 import streamlit as st
 import logging
-from tools.pdf_search import load_data
+import tempfile
+from tools.pdf_search import load_data, update_data
 from crew import create_learning_pdf_coach_crew
+from memory import ConversationMemory
 
 # Setup logging to direct output to terminal
 logging.basicConfig(level=logging.INFO)
@@ -24,6 +26,13 @@ def agentic_AI_coach():
         st.session_state.agent = None
     if "crew" not in st.session_state:
         st.session_state.crew = None  # Store the crew for continued context
+    if "memory" not in st.session_state:
+        # Token-budgeted context of the conversation, sent along with every question
+        st.session_state.memory = ConversationMemory()
+    if "spill_dir" not in st.session_state:
+        # Scratch space for uploads handed to parser processes. It is removed together
+        # with the session state when the session ends, or at the latest on shutdown.
+        st.session_state.spill_dir = tempfile.TemporaryDirectory(prefix="learning_pdf_coach_")
 
     # Sidebar for file upload and document processing
     with st.sidebar:
@@ -35,19 +44,39 @@ def agentic_AI_coach():
                 st.sidebar.info(
                     "Processing your documents. This might take a while for large files."
                 )
-                agent_created = load_data(
-                    uploaded_files
-                )  # Load documents and create an agent
+                # Show per-file progress while the documents are processed in parallel
+                progress_bar = st.sidebar.progress(0.0)
+                processing_options = dict(
+                    progress_callback=lambda done, total, file_name: progress_bar.progress(
+                        done / total, text=f"Processed {file_name} ({done}/{total})"
+                    ),
+                    spill_dir=st.session_state.spill_dir.name,
+                )
+                if st.session_state.agent:
+                    # Only process added files and drop removed ones; the existing agent
+                    # and crew search the updated documents from the next question on
+                    agent_created = update_data(
+                        st.session_state.agent, uploaded_files, **processing_options
+                    )
+                else:
+                    agent_created = load_data(
+                        uploaded_files, **processing_options
+                    )  # Load documents and create an agent
                 if agent_created:
-                    st.session_state.agent = agent_created
+                    if agent_created is not st.session_state.agent:
+                        st.session_state.agent = agent_created
+                        # Let the agent's model keep the running summary of older messages
+                        st.session_state.memory.llm = agent_created.llm
+                        # Create crew only once after processing documents
+                        st.session_state.crew = create_learning_pdf_coach_crew(
+                            st.session_state.agent
+                        )
                     st.sidebar.success(
                         "Documents processed successfully. You can now ask your questions."
                     )
-                    # Create crew only once after processing documents
-                    st.session_state.crew = create_learning_pdf_coach_crew(
-                        st.session_state.agent
-                    )
                 else:
+                    st.session_state.agent = None
+                    st.session_state.crew = None
                     st.sidebar.warning("No valid documents uploaded.")
             except Exception as e:
                 logging.error(f"Error processing documents: {e}")
@@ -72,15 +101,9 @@ def agentic_AI_coach():
             with st.chat_message("user"):
                 st.write(prompt)
 
-            # Preserve conversation history to provide context for the agent
-            conversation_history = "\n".join(
-                [
-                    msg["content"]
-                    for msg in st.session_state.messages
-                    if msg["role"] == "assistant"
-                ]
-            )
-            prompt_with_history = f"{conversation_history}\n{prompt}"
+            # Provide the conversation context within a fixed token budget: a summary of
+            # older messages, earlier messages related to the question, and the latest ones
+            prompt_with_history = st.session_state.memory.build_prompt(prompt)
 
             # Process the user's question using the existing CrewAI agent
             with st.chat_message("assistant"):
@@ -122,6 +145,8 @@ def agentic_AI_coach():
                         st.session_state.messages.append(
                             {"role": "assistant", "content": response}
                         )
+                        st.session_state.memory.add("user", prompt)
+                        st.session_state.memory.add("assistant", response)
                     except Exception as e:
                         logging.error(f"Error during task execution: {e}")
                         st.error(
@@ -0,0 +1,265 @@
+import logging
+import os
+import re
+import threading
+from collections import namedtuple
+
+from learning_pdf_agent.embedding_scheduler import estimate_tokens
+
+try:
+    import tiktoken
+except ImportError:  # Fall back to an estimate when tiktoken is not available
+    tiktoken = None
+
+# Maximum number of tokens of conversation context sent with a question
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "2000"))
+# Number of most recent messages kept verbatim
+MEMORY_RECENT_TURNS = 6
+# Maximum number of older messages retrieved because they relate to the question
+MEMORY_RELEVANT_TURNS = 3
+# Share of the budget the running summary may use
+SUMMARY_BUDGET_SHARE = 0.25
+# Number of messages that left the window before they are folded into the summary in one LLM call
+SUMMARY_BATCH_TURNS = 4
+
+Turn = namedtuple("Turn", ["role", "content"])
+
+_encoding = None
+
+
+def count_tokens(text):
+    """
+    Counts the tokens of a text with the GPT-4o tokenizer, or estimates them if
+    tiktoken is not installed.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        int: The number of tokens.
+    """
+    global _encoding
+    if tiktoken is None:
+        return estimate_tokens(text)
+    if _encoding is None:
+        try:
+            _encoding = tiktoken.encoding_for_model("gpt-4o")
+        except KeyError:  # Older tiktoken releases do not know GPT-4o yet
+            _encoding = tiktoken.get_encoding("cl100k_base")
+    return len(_encoding.encode(text))
+
+
+def truncate_to_tokens(text, max_tokens, keep="end"):
+    """
+    Shortens a text to at most max_tokens tokens, cutting at word boundaries.
+
+    Args:
+        text (str): The text.
+        max_tokens (int): Maximum number of tokens.
+        keep (str): "end" keeps the end of the text, "start" keeps its beginning.
+
+    Returns:
+        str: The text, shortened if needed.
+    """
+    if max_tokens <= 0:
+        return ""
+    words = text.split()
+    while words and count_tokens(" ".join(words)) > max_tokens:
+        # Drop about a tenth of the words at a time instead of one by one
+        drop = max(1, len(words) // 10)
+        words = words[drop:] if keep == "end" else words[:-drop]
+    return " ".join(words)
+
+
+def _terms(text):
+    return {term for term in re.findall(r"\w+", text.lower()) if len(term) > 2}
+
+
+def format_turn(turn):
+    """
+    Formats a message as "Role: content" for the prompt.
+    """
+    return f"{turn.role.capitalize()}: {turn.content}"
+
+
+class ConversationMemory:
+    """
+    Token-budgeted memory of a chat session. The most recent messages are kept verbatim,
+    older ones are folded into a running summary in batches as they leave the window,
+    and older messages related to the new question are retrieved. The resulting context
+    never exceeds the token budget, however long the conversation gets.
+
+    The summary is updated by a background thread, so the LLM call never delays an answer.
+    Messages waiting to be folded in are sent next to the summary in the meantime.
+    """
+
+    def __init__(
+        self,
+        llm=None,
+        token_budget=MEMORY_TOKEN_BUDGET,
+        recent_turns=MEMORY_RECENT_TURNS,
+        relevant_turns=MEMORY_RELEVANT_TURNS,
+        summary_batch_turns=SUMMARY_BATCH_TURNS,
+    ):
+        """
+        Args:
+            llm (LLM): Optional language model used to update the summary. Without it (or
+                if the call fails) the summary keeps the latest older messages, truncated.
+            token_budget (int): Maximum number of tokens of context per question.
+            recent_turns (int): Number of most recent messages kept verbatim.
+            relevant_turns (int): Maximum number of older messages retrieved per question.
+            summary_batch_turns (int): Number of messages folded into the summary per LLM call.
+        """
+        self.llm = llm
+        self.token_budget = token_budget
+        self.recent_turns = recent_turns
+        self.relevant_turns = relevant_turns
+        self.summary_batch_turns = summary_batch_turns
+        self.summary = ""
+        self._recent = []  # Messages inside the window, oldest first
+        self._archive = []  # Messages that left the window, for retrieval
+        self._pending = []  # Archived messages not folded into the summary yet
+        self._lock = threading.Lock()
+        self._summarizer = None  # The background thread updating the summary, if running
+
+    def add(self, role, content):
+        """
+        Records a message. A message pushed out of the recent window is archived and
+        queued for the running summary. Once summary_batch_turns messages are queued, they
+        are folded into the summary in the background; without an LLM, right away.
+
+        Args:
+            role (str): "user" or "assistant".
+            content (str): The message.
+        """
+        with self._lock:
+            self._recent.append(Turn(role, str(content)))
+            while len(self._recent) > self.recent_turns:
+                turn = self._recent.pop(0)
+                self._archive.append(turn)
+                self._pending.append(turn)
+            if self.llm is None:
+                batch, self._pending = self._pending, []
+                self.summary = self._summarize(self.summary, batch)
+            elif len(self._pending) >= self.summary_batch_turns and self._summarizer is None:
+                self._summarizer = threading.Thread(target=self._summarize_pending, name="memory-summary", daemon=True)
+                self._summarizer.start()
+
+    def _summarize_pending(self):
+        """
+        Runs in the background thread: folds queued messages into the summary, batch by
+        batch, until fewer than summary_batch_turns are left.
+        """
+        while True:
+            with self._lock:
+                if len(self._pending) < self.summary_batch_turns:
+                    self._summarizer = None
+                    return
+                summary, batch = self.summary, list(self._pending)
+            summary = self._summarize(summary, batch)
+            with self._lock:
+                self.summary = summary
+                del self._pending[:len(batch)]
+
+    def _summarize(self, summary, turns):
+        max_tokens = int(self.token_budget * SUMMARY_BUDGET_SHARE)
+        messages = "\n".join(format_turn(turn) for turn in turns)
+        if self.llm is not None:
+            try:
+                summary = self.llm.call([
+                    {
+                        "role": "system",
+                        "content": "You maintain a running summary of a conversation about the user's documents. "
+                                   f"Update the summary with the new messages. Keep it under {max_tokens} tokens "
+                                   "and keep facts, names and open questions.",
+                    },
+                    {"role": "user", "content": f"Summary so far:\n{summary or '(empty)'}\n\nNew messages:\n{messages}"},
+                ])
+                return truncate_to_tokens(str(summary).strip(), max_tokens)
+            except Exception as e:
+                logging.warning(f"Could not update the conversation summary, keeping a truncated one: {e}")
+        return truncate_to_tokens(f"{summary}\n{messages}".strip(), max_tokens)
+
+    def wait_for_summary(self, timeout=None):
+        """
+        Waits until the background summary update, if any, has finished.
+
+        Args:
+            timeout (float): Maximum number of seconds to wait, no limit if None.
+        """
+        summarizer = self._summarizer
+        if summarizer is not None:
+            summarizer.join(timeout)
+
+    def relevant(self, question):
+        """
+        Finds the archived messages sharing the most terms with the question.
+
+        Args:
+            question (str): The new question.
+
+        Returns:
+            list: Up to relevant_turns Turn objects, in conversation order.
+        """
+        terms = _terms(question)
+        scored = [(len(terms & _terms(turn.content)), position) for position, turn in enumerate(self._archive)]
+        best = sorted((item for item in scored if item[0] > 0), reverse=True)[:self.relevant_turns]
+        return [self._archive[position] for _, position in sorted(best, key=lambda item: item[1])]
+
+    def build_prompt(self, question):
+        """
+        Builds the prompt for a new question: the running summary, related earlier messages
+        and the recent conversation, followed by the question, within the token budget.
+        The question is always included; the recent window is filled newest first.
+
+        Args:
+            question (str): The new question.
+
+        Returns:
+            str: The prompt to send to the crew.
+        """
+        remaining = self.token_budget
+        with self._lock:
+            # Messages not folded in yet follow the summary, so nothing is lost while it is updated
+            summary = "\n".join([self.summary] * bool(self.summary) + [format_turn(turn) for turn in self._pending])
+            recent_turns = list(self._recent)
+            pending = list(self._pending)
+        summary = truncate_to_tokens(summary, min(remaining, int(self.token_budget * SUMMARY_BUDGET_SHARE)))
+        summary_tokens = count_tokens(summary) if summary else 0
+        remaining -= summary_tokens
+
+        recent, recent_tokens = [], 0
+        for turn in reversed(recent_turns):
+            tokens = count_tokens(format_turn(turn))
+            if tokens > remaining:
+                break
+            recent.insert(0, turn)
+            recent_tokens += tokens
+            remaining -= tokens
+
+        relevant, relevant_tokens = [], 0
+        for turn in self.relevant(question):
+            if turn in pending:
+                continue  # Already sent next to the summary
+            tokens = count_tokens(format_turn(turn))
+            if tokens <= remaining:
+                relevant.append(turn)
+                relevant_tokens += tokens
+                remaining -= tokens
+
+        sections = []
+        if summary:
+            sections.append(f"Summary of the earlier conversation:\n{summary}")
+        if relevant:
+            sections.append("Related earlier messages:\n" + "\n".join(format_turn(turn) for turn in relevant))
+        if recent:
+            sections.append("Recent conversation:\n" + "\n".join(format_turn(turn) for turn in recent))
+        sections.append(f"Question: {question}")
+        prompt = "\n\n".join(sections)
+
+        logging.info(
+            f"Conversation memory: {count_tokens(prompt)} prompt tokens "
+            f"(summary {summary_tokens}, related {relevant_tokens} in {len(relevant)} messages, "
+            f"recent {recent_tokens} in {len(recent)} messages, budget {self.token_budget})"
+        )
+        return prompt
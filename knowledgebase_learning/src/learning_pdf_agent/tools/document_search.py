@@ -0,0 +1,72 @@
+from typing import Any, List, Optional, Type
+
+from crewai_tools import BaseTool
+from pydantic import BaseModel, Field
+
+from learning_pdf_agent.document_index import DEFAULT_TOP_K
+
+
+class DocumentSearchToolSchema(BaseModel):
+    """Input for DocumentSearchTool."""
+
+    query: str = Field(..., description="The question or keywords to search the uploaded documents for.")
+    documents: Optional[List[str]] = Field(
+        default=None,
+        description="Optional list of document file names to restrict the search to. Searches all documents if omitted.",
+    )
+
+
+def format_results(results, sources=None):
+    """
+    Formats search results for the agent, attributing each chunk to its document and page.
+
+    Args:
+        results (list): SearchResult objects as returned by DocumentIndex.search.
+        sources (dict): Optional document names keyed by document ID, such as the names
+            a session uploaded its documents under. Chunks of other documents keep the
+            name they were indexed with.
+
+    Returns:
+        str: The formatted results, or a notice if nothing was found.
+    """
+    if not results:
+        return "No relevant content found in the uploaded documents."
+    sources = sources or {}
+    return "\n\n".join(
+        f"[{rank}] {sources.get(result.chunk.doc_id, result.chunk.source)}, page {result.chunk.page}:\n{result.chunk.text}"
+        for rank, result in enumerate(results, start=1)
+    )
+
+
+class DocumentSearchTool(BaseTool):
+    """
+    A single search tool over the shared index of all uploaded documents. It returns the
+    globally most relevant chunks with their source document and page, so the agent needs
+    one tool call per search no matter how many documents were uploaded. Searches are
+    hybrid by default, so passages containing the exact terms of the query rank high.
+    """
+
+    name: str = "Search a PDF's content"
+    description: str = (
+        "Searches the content of all uploaded PDF documents at once and returns the most "
+        "relevant passages together with their document name and page number."
+    )
+    args_schema: Type[BaseModel] = DocumentSearchToolSchema
+    index: Any = None  # The DocumentIndex (or session DocumentView) to search
+    embedder: Any = None  # The Embedder used to embed queries
+    top_k: int = DEFAULT_TOP_K
+    hybrid: bool = True  # Fuse BM25 and vector rankings instead of using vector similarity only
+
+    def _run(self, query: str, documents: Optional[List[str]] = None) -> str:
+        # The names under which this session uploaded its documents; the shared index
+        # keeps the name of whichever session indexed a document first
+        sources = self.index.documents()
+        doc_ids = None
+        if documents:
+            # Translate file names into document IDs for the metadata filter
+            wanted = set(documents)
+            doc_ids = [doc_id for doc_id, source in sources.items() if source in wanted]
+        query_vector = self.embedder.embed([query])[0]
+        query_text = query if self.hybrid else None
+        results = self.index.search(query_vector, k=self.top_k, doc_ids=doc_ids, query_text=query_text)
+        return format_results(results, sources)
@@ -1,26 +1,100 @@
 import logging
-import tempfile
-from crewai_tools import PDFSearchTool
 from learning_pdf_agent.agent import create_learning_pdf_coach
+from learning_pdf_agent.document_store import get_document_store
+from learning_pdf_agent.embedding_cache import CachedEmbedder, get_embedding_cache
+from learning_pdf_agent.embeddings import Embedder
+from learning_pdf_agent.ingestion import parse_documents, stream_document_id
+from learning_pdf_agent.tools.document_search import DocumentSearchTool
 from crewai import LLM
 import os
 
-def load_data(uploaded_files):
+def sync_documents(index, embedder, uploaded_files, progress_callback=None, spill_dir=None):
     """
-    Processes the uploaded PDF files and creates instances of PDFSearchTool for each file.
-    The function also initializes the language models (LLMs) needed for PDF content extraction 
-    and document embedding. If tools are successfully created for the uploaded PDFs, an agent 
-    is created and returned; otherwise, it returns None.
+    Brings a session's view of the shared document store in line with the current uploads.
+    Uploads are identified by a hash of their content: files any session has processed
+    before are attached without processing, only the others are parsed and embedded, and
+    documents that are no longer uploaded are released. The view is updated in place, so
+    tools and crews already using it see the change on their next search.
 
     Args:
+        index (DocumentView): The session's view to update.
+        embedder (Embedder): The embedder used for the chunks of new files.
         uploaded_files (list): List of uploaded PDF files from the user interface.
+        progress_callback (callable): Optional function called as
+            progress_callback(done, total, file_name) after each new file is parsed.
+        spill_dir (str): Optional directory owned by the user session for the files handed
+            to parser processes. They are removed once parsed.
 
     Returns:
-        Agent: Returns the initialized agent with tools if files are processed successfully.
+        tuple: The IDs of the added documents and of the removed documents.
+    """
+    uploaded_files = uploaded_files or []
+    upload_ids = [stream_document_id(uploaded_file) for uploaded_file in uploaded_files]
+    indexed = index.documents()
+
+    uploaded_ids = set(upload_ids)
+    removed = [doc_id for doc_id in indexed if doc_id not in uploaded_ids]
+    for doc_id in removed:
+        index.remove_document(doc_id)
+
+    # The same PDF uploaded twice (under any name), or already processed by any session, is only parsed once
+    new_files, added, seen = [], [], set(indexed)
+    for doc_id, uploaded_file in zip(upload_ids, uploaded_files):
+        if doc_id not in seen:
+            seen.add(doc_id)
+            if index.attach(doc_id, uploaded_file.name):
+                added.append(doc_id)
+            else:
+                new_files.append(uploaded_file)
+    if new_files:
+        logging.info(f"Processing {len(new_files)} new of {len(uploaded_files)} uploaded PDF files.")
+        # Parse and chunk every new file in parallel, then embed all chunks in shared batches
+        chunks_by_index = parse_documents(new_files, progress_callback=progress_callback, spill_dir=spill_dir)
+
+        documents = {}
+        for position in sorted(chunks_by_index):
+            doc_chunks = chunks_by_index[position]
+            if doc_chunks and doc_chunks[0].doc_id not in documents:
+                documents[doc_chunks[0].doc_id] = doc_chunks
+
+        chunks = [chunk for doc_chunks in documents.values() for chunk in doc_chunks]
+        # Chunks embedded before (in any document or session) are served from the on-disk cache
+        cache = get_embedding_cache()
+        vectors = CachedEmbedder(embedder, cache).embed([chunk.text for chunk in chunks])
+        logging.info(f"Embedding cache: {cache.stats()}")
+        logging.info(f"Embedding throughput: {embedder.metrics()}")
+        offset = 0
+        for doc_id, doc_chunks in documents.items():
+            index.add_document(doc_id, doc_chunks[0].source, doc_chunks, vectors[offset:offset + len(doc_chunks)])
+            offset += len(doc_chunks)
+            added.append(doc_id)
+    logging.info(f"Index updated: {len(added)} documents added, {len(removed)} removed, {len(index.documents())} in this session.")
+    logging.info(f"Shared document store: {index.store.stats()}")
+    return added, removed
+
+
+def load_data(uploaded_files, progress_callback=None, spill_dir=None):
+    """
+    Processes the uploaded PDF files into the process-wide document store and creates a
+    single DocumentSearchTool over this session's view of it. Documents that any session
+    processed before are reused as they are. The PDFs are parsed and chunked in parallel, the chunks
+    of all files are embedded together (reusing cached embeddings of chunks seen before),
+    and each chunk keeps its document name and page so search results can be attributed.
+    The function also initializes the language models (LLMs) needed for answering
+    questions and document embedding. If any document is indexed, an agent is created
+    and returned; otherwise, it returns None.
+
+    Args:
+        uploaded_files (list): List of uploaded PDF files from the user interface.
+        progress_callback (callable): Optional function called as
+            progress_callback(done, total, file_name) after each file is parsed.
+        spill_dir (str): Optional directory owned by the user session for the files handed
+            to parser processes. They are removed once parsed.
+
+    Returns:
+        Agent: Returns the initialized agent with the search tool if files are processed successfully.
         None: Returns None if no valid documents are processed.
     """
-    tools = []  # List to hold the tools (PDFSearchTool) for each processed PDF
-    
     # Initialize the language model (GPT-4)
     llm_gpt4o = LLM(
         model="gpt-4o",  # GPT-4 language model
@@ -33,31 +107,46 @@ def load_data(uploaded_files):
         model="text-embedding-ada-002",  # Embedding model for document embeddings
         api_key=os.getenv("OPENAI_API_KEY")  # API key fetched from environment variables
     )
+    embedder = Embedder(model=embed_model.model, api_key=embed_model.api_key)
 
-    # Process each uploaded PDF file
+    index = get_document_store().view()
     if uploaded_files:
-        logging.info("Processing uploaded PDF files.")
-        for uploaded_file in uploaded_files:
-            # Save the uploaded file to a temporary location on the server
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                tmp_file.write(uploaded_file.getbuffer())  # Write file content to the temp file
-                tmp_file_path = tmp_file.name  # Save the file path for the PDFSearchTool
-
-            # Initialize the PDFSearchTool with the PDF file and language models
-            pdf_tool = PDFSearchTool(
-                pdf=tmp_file_path,  # Path to the temporary PDF file
-                llm=llm_gpt4o,  # Language model for answering questions about the PDF
-                embedder=embed_model,  # Embedding model for document searching
-                verbose=True  # Enable verbose logging for tool usage
-            )
-            tools.append(pdf_tool)  # Add the tool to the list of tools
-
-    # If tools are successfully created, return an agent
-    if tools:
-        # Create the agent using the tools and return it
-        agent = create_learning_pdf_coach(tools, llm_gpt4o)
+        sync_documents(index, embedder, uploaded_files, progress_callback=progress_callback, spill_dir=spill_dir)
+
+    # If any document was indexed, return an agent with one search tool over all of them
+    if len(index):
+        search_tool = DocumentSearchTool(index=index, embedder=embedder)
+        agent = create_learning_pdf_coach([search_tool], llm_gpt4o)
         return agent
     else:
         # Log a warning if no valid documents were processed
         logging.warning("No documents found to process.")
         return None
+
+
+def update_data(agent, uploaded_files, progress_callback=None, spill_dir=None):
+    """
+    Updates the documents searched by an existing agent to match the current uploads,
+    processing only new files and dropping removed ones. The agent, its crew and the
+    conversation are kept; the agent's search tool sees the updated index right away.
+
+    Args:
+        agent (Agent): An agent created by load_data.
+        uploaded_files (list): List of uploaded PDF files from the user interface.
+        progress_callback (callable): Optional function called as
+            progress_callback(done, total, file_name) after each new file is parsed.
+        spill_dir (str): Optional directory owned by the user session for the files handed
+            to parser processes. They are removed once parsed.
+
+    Returns:
+        Agent: The same agent if any document is still indexed.
+        None: Returns None if no valid documents remain.
+    """
+    search_tool = next(tool for tool in agent.tools if isinstance(tool, DocumentSearchTool))
+    sync_documents(
+        search_tool.index, search_tool.embedder, uploaded_files, progress_callback=progress_callback, spill_dir=spill_dir
+    )
+    if len(search_tool.index):
+        return agent
+    logging.warning("No documents found to process.")
+    return None
@@ -4,13 +4,18 @@ import os
 # Add the src directory to sys.path to ensure imports work correctly
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/learning_pdf_agent')))
 
+import io
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
-import tempfile
 from crewai import Agent, LLM
 from learning_pdf_agent.agent import create_learning_pdf_coach
-from learning_pdf_agent.tools.pdf_search import load_data
-from learning_pdf_agent.crew import create_learning_pdf_coach_crew
+from learning_pdf_agent.tools.pdf_search import load_data, update_data
+from learning_pdf_agent.crew import TASK_DESCRIPTION, create_learning_pdf_coach_crew
+from learning_pdf_agent.ingestion import Chunk, document_id
+from learning_pdf_agent.embedding_cache import EmbeddingCache
+from learning_pdf_agent.memory import ConversationMemory
+from learning_pdf_agent.document_store import SharedDocumentStore
 
 # Custom Mock Tool Class for Simulating PDF Search
 class MockPDFSearchTool:
@@ -33,6 +38,25 @@ class MockPDFSearchTool:
         """
         return "LangChain-Compatible Mock Tool"
 
+def make_upload(name, data):
+    """
+    Creates an in-memory stand-in for a Streamlit UploadedFile.
+    """
+    uploaded_file = io.BytesIO(data)
+    uploaded_file.name = name
+    return uploaded_file
+
+
+def fake_parse_documents(uploaded_files, **kwargs):
+    """
+    Stands in for parse_documents, producing one chunk per file without parsing any PDF.
+    """
+    return {
+        position: [Chunk(document_id(uploaded_file.getvalue()), uploaded_file.name, 1, f"Text of {uploaded_file.name}")]
+        for position, uploaded_file in enumerate(uploaded_files)
+    }
+
+
 class TestLearningPDFCoach(unittest.TestCase):
     """
     Unit tests for the Learning PDF Coach agent and related functions.
@@ -75,24 +99,58 @@ class TestLearningPDFCoach(unittest.TestCase):
     def test_load_data_with_valid_files(self):
         """
         Test the load_data function by providing valid PDF files.
-        Ensure that the agent is created successfully with the mock PDF files.
+        Ensure that the agent is created successfully with a single search tool over all files.
         """
-        # Create a temporary PDF file for testing
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            tmp_file.write(b"Test PDF Content")  # Simulate writing PDF content
-            tmp_file_path = tmp_file.name
-
-        uploaded_files = [MagicMock()]  # Mock the uploaded file
-        uploaded_files[0].getbuffer.return_value = b"Test PDF Content"
+        uploaded_files = [make_upload("a.pdf", b"A"), make_upload("b.pdf", b"B")]  # In-memory uploads
+        chunks = {
+            0: [Chunk("doc-a", "a.pdf", 1, "Alpha content")],
+            1: [Chunk("doc-b", "b.pdf", 1, "Beta content"), Chunk("doc-b", "b.pdf", 2, "More beta")],
+        }
+        mock_embedder = MagicMock()
+        mock_embedder.model = "text-embedding-ada-002"  # Part of the embedding cache key
+        mock_embedder.embed.side_effect = lambda texts: [[1.0, float(i)] for i, _ in enumerate(texts)]
 
-        # Patch the PDFSearchTool to use the mock version during this test
-        with patch('learning_pdf_agent.tools.pdf_search.PDFSearchTool', new=MockPDFSearchTool):
+        # Patch parsing and embedding so no PDF parsing or API calls happen during this test,
+        # and use an empty cache in a temporary folder instead of the on-disk one
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                patch('learning_pdf_agent.tools.pdf_search.parse_documents', return_value=chunks), \
+                patch('learning_pdf_agent.tools.pdf_search.Embedder', return_value=mock_embedder), \
+                patch('learning_pdf_agent.tools.pdf_search.get_embedding_cache',
+                      return_value=EmbeddingCache(os.path.join(tmp_dir, "cache.sqlite3"))), \
+                patch('learning_pdf_agent.tools.pdf_search.get_document_store', return_value=SharedDocumentStore()):
             agent = load_data(uploaded_files)
-            # Check that the agent was successfully created with valid tools
-            self.assertIsNotNone(agent)
 
-        # Clean up the temporary file
-        os.remove(tmp_file_path)
+        # Check that the agent was created with one tool indexing every document
+        self.assertIsNotNone(agent)
+        self.assertEqual(len(agent.tools), 1)
+        mock_embedder.embed.assert_called_once_with(["Alpha content", "Beta content", "More beta"])
+
+    def test_update_data_only_processes_changes(self):
+        """
+        Test that updating an agent parses only newly uploaded files, drops removed ones,
+        and keeps the same agent and search tool.
+        """
+        first, second, third = make_upload("a.pdf", b"A"), make_upload("b.pdf", b"B"), make_upload("c.pdf", b"C")
+        mock_embedder = MagicMock()
+        mock_embedder.model = "text-embedding-ada-002"  # Part of the embedding cache key
+        mock_embedder.embed.side_effect = lambda texts: [[1.0, float(i)] for i, _ in enumerate(texts)]
+
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                patch('learning_pdf_agent.tools.pdf_search.parse_documents', side_effect=fake_parse_documents) as mock_parse, \
+                patch('learning_pdf_agent.tools.pdf_search.Embedder', return_value=mock_embedder), \
+                patch('learning_pdf_agent.tools.pdf_search.get_embedding_cache',
+                      return_value=EmbeddingCache(os.path.join(tmp_dir, "cache.sqlite3"))), \
+                patch('learning_pdf_agent.tools.pdf_search.get_document_store', return_value=SharedDocumentStore()):
+            agent = load_data([first, second])
+            search_tool = agent.tools[0]
+            updated_agent = update_data(agent, [second, third])
+
+        self.assertIs(updated_agent, agent)
+        self.assertIs(agent.tools[0], search_tool)
+        self.assertEqual(mock_parse.call_args_list[1].args[0], [third])
+        self.assertEqual(
+            sorted(search_tool.index.documents().values()), ["b.pdf", "c.pdf"]
+        )
 
     def test_load_data_with_no_files(self):
         """
@@ -128,12 +186,48 @@ class TestLearningPDFCoach(unittest.TestCase):
 
         # Check that the Task description and expected output match the expected values
         MockTask.assert_called_once_with(
-            description="Use the tool 'Search a PDF's content' to find relevant information in the uploaded documents.",
+            description=TASK_DESCRIPTION,
             expected_output="A friendly, conversational response that answers the user's question based on the document content. Summarize it always to the key points.",
             agent=agent,
             verbose=True
         )
 
+    def test_kickoff_renders_the_question_into_the_task(self):
+        """
+        Test that every kickoff of the same crew puts its own question into the task the
+        agent executes, so answers depend on the question asked.
+        """
+        agent = create_learning_pdf_coach([], self.llm_gpt4)
+        crew = create_learning_pdf_coach_crew(agent)
+        # The agent answers with the task description it was given, instead of calling the LLM
+        with patch.object(Agent, 'execute_task', side_effect=lambda task, context=None, tools=None: task.description):
+            first = str(crew.kickoff(inputs={"user_question": "What does Article 5 prohibit?"}))
+            second = str(crew.kickoff(inputs={"user_question": "Who signed the act?"}))
+
+        self.assertIn("What does Article 5 prohibit?", first)
+        self.assertIn("Who signed the act?", second)
+        self.assertNotIn("What does Article 5 prohibit?", second)
+
+    def test_kickoff_passes_the_conversation_memory_to_the_agent(self):
+        """
+        Test that the context built by the conversation memory (summary, earlier and recent
+        messages) reaches the task the agent executes, as the Streamlit app passes it.
+        """
+        memory = ConversationMemory(recent_turns=2)
+        for i in range(4):
+            memory.add("user", f"What is topic{i} about?")
+            memory.add("assistant", f"Topic{i} is about subject{i}.")
+        prompt = memory.build_prompt("Tell me more about subject1")
+        crew = create_learning_pdf_coach_crew(create_learning_pdf_coach([], self.llm_gpt4))
+
+        with patch.object(Agent, 'execute_task', side_effect=lambda task, context=None, tools=None: task.description) as execute:
+            crew.kickoff(inputs={"user_question": prompt})
+
+        description = execute.call_args.kwargs["task"].description
+        self.assertIn(prompt, description)
+        self.assertIn("Summary of the earlier conversation:", description)
+        self.assertIn("Topic3 is about subject3.", description)
+
     @patch('streamlit.sidebar')
     @patch('streamlit.file_uploader')
     def test_streamlit_app_sidebar(self, mock_file_uploader, mock_sidebar):
@@ -0,0 +1,192 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from learning_pdf_agent.ann import IVFIndex
+from learning_pdf_agent.document_index import DocumentIndex
+from learning_pdf_agent.ingestion import Chunk
+
+
+def clustered_vectors(n, dim=32, clusters=20, seed=0):
+    """
+    Builds L2-normalized random vectors grouped around a few centers.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim))
+    vectors = centers[rng.integers(clusters, size=n)] + 0.3 * rng.standard_normal((n, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def exact_top_k(vectors, query, k):
+    """
+    Returns the IDs of the k most similar vectors by brute force.
+    """
+    return list(np.argsort(-(vectors @ query))[:k])
+
+
+class TestIVFIndex(unittest.TestCase):
+    """
+    Unit tests for the approximate nearest neighbor index.
+    """
+
+    def setUp(self):
+        """
+        Build an index over a small clustered corpus.
+        """
+        self.vectors = clustered_vectors(2000)
+        self.queries = clustered_vectors(20, seed=1)
+        self.index = IVFIndex(nlist=40, nprobe=4)
+        self.index.build(self.vectors)
+
+    def test_probing_all_lists_is_exact(self):
+        """
+        Test that probing every list returns exactly the brute-force results.
+        """
+        for query in self.queries:
+            ids, _ = self.index.search(query, 5, nprobe=40)
+            self.assertEqual(list(ids), exact_top_k(self.vectors, query, 5))
+
+    def test_recall_with_few_probes(self):
+        """
+        Test that a few probes already find most of the true nearest neighbors.
+        """
+        found = sum(
+            len(set(self.index.search(query, 5)[0]) & set(exact_top_k(self.vectors, query, 5)))
+            for query in self.queries
+        )
+        self.assertGreaterEqual(found / (5 * len(self.queries)), 0.9)
+
+    def test_added_vectors_are_searchable(self):
+        """
+        Test that vectors added after training get the next IDs and can be found.
+        """
+        extra = clustered_vectors(10, seed=2)
+        self.index.add(extra)
+        ids, scores = self.index.search(extra[3], 1, nprobe=40)
+        self.assertEqual(ids[0], 2003)
+        self.assertAlmostEqual(float(scores[0]), 1.0, places=5)
+
+    def test_removed_vectors_are_dropped_and_ids_compacted(self):
+        """
+        Test that removing vectors keeps the quantizer and renumbers the remaining ones
+        as their positions in the compacted corpus.
+        """
+        centroids = self.index.centroids.copy()
+        removed = np.zeros(len(self.vectors), dtype=bool)
+        removed[500:1000] = True
+        self.index.remove(removed)
+        remaining = self.vectors[~removed]
+
+        self.assertEqual(len(self.index), 1500)
+        np.testing.assert_array_equal(self.index.centroids, centroids)
+        for query in self.queries:
+            ids, _ = self.index.search(query, 5, nprobe=40)
+            self.assertEqual(list(ids), exact_top_k(remaining, query, 5))
+
+    def test_remove_needs_one_mask_entry_per_vector(self):
+        """
+        Test that a mask of the wrong length is rejected.
+        """
+        with self.assertRaises(ValueError):
+            self.index.remove(np.zeros(10, dtype=bool))
+
+    def test_save_and_load_round_trip(self):
+        """
+        Test that a saved index answers queries exactly like the original.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "index.npz")
+            self.index.save(path)
+            loaded = IVFIndex.load(path)
+        self.assertEqual((loaded.nlist, loaded.nprobe), (40, 4))
+        for query in self.queries:
+            np.testing.assert_array_equal(loaded.search(query, 5)[0], self.index.search(query, 5)[0])
+
+    def test_document_index_uses_ann_above_threshold(self):
+        """
+        Test that the document index switches to the IVF index and still honours filters.
+        """
+        index = DocumentIndex(ann_threshold=1000, ann_cache_dir=None)
+        for name, start in (("a", 0), ("b", 1000)):
+            chunks = [Chunk(f"doc-{name}", f"{name}.pdf", 1, f"{name}{i}") for i in range(1000)]
+            index.add_document(f"doc-{name}", f"{name}.pdf", chunks, self.vectors[start:start + 1000])
+        self.assertIsNotNone(index._ann)
+
+        results = index.search(self.vectors[1500], k=3)
+        self.assertEqual(results[0].chunk.text, "b500")
+        results = index.search(self.vectors[1500], k=3, doc_ids=["doc-a"])
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(result.chunk.doc_id == "doc-a" for result in results))
+
+    def test_document_index_loads_the_saved_ivf_index(self):
+        """
+        Test that a new document index over the same chunks loads the trained IVF index
+        instead of training it again.
+        """
+        chunks = [Chunk("doc-a", "a.pdf", 1, f"a{i}") for i in range(1000)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            first = DocumentIndex(ann_threshold=1000, ann_cache_dir=tmp_dir)
+            first.add_document("doc-a", "a.pdf", chunks, self.vectors[:1000])
+            self.assertEqual(len(os.listdir(tmp_dir)), 1)
+
+            second = DocumentIndex(ann_threshold=1000, ann_cache_dir=tmp_dir)
+            with patch.object(IVFIndex, "build") as build:
+                second.add_document("doc-a", "a.pdf", chunks, self.vectors[:1000])
+            build.assert_not_called()
+            np.testing.assert_array_equal(second._ann.centroids, first._ann.centroids)
+            self.assertEqual(second.search(self.vectors[500], k=1)[0].chunk.text, "a500")
+
+    def test_saved_ivf_indexes_are_evicted_least_recently_used_first(self):
+        """
+        Test that sessions with different chunk sets keep each other's saved indexes,
+        and that only the least recently used ones are removed beyond the limit.
+        """
+        corpora = [
+            [Chunk(f"doc-{n}", f"{n}.pdf", 1, f"{n}{i}") for i in range(500)] for n in range(3)
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            def session(n):
+                index = DocumentIndex(ann_threshold=500, ann_cache_dir=tmp_dir, ann_cache_size=2)
+                index.add_document(f"doc-{n}", f"{n}.pdf", corpora[n], self.vectors[500 * n:500 * (n + 1)])
+                return os.path.basename(index._ann_path())
+
+            first, second = session(0), session(1)
+            self.assertEqual(sorted(os.listdir(tmp_dir)), sorted([first, second]))
+            os.utime(os.path.join(tmp_dir, first), (1, 1))
+            os.utime(os.path.join(tmp_dir, second), (2, 2))
+
+            # Loading the first index makes it the most recently used one
+            self.assertEqual(session(0), first)
+            third = session(2)
+            self.assertEqual(sorted(os.listdir(tmp_dir)), sorted([first, third]))
+
+    def test_document_index_removes_rows_from_the_ivf_index(self):
+        """
+        Test that removing a document drops its rows from the IVF index instead of
+        training it again, and drops the IVF index below the threshold.
+        """
+        index = DocumentIndex(ann_threshold=1000, ann_cache_dir=None)
+        for name, start in (("a", 0), ("b", 1000), ("c", 1500)):
+            size = 1000 if name == "a" else 500
+            chunks = [Chunk(f"doc-{name}", f"{name}.pdf", 1, f"{name}{i}") for i in range(size)]
+            index.add_document(f"doc-{name}", f"{name}.pdf", chunks, self.vectors[start:start + size])
+        ann = index._ann
+
+        with patch.object(IVFIndex, "build") as build:
+            self.assertTrue(index.remove_document("doc-b"))
+        build.assert_not_called()
+        self.assertIs(index._ann, ann)
+        self.assertEqual(len(ann), 1500)
+        self.assertEqual(index.search(self.vectors[1700], k=1)[0].chunk.text, "c200")
+        self.assertEqual(index.search(self.vectors[700], k=1)[0].chunk.text, "a700")
+
+        index.remove_document("doc-a")
+        self.assertIsNone(index._ann)
+        self.assertEqual(index.search(self.vectors[1700], k=1)[0].chunk.text, "c200")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+
+from learning_pdf_agent.bm25 import BM25Index, tokenize
+
+
+class TestBM25Index(unittest.TestCase):
+    """
+    Unit tests for the BM25 inverted index.
+    """
+
+    def setUp(self):
+        """
+        Index a few short chunks.
+        """
+        self.index = BM25Index()
+        self.index.add([
+            "The Krebs cycle produces ATP",
+            "Glycolysis splits glucose",
+            "Article 5.2 of the regulation",
+            "The cycle of the seasons",
+        ])
+
+    def test_tokenize_keeps_dotted_and_hyphenated_terms(self):
+        """
+        Test that numbers like 5.2 and hyphenated words stay single terms.
+        """
+        self.assertEqual(tokenize("See Article 5.2, the e-mail rule."), ["see", "article", "5.2", "the", "e-mail", "rule"])
+
+    def test_rare_terms_rank_higher(self):
+        """
+        Test that a chunk matching a rare term outranks one matching only common terms.
+        """
+        ids, scores = self.index.search("Krebs cycle", k=4)
+
+        self.assertEqual(list(ids), [0, 3])
+        self.assertGreater(scores[0], scores[1])
+
+    def test_only_matching_chunks_are_returned(self):
+        """
+        Test that chunks without any query term are not returned.
+        """
+        ids, _ = self.index.search("article 5.2", k=4)
+        self.assertEqual(list(ids), [2])
+        self.assertEqual(len(self.index.search("photosynthesis", k=4)[0]), 0)
+
+    def test_allowed_mask_filters_chunks(self):
+        """
+        Test that chunks outside the allowed mask are skipped.
+        """
+        ids, _ = self.index.search("cycle", k=4, allowed=np.array([False, True, True, True]))
+        self.assertEqual(list(ids), [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+
+from learning_pdf_agent.document_index import DocumentIndex
+from learning_pdf_agent.ingestion import Chunk
+
+
+class TestDocumentIndex(unittest.TestCase):
+    """
+    Unit tests for the shared vector index over all uploaded documents.
+    """
+
+    def setUp(self):
+        """
+        Build an index over two small documents with hand-made embeddings.
+        """
+        self.index = DocumentIndex()
+        self.index.add_document(
+            "doc-a", "a.pdf",
+            [Chunk("doc-a", "a.pdf", 1, "cats"), Chunk("doc-a", "a.pdf", 2, "dogs")],
+            [[1.0, 0.0], [0.0, 1.0]],
+        )
+        self.index.add_document(
+            "doc-b", "b.pdf",
+            [Chunk("doc-b", "b.pdf", 1, "kittens")],
+            [[0.9, 0.1]],
+        )
+
+    def test_search_returns_global_top_k(self):
+        """
+        Test that results are ranked across documents by cosine similarity.
+        """
+        results = self.index.search([1.0, 0.0], k=2)
+
+        self.assertEqual([result.chunk.text for result in results], ["cats", "kittens"])
+        self.assertGreaterEqual(results[0].score, results[1].score)
+
+    def test_search_filters_by_document(self):
+        """
+        Test that a document filter restricts results to the selected documents.
+        """
+        results = self.index.search([1.0, 0.0], k=3, doc_ids=["doc-b"])
+
+        self.assertEqual([result.chunk.source for result in results], ["b.pdf"])
+
+    def test_documents_lists_sources(self):
+        """
+        Test that the index reports the source of every document.
+        """
+        self.assertEqual(self.index.documents(), {"doc-a": "a.pdf", "doc-b": "b.pdf"})
+        self.assertEqual(len(self.index), 3)
+
+    def test_remove_document(self):
+        """
+        Test that a removed document no longer appears in searches and the others still do.
+        """
+        self.assertTrue(self.index.remove_document("doc-a"))
+        self.assertFalse(self.index.remove_document("doc-a"))
+
+        results = self.index.search([1.0, 0.0], k=3, query_text="cats kittens")
+        self.assertEqual([result.chunk.text for result in results], ["kittens"])
+        self.assertEqual(self.index.documents(), {"doc-b": "b.pdf"})
+        self.assertEqual(self.index.search([1.0, 0.0], k=3, doc_ids=["doc-b"])[0].chunk.text, "kittens")
+
+    def test_hybrid_search_finds_exact_terms(self):
+        """
+        Test that a chunk matching the query text ranks first even if its embedding is farther away.
+        """
+        index = DocumentIndex()
+        index.add_document(
+            "doc-c", "c.pdf",
+            [Chunk("doc-c", "c.pdf", 1, "general overview of regulation"),
+             Chunk("doc-c", "c.pdf", 2, "Article 5.2 lists prohibited practices"),
+             Chunk("doc-c", "c.pdf", 3, "definitions and scope")],
+            [[1.0, 0.0], [0.0, 1.0], [0.9, 0.2]],
+        )
+        vector_only = index.search([1.0, 0.0], k=1)
+        hybrid = index.search([1.0, 0.0], k=1, query_text="What does article 5.2 say?")
+
+        self.assertEqual(vector_only[0].chunk.page, 1)
+        self.assertEqual(hybrid[0].chunk.page, 2)
+
+    def test_empty_index_returns_no_results(self):
+        """
+        Test that searching an empty index returns nothing.
+        """
+        self.assertEqual(DocumentIndex().search([1.0, 0.0]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
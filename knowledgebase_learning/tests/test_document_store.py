@@ -0,0 +1,105 @@
+import gc
+import importlib.util
+import unittest
+from unittest.mock import MagicMock
+
+from learning_pdf_agent.document_store import SharedDocumentStore
+from learning_pdf_agent.ingestion import Chunk
+
+
+def chunks_of(doc_id, *texts):
+    """
+    Builds the chunks of a small document.
+    """
+    return [Chunk(doc_id, f"{doc_id}.pdf", page, text) for page, text in enumerate(texts, start=1)]
+
+
+class TestSharedDocumentStore(unittest.TestCase):
+    """
+    Unit tests for the process-wide document store and the per-session views on it.
+    """
+
+    def setUp(self):
+        """
+        Create a store keeping at most one unreferenced document.
+        """
+        self.store = SharedDocumentStore(max_unreferenced=1)
+
+    def test_documents_are_shared_between_views(self):
+        """
+        Test that a document added by one session is attached by another without reindexing.
+        """
+        first, second = self.store.view(), self.store.view()
+        first.add_document("doc-a", "a.pdf", chunks_of("doc-a", "cats"), [[1.0, 0.0]])
+
+        self.assertTrue(second.attach("doc-a", "lecture.pdf"))
+        self.assertFalse(second.attach("doc-b", "b.pdf"))
+        self.assertEqual(len(self.store.index), 1)
+        self.assertEqual(second.documents(), {"doc-a": "lecture.pdf"})
+        self.assertEqual(second.search([1.0, 0.0])[0].chunk.text, "cats")
+
+    def test_views_only_search_their_own_documents(self):
+        """
+        Test that a session never sees documents it did not upload.
+        """
+        first, second = self.store.view(), self.store.view()
+        first.add_document("doc-a", "a.pdf", chunks_of("doc-a", "cats"), [[1.0, 0.0]])
+        second.add_document("doc-b", "b.pdf", chunks_of("doc-b", "dogs"), [[0.0, 1.0]])
+
+        self.assertEqual([result.chunk.text for result in first.search([0.0, 1.0], k=5)], ["cats"])
+        self.assertEqual(second.search([1.0, 0.0], k=5, doc_ids=["doc-a"]), [])
+
+    def test_unreferenced_documents_are_evicted_lru(self):
+        """
+        Test that released documents stay reusable until more than max_unreferenced pile up.
+        """
+        view = self.store.view()
+        view.add_document("doc-a", "a.pdf", chunks_of("doc-a", "cats"), [[1.0, 0.0]])
+        view.add_document("doc-b", "b.pdf", chunks_of("doc-b", "dogs"), [[0.0, 1.0]])
+        other = self.store.view()
+        other.attach("doc-b", "b.pdf")
+
+        view.remove_document("doc-a")
+        self.assertIn("doc-a", self.store)  # Unreferenced, but kept for reuse
+        view.remove_document("doc-b")
+        self.assertIn("doc-b", self.store)  # Still referenced by the other view
+        other.close()
+
+        self.assertNotIn("doc-a", self.store)  # Least recently released
+        self.assertIn("doc-b", self.store)
+        self.assertEqual(self.store.stats(), {"documents": 1, "referenced": 0, "unreferenced": 1, "chunks": 1})
+
+    def test_collected_view_releases_its_documents(self):
+        """
+        Test that the references of a session's view are released when the view goes away.
+        """
+        view = self.store.view()
+        view.add_document("doc-a", "a.pdf", chunks_of("doc-a", "cats"), [[1.0, 0.0]])
+        del view
+        gc.collect()
+
+        self.assertEqual(self.store.stats()["referenced"], 0)
+
+    @unittest.skipUnless(importlib.util.find_spec("crewai_tools"), "the crewai_tools package is not installed")
+    def test_search_results_use_the_name_of_the_session(self):
+        """
+        Test that a document attached by two sessions under different names is attributed
+        to the name each session uploaded it under.
+        """
+        from learning_pdf_agent.tools.document_search import DocumentSearchTool
+
+        first, second = self.store.view(), self.store.view()
+        first.add_document("doc-a", "a.pdf", chunks_of("doc-a", "cats"), [[1.0, 0.0]])
+        second.attach("doc-a", "lecture.pdf")
+        embedder = MagicMock()
+        embedder.embed.return_value = [[1.0, 0.0]]
+
+        first_tool = DocumentSearchTool(index=first, embedder=embedder)
+        second_tool = DocumentSearchTool(index=second, embedder=embedder)
+        self.assertIn("[1] a.pdf, page 1", first_tool._run("cats"))
+        self.assertIn("[1] lecture.pdf, page 1", second_tool._run("cats"))
+        self.assertNotIn("a.pdf", second_tool._run("cats", documents=["lecture.pdf"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from learning_pdf_agent.embedding_cache import CachedEmbedder, EmbeddingCache
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """
+    Unit tests for the persistent embedding cache and the embedder wrapper using it.
+    """
+
+    def setUp(self):
+        """
+        Create a cache in a temporary folder for every test.
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "cache.sqlite3")
+        self.cache = EmbeddingCache(self.path)
+
+    def tearDown(self):
+        self.cache._conn.close()
+        self.tmp_dir.cleanup()
+
+    def test_round_trip_survives_reopen(self):
+        """
+        Test that stored embeddings are found again after reopening the database.
+        """
+        self.cache.put_many("model-a", ["alpha", "beta"], [[1.0, 2.0], [3.0, 4.0]])
+        reopened = EmbeddingCache(self.path)
+        self.assertEqual(reopened.get_many("model-a", ["alpha", "beta", "gamma"]), {"alpha": [1.0, 2.0], "beta": [3.0, 4.0]})
+        self.assertEqual(reopened.stats()["hits"], 2)
+        self.assertEqual(reopened.stats()["misses"], 1)
+        reopened._conn.close()
+
+    def test_entries_are_keyed_by_model(self):
+        """
+        Test that the same text embedded with another model is not a hit.
+        """
+        self.cache.put_many("model-a", ["alpha"], [[1.0]])
+        self.assertEqual(self.cache.get_many("model-b", ["alpha"]), {})
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """
+        Test that the cache stays within its size limit and keeps recently used entries.
+        """
+        cache = EmbeddingCache(os.path.join(self.tmp_dir.name, "small.sqlite3"), max_entries=2)
+        cache.put_many("m", ["one"], [[1.0]])
+        cache.put_many("m", ["two"], [[2.0]])
+        cache.get_many("m", ["one"])  # "two" is now the least recently used entry
+        cache.put_many("m", ["three"], [[3.0]])
+        self.assertEqual(set(cache.get_many("m", ["one", "two", "three"])), {"one", "three"})
+        self.assertEqual(cache.stats()["entries"], 2)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        cache._conn.close()
+
+    def test_cached_embedder_only_embeds_misses(self):
+        """
+        Test that cached and duplicate texts are not sent to the embedder again.
+        """
+        embedder = MagicMock()
+        embedder.model = "m"
+        embedder.embed.side_effect = lambda texts: [[float(len(text))] for text in texts]
+        cached = CachedEmbedder(embedder, self.cache)
+
+        self.assertEqual(cached.embed(["a", "bb", "a"]), [[1.0], [2.0], [1.0]])
+        embedder.embed.assert_called_once_with(["a", "bb"])
+
+        self.assertEqual(cached.embed(["bb", "ccc"]), [[2.0], [3.0]])
+        embedder.embed.assert_called_with(["ccc"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import importlib.util
+import json
+import threading
+import unittest
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from learning_pdf_agent.embedding_scheduler import EmbeddingScheduler
+
+
+class FakeEmbeddingHandler(BaseHTTPRequestHandler):
+    """
+    A minimal OpenAI-compatible embeddings endpoint. The embedding of a text is
+    [len(text), 1.0], and the first 'rate_limit_count' requests are answered with 429.
+    """
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests += 1
+            rate_limited = server.requests <= server.rate_limit_count
+        if rate_limited:
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b'{"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}}')
+            return
+        texts = body["input"]
+        tokens = sum(len(text.split()) for text in texts)
+        payload = {
+            "object": "list",
+            "model": body["model"],
+            "data": [{"object": "embedding", "index": i, "embedding": [float(len(text)), 1.0]} for i, text in enumerate(texts)],
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+        with server.lock:
+            server.batch_sizes.append(len(texts))
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # Keep the test output clean
+
+
+class TestEmbeddingScheduler(unittest.TestCase):
+    """
+    Unit tests for the embedding scheduler against a local fake embedding endpoint.
+    """
+
+    def setUp(self):
+        """
+        Start the fake endpoint on a free local port.
+        """
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeEmbeddingHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.rate_limit_count = 0
+        self.server.batch_sizes = []
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def post_embeddings(self, batch):
+        """
+        Embeds a batch through the fake endpoint with plain urllib.
+        """
+        request = urllib.request.Request(
+            f"{self.base_url}/embeddings",
+            data=json.dumps({"model": "fake", "input": batch}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            payload = json.loads(response.read())
+        return [item["embedding"] for item in payload["data"]], payload["usage"]["total_tokens"]
+
+    def test_batches_are_bounded_by_count_and_tokens(self):
+        """
+        Test that texts are coalesced into batches within both limits, in order.
+        """
+        scheduler = EmbeddingScheduler(self.post_embeddings, batch_size=3, max_batch_tokens=10)
+        batches = scheduler.make_batches(["a", "b", "c", "d", "x" * 40, "e"])
+        self.assertEqual(batches, [["a", "b", "c"], ["d"], ["x" * 40], ["e"]])
+
+    def test_run_embeds_in_order_and_reports_throughput(self):
+        """
+        Test that all texts are embedded in input order over several concurrent requests.
+        """
+        texts = [f"chunk number {i}" + "!" * i for i in range(25)]
+        scheduler = EmbeddingScheduler(self.post_embeddings, batch_size=4, max_in_flight=3)
+        vectors = scheduler.run(texts)
+
+        self.assertEqual(vectors, [[float(len(text)), 1.0] for text in texts])
+        self.assertEqual(sorted(self.server.batch_sizes), sorted([4] * 6 + [1]))
+        metrics = scheduler.metrics()
+        self.assertEqual(metrics["chunks"], 25)
+        self.assertEqual(metrics["requests"], 7)
+        self.assertEqual(metrics["tokens"], 75)
+        self.assertGreater(metrics["chunks_per_second"], 0)
+        self.assertGreater(metrics["tokens_per_second"], 0)
+
+    def test_rate_limited_requests_are_retried(self):
+        """
+        Test that 429 responses are retried after backing off and counted in the metrics.
+        """
+        self.server.rate_limit_count = 2
+        scheduler = EmbeddingScheduler(self.post_embeddings, batch_size=2, backoff=0.01)
+        vectors = scheduler.run(["one", "two", "three"])
+
+        self.assertEqual(vectors, [[3.0, 1.0], [3.0, 1.0], [5.0, 1.0]])
+        self.assertEqual(scheduler.metrics()["rate_limited"], 2)
+        self.assertEqual(scheduler.metrics()["requests"], 2)
+
+    def test_gives_up_after_max_retries(self):
+        """
+        Test that a request still rate-limited after all retries raises the error.
+        """
+        self.server.rate_limit_count = 10
+        scheduler = EmbeddingScheduler(self.post_embeddings, max_retries=2, backoff=0.01)
+        with self.assertRaises(Exception):
+            scheduler.run(["one"])
+        self.assertEqual(self.server.requests, 3)
+
+    @unittest.skipUnless(importlib.util.find_spec("openai"), "the openai package is not installed")
+    def test_embedder_against_fake_endpoint(self):
+        """
+        Test that the Embedder works against an OpenAI-compatible endpoint and retries on 429.
+        """
+        from learning_pdf_agent.embeddings import Embedder
+
+        self.server.rate_limit_count = 1
+        embedder = Embedder(model="fake", api_key="test_key", base_url=self.base_url, batch_size=2)
+        embedder.scheduler.backoff = 0.01
+
+        self.assertEqual(embedder.embed(["ab", "abc", "abcd"]), [[2.0, 1.0], [3.0, 1.0], [4.0, 1.0]])
+        self.assertEqual(embedder.metrics()["rate_limited"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
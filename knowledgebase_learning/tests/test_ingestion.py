@@ -0,0 +1,102 @@
+import io
+import os
+import tempfile
+import unittest
+
+from learning_pdf_agent.ingestion import chunk_text, document_id, parse_documents, parse_pdf
+from pdf_fixtures import make_pdf
+
+
+class FakeUpload(io.BytesIO):
+    """
+    Stands in for a Streamlit UploadedFile, which is a BytesIO with a file name.
+    """
+
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+
+
+def mock_upload(name, data):
+    """
+    Creates a fake Streamlit UploadedFile holding the given content.
+    """
+    return FakeUpload(name, data)
+
+
+class TestIngestion(unittest.TestCase):
+    """
+    Unit tests for parsing and chunking uploaded PDF documents.
+    """
+
+    def test_chunk_text_overlaps_consecutive_chunks(self):
+        """
+        Test that long text is split into fixed-size chunks sharing the configured overlap.
+        """
+        text = " ".join(f"word{i}" for i in range(100))
+        chunks = chunk_text(text, chunk_size=100, overlap=20)
+
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+        self.assertEqual(chunks[0][-20:], chunks[1][:20])
+        self.assertTrue(text.endswith(chunks[-1]))
+
+    def test_chunk_text_skips_empty_text(self):
+        """
+        Test that whitespace-only text produces no chunks.
+        """
+        self.assertEqual(chunk_text("  \n\t "), [])
+
+    def test_parse_pdf_attributes_chunks(self):
+        """
+        Test that every chunk carries the document ID, source name and page number.
+        """
+        data = make_pdf(["Photosynthesis basics", "The Calvin cycle"])
+        chunks = parse_pdf("biology.pdf", io.BytesIO(data))
+
+        self.assertEqual([chunk.page for chunk in chunks], [1, 2])
+        self.assertEqual({chunk.source for chunk in chunks}, {"biology.pdf"})
+        self.assertEqual({chunk.doc_id for chunk in chunks}, {document_id(data)})
+        self.assertIn("Calvin", chunks[1].text)
+
+    def test_parse_documents_reports_progress_and_skips_broken_files(self):
+        """
+        Test that progress is reported once per file and a broken file does not stop the others.
+        """
+        uploaded_files = [
+            mock_upload("lecture_0.pdf", make_pdf(["First lecture"])),
+            mock_upload("broken.pdf", b"not a pdf"),
+            mock_upload("lecture_2.pdf", make_pdf(["Third lecture"])),
+        ]
+        progress = []
+        chunks_by_index = parse_documents(uploaded_files, progress_callback=lambda *args: progress.append(args), max_workers=2)
+
+        self.assertEqual(sorted(chunks_by_index), [0, 2])
+        self.assertEqual([done for done, _, _ in progress], [1, 2, 3])
+        self.assertEqual(sorted(name for _, _, name in progress), ["broken.pdf", "lecture_0.pdf", "lecture_2.pdf"])
+
+    def test_parse_documents_removes_spill_files(self):
+        """
+        Test that no spill files are left behind, even for files that fail to parse.
+        """
+        uploaded_files = [
+            mock_upload("lecture_0.pdf", make_pdf(["First lecture"])),
+            mock_upload("broken.pdf", b"not a pdf"),
+        ]
+        with tempfile.TemporaryDirectory() as spill_dir:
+            chunks_by_index = parse_documents(uploaded_files, max_workers=2, spill_dir=spill_dir)
+            self.assertEqual(os.listdir(spill_dir), [])
+        self.assertEqual(sorted(chunks_by_index), [0])
+
+    def test_parse_documents_single_file_in_process(self):
+        """
+        Test that a single upload is parsed from its memory buffer without spilling it to disk.
+        """
+        data = make_pdf(["Only lecture"])
+        with tempfile.TemporaryDirectory() as spill_dir:
+            chunks_by_index = parse_documents([mock_upload("only.pdf", data)], spill_dir=spill_dir)
+            self.assertEqual(os.listdir(spill_dir), [])
+        self.assertEqual(chunks_by_index[0][0].doc_id, document_id(data))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from learning_pdf_agent.memory import ConversationMemory, count_tokens
+
+
+class TestConversationMemory(unittest.TestCase):
+    """
+    Unit tests for the token-budgeted conversation memory.
+    """
+
+    def fill(self, memory, count):
+        """
+        Adds 'count' question/answer pairs about numbered topics.
+        """
+        for i in range(count):
+            memory.add("user", f"What is topic{i} about?")
+            memory.add("assistant", f"Topic{i} is about subject{i} " + "details " * 20)
+
+    def test_prompt_stays_within_budget(self):
+        """
+        Test that the context stays within the budget however long the conversation gets.
+        """
+        memory = ConversationMemory(token_budget=200, recent_turns=4)
+        self.fill(memory, 50)
+        prompt = memory.build_prompt("A new question")
+
+        self.assertLessEqual(count_tokens(prompt) - count_tokens("Question: A new question"), 200 + 20)
+        self.assertTrue(prompt.endswith("Question: A new question"))
+        self.assertIn("Topic49", prompt)  # The latest answer is kept verbatim
+
+    def test_related_older_turns_are_retrieved(self):
+        """
+        Test that an old message sharing terms with the question is included.
+        """
+        memory = ConversationMemory(token_budget=500, recent_turns=2)
+        self.fill(memory, 10)
+        prompt = memory.build_prompt("Tell me more about subject3")
+
+        self.assertIn("Related earlier messages:", prompt)
+        self.assertIn("Topic3 is about subject3", prompt)
+
+    def test_summary_is_updated_in_batches_by_the_llm(self):
+        """
+        Test that messages leaving the window are folded into the summary with one LLM call per batch.
+        """
+        llm = MagicMock()
+        llm.call.side_effect = lambda messages: f"summary after {llm.call.call_count} updates"
+        memory = ConversationMemory(llm=llm, recent_turns=2, summary_batch_turns=4)
+        self.fill(memory, 3)
+        memory.wait_for_summary()
+
+        self.assertEqual(llm.call.call_count, 1)
+        self.assertEqual(memory.summary, "summary after 1 updates")
+        self.assertIn("summary after 1 updates", memory.build_prompt("Next"))
+
+    def test_summary_is_updated_off_the_request_path(self):
+        """
+        Test that adding a message does not wait for the LLM, and that the messages being
+        summarized are still part of the prompt in the meantime.
+        """
+        release = threading.Event()
+        llm = MagicMock()
+        llm.call.side_effect = lambda messages: release.wait(5) and "summary of topic0 and topic1"
+        memory = ConversationMemory(llm=llm, recent_turns=2, summary_batch_turns=4)
+
+        start = time.perf_counter()
+        self.fill(memory, 3)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertIn("What is topic0 about?", memory.build_prompt("Next"))
+
+        release.set()
+        memory.wait_for_summary()
+        prompt = memory.build_prompt("Next")
+        self.assertIn("summary of topic0 and topic1", prompt)
+        self.assertNotIn("What is topic0 about?", prompt)
+
+    def test_summary_falls_back_when_llm_fails(self):
+        """
+        Test that a failing LLM call still leaves a (truncated) summary of older messages.
+        """
+        llm = MagicMock()
+        llm.call.side_effect = RuntimeError("API down")
+        memory = ConversationMemory(llm=llm, token_budget=100, recent_turns=2)
+        self.fill(memory, 5)
+        memory.wait_for_summary()
+
+        self.assertTrue(memory.summary)
+        self.assertLessEqual(count_tokens(memory.summary), 25)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+"""
+Prebuilt vector index of the AI Act.
+
+The AI Act is parsed, chunked and embedded once by the `build_ai_act_index`
+command and stored under db/ai_act_index:
+
+    manifest.json   source hash, embedding model, format version, sizes
+    chunks.json     text and page of every chunk
+    vectors.npy     L2-normalized float32 embeddings, memory-mapped on load
+    structure.json  articles, annexes, recitals and chapters, see ai_act_structure
+
+Runs reuse the stored index as long as the source PDF and the embedding model
+are unchanged; otherwise the index is rebuilt. Unless a run names them, they are
+the ones recorded in the manifest, so an index built with `--pdf` or `--model`
+is used as built.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from openai import OpenAI
+from pypdf import PdfReader
+
+from ai_act_compliance_checker.ai_act_structure import AIActStructure, load_structure, parse_structure
+from ai_act_compliance_checker.index_registry import DB_DIR, PACKAGE_DIR, IndexRegistry, file_hash
+
+INDEX_DIR = os.path.join(DB_DIR, "ai_act_index")
+AI_ACT_PATH = os.path.join(PACKAGE_DIR, "data", "AIAct.pdf")
+
+EMBEDDING_MODEL = os.getenv("AI_ACT_EMBEDDING_MODEL", "text-embedding-3-small")
+# Bumped whenever the on-disk layout or the chunking changes, so old indexes are rebuilt
+INDEX_FORMAT_VERSION = 2
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+EMBED_BATCH_SIZE = 256
+
+
+def chunk_text(text, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
+    """Split text into overlapping fixed-size chunks after normalizing whitespace."""
+    text = " ".join(text.split())
+    if not text:
+        return []
+    step = chunk_size - overlap
+    return [text[start:start + chunk_size] for start in range(0, max(len(text) - overlap, 1), step)]
+
+
+def embed_texts(texts, model=EMBEDDING_MODEL, client=None):
+    """Embed texts with the OpenAI API and return L2-normalized float32 vectors."""
+    client = client or OpenAI()
+    vectors = []
+    for start in range(0, len(texts), EMBED_BATCH_SIZE):
+        response = client.embeddings.create(model=model, input=texts[start:start + EMBED_BATCH_SIZE])
+        vectors.extend(item.embedding for item in response.data)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def read_manifest(index_dir=INDEX_DIR):
+    """Return the manifest of a stored index, or None if there is none."""
+    try:
+        with open(os.path.join(index_dir, "manifest.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(manifest, source_hash, model):
+    """Whether a stored index was built from this source with this model and format."""
+    return bool(manifest) and (
+        manifest.get("source_sha256") == source_hash
+        and manifest.get("embedding_model") == model
+        and manifest.get("format_version") == INDEX_FORMAT_VERSION
+    )
+
+
+def resolve_source(manifest, pdf_path=None, model=None):
+    """
+    The PDF and embedding model an index should be built from: the given ones, else the
+    ones recorded in the manifest (the model only if AI_ACT_EMBEDDING_MODEL is not set),
+    else AI_ACT_PATH and EMBEDDING_MODEL.
+    """
+    manifest = manifest or {}
+    if pdf_path is None:
+        recorded = manifest.get("source_path")
+        pdf_path = recorded if recorded and os.path.exists(recorded) else AI_ACT_PATH
+    if model is None:
+        model = os.getenv("AI_ACT_EMBEDDING_MODEL") or manifest.get("embedding_model") or EMBEDDING_MODEL
+    return pdf_path, model
+
+
+def build_index(pdf_path=AI_ACT_PATH, index_dir=INDEX_DIR, model=EMBEDDING_MODEL):
+    """Parse, chunk and embed the PDF, then atomically replace the index directory."""
+    started = time.perf_counter()
+    source_hash = file_hash(pdf_path)
+    pages = [page.extract_text() or "" for page in PdfReader(pdf_path).pages]
+    chunks = [
+        {"page": page_number, "text": text}
+        for page_number, page in enumerate(pages, start=1)
+        for text in chunk_text(page)
+    ]
+    structure = AIActStructure(parse_structure(pages))
+    vectors = embed_texts([chunk["text"] for chunk in chunks], model=model)
+
+    # Write the new version next to the old one and swap, so readers never see a half-written index
+    os.makedirs(os.path.dirname(index_dir), exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix=".ai_act_index-", dir=os.path.dirname(index_dir))
+    np.save(os.path.join(build_dir, "vectors.npy"), vectors)
+    with open(os.path.join(build_dir, "chunks.json"), "w") as f:
+        json.dump(chunks, f)
+    structure.save(os.path.join(build_dir, "structure.json"))
+    manifest = {
+        "format_version": INDEX_FORMAT_VERSION,
+        "source_path": os.path.abspath(pdf_path),
+        "source_sha256": source_hash,
+        "embedding_model": model,
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+        "chunks": len(chunks),
+        "dimensions": int(vectors.shape[1]) if len(chunks) else 0,
+        "structure": structure.counts(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    with open(os.path.join(build_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    old_dir = None
+    if os.path.exists(index_dir):
+        old_dir = f"{build_dir}.old"
+        os.replace(index_dir, old_dir)
+    os.replace(build_dir, index_dir)
+    if old_dir:
+        shutil.rmtree(old_dir, ignore_errors=True)
+    IndexRegistry(os.path.join(os.path.dirname(index_dir), "registry.json")).register(
+        os.path.basename(index_dir), "ai_act_index", pdf_path, source_hash, model, path=os.path.basename(index_dir)
+    )
+    print(f"Indexed {len(chunks)} chunks of {pdf_path} in {time.perf_counter() - started:.1f}s")
+    return manifest
+
+
+class AIActIndex:
+    """A stored AI Act index, with the embeddings memory-mapped from disk."""
+
+    def __init__(self, index_dir=INDEX_DIR):
+        self.index_dir = index_dir
+        self.manifest = read_manifest(index_dir)
+        if self.manifest is None:
+            raise FileNotFoundError(f"No AI Act index in {index_dir}, run `build_ai_act_index` first.")
+        with open(os.path.join(index_dir, "chunks.json")) as f:
+            self.chunks = json.load(f)
+        # Pages are read lazily and shared through the OS page cache by all processes using the index
+        self.vectors = np.load(os.path.join(index_dir, "vectors.npy"), mmap_mode="r")
+        self.model = self.manifest["embedding_model"]
+        self.structure = load_structure(index_dir)
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def search(self, query_vector, k=5):
+        """Return the k chunks most similar to a normalized query vector as (score, chunk) pairs."""
+        if not len(self.chunks):
+            return []
+        scores = self.vectors @ np.asarray(query_vector, dtype=np.float32)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), self.chunks[i]) for i in top]
+
+
+def load_or_build_index(pdf_path=None, index_dir=INDEX_DIR, model=None):
+    """Load the stored index, rebuilding it first if the PDF or the embedding model changed, see resolve_source."""
+    manifest = read_manifest(index_dir)
+    pdf_path, model = resolve_source(manifest, pdf_path, model)
+    if not is_current(manifest, file_hash(pdf_path), model):
+        build_index(pdf_path, index_dir, model)
+    return AIActIndex(index_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the prebuilt AI Act index used by the compliance crew.")
+    parser.add_argument("--pdf", help="Path to the AI Act PDF (default: the one the index was built from, else data/AIAct.pdf)")
+    parser.add_argument("--model", help="OpenAI embedding model (default: AI_ACT_EMBEDDING_MODEL, else the one the index was built with)")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the index is up to date")
+    args = parser.parse_args()
+
+    manifest = read_manifest()
+    pdf_path, model = resolve_source(manifest, args.pdf, args.model)
+    if not args.force and is_current(manifest, file_hash(pdf_path), model):
+        print(f"AI Act index is up to date ({manifest['chunks']} chunks, built {manifest['created_at']})")
+        return
+    build_index(pdf_path, model=model)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Structural index of the AI Act.
+
+The text of the AI Act is split into its recitals, chapters, sections, articles and
+annexes. Every article and annex keeps its title, its text, the pages it spans, the
+articles and annexes it refers to and the ones referring to it. The result is stored
+as structure.json next to the vector index, so a lookup such as "Article 6(2)" or
+"Annex III" is a dictionary access instead of an embedding query.
+"""
+import json
+import os
+import re
+
+ROMAN_NUMERALS = [(100, "C"), (90, "XC"), (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I")]
+
+# Running headers and footers of the Official Journal (and the masthead of the first page);
+# footnotes follow the footer of their page
+FOOTER_RE = re.compile(r"^(EN OJ L, |OJ L, \d|ELI: http|\d+/\d+ ELI: http|Official Journal\s*$)")
+CHAPTER_RE = re.compile(r"^CHAPTER ([IVXLC]+)$")
+SECTION_RE = re.compile(r"^SECTION (\d+)$")
+ARTICLE_RE = re.compile(r"^Article (\d+)$")
+ANNEX_RE = re.compile(r"^ANNEX ([IVXLC]+)$")
+RECITAL_RE = re.compile(r"^\((\d+)\) ")
+# "Article 5(1)", "Articles 8 to 15", "Annexes I and III", "Articles 53 and 54"...
+NUMBER = r"(?:\d+|[IVXLC]+)\b(?:\(\w+\))*"
+REFERENCE_RE = re.compile(
+    rf"\b(Articles?|Annex(?:es)?|Recitals?|Chapters?)\s+({NUMBER}(?:(?:\s*,\s*|\s+and\s+|\s+or\s+|\s+to\s+){NUMBER})*)",
+    re.IGNORECASE,
+)
+REFERENCE_PART_RE = re.compile(r"(\d+|[IVXLC]+)((?:\(\w+\))*)", re.IGNORECASE)
+# References to the articles or annexes of other acts, e.g. "Article 16 TFEU" or "Annex I to Directive (EU) 2020/1828"
+EXTERNAL_RE = re.compile(
+    r"^(?:\s*(?:,|and|or)?\s*\(\w+\))*\s*(?:TFEU|TEU|(?:,[^,.;]{0,40},)?\s*(?:of|to)\s+(?:the\s+)?(?:Regulation|Directive|Decision|Treaty|TFEU|TEU|Charter|Protocol|Recommendation))"
+)
+KINDS = {"article": "articles", "annex": "annexes", "recital": "recitals", "chapter": "chapters"}
+
+
+def to_roman(number):
+    numeral = ""
+    for value, symbol in ROMAN_NUMERALS:
+        count, number = divmod(number, value)
+        numeral += symbol * count
+    return numeral
+
+
+def from_roman(numeral):
+    """Value of a Roman numeral, or None if it is not a canonical one."""
+    numeral = numeral.upper()
+    value, rest = 0, numeral
+    for number, symbol in ROMAN_NUMERALS:
+        while rest.startswith(symbol):
+            value += number
+            rest = rest[len(symbol):]
+    return value if value and not rest and to_roman(value) == numeral else None
+
+
+def page_lines(pages):
+    """
+    (page, line, wrapped) triples of the page texts, without running headers, footers and
+    footnotes. wrapped tells whether the line continues on the next one, which the PDF
+    text marks with a trailing space.
+    """
+    for page_number, text in enumerate(pages, start=1):
+        for line in text.split("\n"):
+            if FOOTER_RE.match(line):
+                break
+            if line.strip():
+                yield page_number, line.strip(), line.endswith(" ")
+
+
+def parse_references(text):
+    """
+    The references in a text as (kind, id, subdivision) triples, e.g. ("article", "6", "(2)")
+    for "Article 6(2)". Ranges such as "Articles 8 to 15" are expanded. References to the
+    articles or annexes of other acts are left out.
+    """
+    references = []
+    for match in REFERENCE_RE.finditer(text):
+        if EXTERNAL_RE.match(text[match.end():match.end() + 80]):
+            continue
+        word = match.group(1).lower()
+        kind = next(kind for kind in KINDS if word.startswith(kind))
+        parts = REFERENCE_PART_RE.findall(match.group(2))
+        separators = re.split(REFERENCE_PART_RE, match.group(2))[3::3]
+        previous = None
+        for (identifier, subdivision), separator in zip(parts, [""] + separators):
+            value = int(identifier) if identifier.isdigit() else from_roman(identifier)
+            if value is None or (kind in ("annex", "chapter")) == identifier.isdigit():
+                previous = None
+                continue
+            if previous is not None and separator.strip().lower() == "to":
+                values = range(previous + 1, value + 1)
+            else:
+                values = [value]
+            for number in values:
+                label = str(number) if kind in ("article", "recital") else to_roman(number)
+                references.append((kind, label, subdivision if number == value else ""))
+            previous = value
+    return references
+
+
+def _title(lines, position):
+    """The title after a heading line, joined with its wrapped continuation lines, and the position after it."""
+    title = []
+    while position < len(lines):
+        _, line, wrapped = lines[position]
+        title.append(line)
+        position += 1
+        if not wrapped:
+            break
+    return " ".join(title).strip(" `"), position
+
+
+def parse_structure(pages):
+    """Split the page texts of the AI Act into recitals, chapters, sections, articles and annexes."""
+    lines = list(page_lines(pages))
+    structure = {"recitals": {}, "chapters": {}, "articles": {}, "annexes": {}}
+    region = "preamble"
+    chapter = section = current = None
+    position = 0
+    while position < len(lines):
+        page, line, wrapped = lines[position]
+        position += 1
+        if region == "preamble":
+            if line == "Whereas:":
+                region = "recitals"
+            continue
+        if region == "recitals":
+            match = RECITAL_RE.match(line)
+            if line.startswith("HAVE ADOPTED THIS REGULATION"):
+                region, current = "articles", None
+                continue
+            if match and int(match.group(1)) == len(structure["recitals"]) + 1:
+                current = structure["recitals"][match.group(1)] = {"text": [], "pages": [page, page]}
+        elif region == "articles":
+            match = CHAPTER_RE.match(line)
+            if match and from_roman(match.group(1)) == len(structure["chapters"]) + 1:
+                title, position = _title(lines, position)
+                chapter, section, current = match.group(1), None, None
+                structure["chapters"][chapter] = {"title": title, "articles": [], "sections": {}}
+                continue
+            match = SECTION_RE.match(line)
+            if match and chapter and int(match.group(1)) == len(structure["chapters"][chapter]["sections"]) + 1:
+                title, position = _title(lines, position)
+                section, current = match.group(1), None
+                structure["chapters"][chapter]["sections"][section] = {"title": title, "articles": []}
+                continue
+            match = ARTICLE_RE.match(line)
+            if match and int(match.group(1)) == len(structure["articles"]) + 1:
+                title, position = _title(lines, position)
+                number = int(match.group(1))
+                current = structure["articles"][str(number)] = {
+                    "title": title, "chapter": chapter, "section": section, "text": [], "pages": [page, page],
+                }
+                if chapter:
+                    structure["chapters"][chapter]["articles"].append(number)
+                    if section:
+                        structure["chapters"][chapter]["sections"][section]["articles"].append(number)
+                continue
+            if line.startswith("Done at "):
+                region, current = "signature", None
+                continue
+        if region in ("articles", "signature", "annexes"):
+            match = ANNEX_RE.match(line)
+            if match and from_roman(match.group(1)) == len(structure["annexes"]) + 1:
+                title, position = _title(lines, position)
+                region = "annexes"
+                current = structure["annexes"][match.group(1)] = {"title": title, "text": [], "pages": [page, page]}
+                continue
+        if current is not None:
+            # Wrapped lines are joined, so every paragraph or point of the text is one line
+            current["text"].append(line + (" " if wrapped else "\n"))
+            current["pages"][1] = page
+
+    for kind in ("recitals", "articles", "annexes"):
+        for element in structure[kind].values():
+            element["text"] = "".join(element["text"]).strip()
+    _link_references(structure)
+    return structure
+
+
+def _link_references(structure):
+    """Records the articles and annexes every article and annex refers to, and the ones referring to it."""
+    for kind in ("articles", "annexes"):
+        for element in structure[kind].values():
+            element["references"] = {"articles": [], "annexes": []}
+            element["referenced_by"] = {"articles": [], "annexes": []}
+    for kind in ("articles", "annexes"):
+        for label, element in structure[kind].items():
+            for reference_kind, reference, _ in parse_references(element["text"]):
+                target_kind = KINDS[reference_kind]
+                if target_kind not in ("articles", "annexes") or reference not in structure[target_kind]:
+                    continue
+                if (target_kind, reference) == (kind, label) or reference in element["references"][target_kind]:
+                    continue
+                element["references"][target_kind].append(reference)
+                structure[target_kind][reference]["referenced_by"][kind].append(label)
+    for kind in ("articles", "annexes"):
+        for element in structure[kind].values():
+            for links in (element["references"], element["referenced_by"]):
+                links["articles"].sort(key=int)
+                links["annexes"].sort(key=from_roman)
+
+
+def paragraph(text, subdivision):
+    """
+    The numbered paragraph of an article text named by a subdivision such as "(2)" or
+    "(2)(a)", i.e. the lines from "2." (or "(2)" for the definitions) up to the next one,
+    or None if there is no such paragraph.
+    """
+    match = re.match(r"\((\d+)\)", subdivision or "")
+    if not match:
+        return None
+    number = int(match.group(1))
+    lines = text.split("\n")
+    for pattern in (r"^{}\. ", r"^\({}\) "):
+        start = next((i for i, line in enumerate(lines) if re.match(pattern.format(number), line)), None)
+        if start is None:
+            continue
+        end = next(
+            (i for i, line in enumerate(lines[start + 1:], start=start + 1) if re.match(pattern.format(number + 1), line)),
+            len(lines),
+        )
+        return "\n".join(lines[start:end])
+    return None
+
+
+class AIActStructure:
+    """The parsed structure of the AI Act, with lookups by article, annex, recital and chapter."""
+
+    def __init__(self, structure):
+        self.structure = structure
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.structure, f)
+
+    def counts(self):
+        return {kind: len(elements) for kind, elements in self.structure.items()}
+
+    def get(self, kind, label):
+        """The element of a kind ("article", "annex", "recital" or "chapter") with a label, or None."""
+        return self.structure[KINDS[kind]].get(str(label).upper() if kind in ("annex", "chapter") else str(label))
+
+
+def load_structure(index_dir):
+    """The structure stored with an index, or None for indexes built without one."""
+    path = os.path.join(index_dir, "structure.json")
+    return AIActStructure.load(path) if os.path.exists(path) else None
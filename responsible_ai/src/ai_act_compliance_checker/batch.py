@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""
+Batch compliance checking of many project descriptions.
+
+Takes a directory of project description PDFs, or a manifest listing them (a text
+file with one path per line, or a JSON list of paths), and checks each one with
+its own AIComplianceCrew on a bounded pool of workers. All workers share the one
+prebuilt AI Act index loaded by this process.
+
+Results are appended to a JSONL file as soon as each document is done. On restart
+the documents already checked successfully (same path and content hash) are
+skipped, so an interrupted batch resumes where it stopped.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from ai_act_compliance_checker.crew import EXECUTION_MODES, AIComplianceCrew
+from ai_act_compliance_checker.index_registry import file_hash
+from ai_act_compliance_checker.tools.ai_act_search import get_ai_act_search_tool
+
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))
+
+
+def collect_documents(source):
+    """List the project description PDFs of a directory or a manifest file."""
+    if os.path.isdir(source):
+        return sorted(
+            os.path.join(source, name) for name in os.listdir(source) if name.lower().endswith(".pdf")
+        )
+    base_dir = os.path.dirname(os.path.abspath(source))
+    with open(source) as f:
+        if source.endswith(".json"):
+            paths = json.load(f)
+        else:
+            paths = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    # Relative paths in a manifest are relative to the manifest itself
+    return [path if os.path.isabs(path) else os.path.join(base_dir, path) for path in paths]
+
+
+def completed_documents(output_path):
+    """(path, hash) pairs already checked successfully according to an earlier output file."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # A line cut short by an interrupted run
+            if record.get("status") == "ok":
+                done.add((record["path"], record["sha256"]))
+    return done
+
+
+class ResultWriter:
+    """Appends one JSON line per result and flushes it to disk right away."""
+
+    def __init__(self, output_path):
+        self._file = open(output_path, "a")
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        with self._lock:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+def check_document(path, ai_act_path, execution_mode, merge, done=frozenset()):
+    """
+    Hash one project description and run the compliance crew on it. Returns its result
+    record, or None if it was already checked according to done.
+    """
+    started = time.perf_counter()
+    record = {"path": path}
+    try:
+        # Hashed here rather than upfront, so an unreadable file fails alone instead of the whole batch
+        record["sha256"] = file_hash(path)
+        if (path, record["sha256"]) in done:
+            return None
+        inputs = {'path_to_ai_act': ai_act_path, 'path_to_project_description': path}
+        result = AIComplianceCrew(execution_mode=execution_mode, merge=merge).kickoff(inputs=inputs)
+        record.update(status="ok", result=str(result))
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}", traceback=traceback.format_exc())
+    record.update(latency_s=round(time.perf_counter() - started, 3), finished_at=datetime.now(timezone.utc).isoformat())
+    return record
+
+
+def summarize(latencies, failures, elapsed):
+    """The throughput and latency lines printed at the end of a batch."""
+    lines = [
+        f"Checked {len(latencies)} documents ({failures} failed) in {elapsed:.1f}s: "
+        f"{len(latencies) / elapsed * 60 if elapsed else 0.0:.1f} documents/min"
+    ]
+    if latencies:
+        quantiles = statistics.quantiles(latencies, n=20) if len(latencies) > 1 else latencies * 19
+        lines.append(
+            f"Latency per document: mean {statistics.mean(latencies):.1f}s, p50 {statistics.median(latencies):.1f}s, "
+            f"p95 {quantiles[18]:.1f}s, max {max(latencies):.1f}s"
+        )
+    return lines
+
+
+def run_batch():
+    parser = argparse.ArgumentParser(description="Check many project descriptions for compliance with the AI Act.")
+    parser.add_argument('source', help="Directory of project description PDFs, or a manifest file listing them")
+    parser.add_argument('--output', default='compliance_results.jsonl', help="JSONL file the results are appended to")
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS, help="Number of documents checked concurrently")
+    parser.add_argument('--ai-act', help="Path to the AI Act PDF (default: the one the AI Act index was built from)")
+    parser.add_argument('--mode', choices=EXECUTION_MODES, default='sequential')
+    parser.add_argument('--merge', action='store_true')
+    args = parser.parse_args(sys.argv[1:])
+
+    # The same file listed twice is only checked once
+    paths = list(dict.fromkeys(os.path.abspath(path) for path in collect_documents(args.source)))
+    done = completed_documents(args.output)
+    print(f"{len(paths)} documents, {len(done)} checked by earlier runs")
+    if not paths:
+        return
+
+    # Load (or build) the AI Act index once, before the workers start sharing it
+    ai_act_path = get_ai_act_search_tool(args.ai_act).index.manifest["source_path"]
+
+    writer = ResultWriter(args.output)
+    latencies, failures, skipped = [], 0, 0
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            futures = [
+                executor.submit(check_document, path, ai_act_path, args.mode, args.merge, done)
+                for path in paths
+            ]
+            for future in as_completed(futures):
+                record = future.result()
+                if record is None:
+                    skipped += 1
+                    continue
+                writer.write(record)
+                latencies.append(record["latency_s"])
+                failures += record["status"] != "ok"
+                print(
+                    f"[{len(latencies) + skipped}/{len(paths)}] {record['status']:5} "
+                    f"{record['latency_s']:7.1f}s  {record['path']}"
+                )
+    finally:
+        writer.close()
+
+    if skipped:
+        print(f"Skipped {skipped} documents already checked with unchanged content")
+    for line in summarize(latencies, failures, time.perf_counter() - started):
+        print(line)
+
+
+if __name__ == "__main__":
+    run_batch()
@@ -1,19 +1,48 @@
+import logging
+
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 
 from crewai_tools import PDFSearchTool
 
+from ai_act_compliance_checker.timing import TaskTimer
+from ai_act_compliance_checker.tools.ai_act_lookup import get_ai_act_lookup_tool
+from ai_act_compliance_checker.tools.ai_act_search import get_ai_act_search_tool
+from ai_act_compliance_checker.tools.project_search import get_project_search_tool
+
+# "sequential" runs the tasks one after the other, "dag" runs the independent
+# action plan and assessment concurrently, optionally followed by a merge task
+EXECUTION_MODES = ("sequential", "dag")
+
+logger = logging.getLogger(__name__)
+
 @CrewBase
 class AIComplianceCrew():
     """AI Compliance Crew"""
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
 
+    def __init__(self, execution_mode="sequential", merge=False):
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode {execution_mode!r}, expected one of {EXECUTION_MODES}")
+        self.execution_mode = execution_mode
+        self.merge = merge and execution_mode == "dag"
+        if execution_mode == "dag":
+            dependencies = {'ai_compliance_action_planner': [], 'ai_compliance_coach': []}
+            if self.merge:
+                dependencies['ai_compliance_report_merger'] = ['ai_compliance_action_planner', 'ai_compliance_coach']
+        else:
+            dependencies = {'ai_compliance_action_planner': [], 'ai_compliance_coach': ['ai_compliance_action_planner']}
+        self.timer = TaskTimer(dependencies)
+        # Set by kickoff to a tool over the registered collection of the project description
+        self.project_search_tool = None
+
     @agent
     def ai_act_action_extractor(self) -> Agent:
         return Agent(
             config=self.agents_config['ai_act_action_extractor'],
-            tools=[PDFSearchTool()],
+            # The AI Act comes from the shared prebuilt index, the PDF search tool is for the project description
+            tools=[get_ai_act_lookup_tool(), get_ai_act_search_tool(), self.project_search_tool or PDFSearchTool()],
             verbose=True,
             allow_delegation=False
         )
@@ -22,7 +51,8 @@ class AIComplianceCrew():
     def coaching_auditor(self) -> Agent:
         return Agent(
             config=self.agents_config['coaching_auditor'],
-            tools=[PDFSearchTool()],
+            # The AI Act comes from the shared prebuilt index, the PDF search tool is for the project description
+            tools=[get_ai_act_lookup_tool(), get_ai_act_search_tool(), self.project_search_tool or PDFSearchTool()],
             verbose=True,
             allow_delegation=False
         )
@@ -34,7 +64,9 @@ class AIComplianceCrew():
         task_config.pop('agent', None)
         return Task(
             **task_config,
-            agent=self.ai_act_action_extractor()  # Use self to call the method
+            agent=self.ai_act_action_extractor(),  # Use self to call the method
+            async_execution=self.execution_mode == "dag",
+            callback=self.timer.callback_for('ai_compliance_action_planner')
         )
 
     @task
@@ -44,16 +76,51 @@ class AIComplianceCrew():
         task_config.pop('agent', None)
         return Task(
             **task_config,
-            agent=self.coaching_auditor()  # Use self to call the method
+            agent=self.coaching_auditor(),  # Use self to call the method
+            # With a merge task both branches run asynchronously; without one the crew may not
+            # end with an asynchronous task, so this branch runs in the foreground instead
+            async_execution=self.merge,
+            callback=self.timer.callback_for('ai_compliance_coach')
+        )
+
+    @task
+    def ai_compliance_report_merger(self) -> Task:
+        task_config = self.tasks_config['ai_compliance_report_merger']
+        task_config.pop('agent', None)
+        return Task(
+            **task_config,
+            agent=self.coaching_auditor(),
+            context=[self.ai_compliance_action_planner(), self.ai_compliance_coach()],  # Waits for both branches
+            callback=self.timer.callback_for('ai_compliance_report_merger')
         )
 
     @crew
     def crew(self) -> Crew:
         """Creates the AI Compliance Crew"""
+        tasks = [self.ai_compliance_action_planner(), self.ai_compliance_coach()]
+        if self.merge:
+            tasks.append(self.ai_compliance_report_merger())
         return Crew(
             agents=self.agents,  
-            tasks=self.tasks,    
+            tasks=tasks,    
             process=Process.sequential,
             verbose=2,
             # process=Process.hierarchical,  # In case you want to use that instead https://docs.crewai.com/how-to/Hierarchical/
-        )
\ No newline at end of file
+        )
+
+    def kickoff(self, inputs):
+        """Runs the crew, then logs the task timings and the critical path (see self.timer.report())"""
+        if inputs.get('path_to_project_description'):
+            self.project_search_tool = get_project_search_tool(inputs['path_to_project_description'])
+        compliance_crew = self.crew()
+        self.timer.start()
+        result = compliance_crew.kickoff(inputs=inputs)
+        if self.execution_mode == "dag" and not self.merge:
+            # Without a merge task the crew can return before the asynchronous branch has finished,
+            # and its result would only hold the last task's output
+            result = "\n\n".join(
+                str(task.wait_for_completion() if task.async_execution else task.output.raw_output)
+                for task in compliance_crew.tasks
+            )
+        logger.info("%s", self.timer.report())
+        return result
@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+"""
+Registry and garbage collection of the vector stores under db/.
+
+db/registry.json maps every index or collection the crew creates to the source
+document it was built from (path and SHA-256), the embedding model and its
+creation and last use times:
+
+    {"version": 1, "indexes": {"<name>": {"kind": "chroma" | "ai_act_index", ...}}}
+
+Collections whose source and model match are reused instead of rebuilt. The
+`gc_db` command finds everything under db/ no registered index accounts for:
+Chroma segment directories without a segment in chroma.sqlite3, unregistered
+or stale Chroma collections, and leftovers of interrupted AI Act index builds.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(os.path.dirname(PACKAGE_DIR))
+DB_DIR = os.path.join(PROJECT_DIR, "db")
+REGISTRY_PATH = os.path.join(DB_DIR, "registry.json")
+CHROMA_PATH = os.path.join(DB_DIR, "chroma.sqlite3")
+# Written by `crewai train` and read by every later run, so it is only removed on request
+TRAINED_AGENTS_PATH = os.path.join(PROJECT_DIR, "trained_agents_data.pkl")
+
+REGISTRY_VERSION = 1
+UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+# Temporary and replaced directories of ai_act_index.build_index
+BUILD_LEFTOVER_RE = re.compile(r"^\.ai_act_index-")
+
+_lock = threading.Lock()
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def file_hash(path):
+    """SHA-256 of a file, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def collection_name(source_hash, model):
+    """A Chroma collection name unique to a source document and an embedding model."""
+    return f"pdf-{source_hash[:16]}-{re.sub(r'[^a-zA-Z0-9]+', '-', model).strip('-')}"[:63]
+
+
+class IndexRegistry:
+    """The registry file of the indexes under db/, read and written whole on every change."""
+
+    def __init__(self, path=REGISTRY_PATH):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                registry = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return registry.get("indexes", {}) if registry.get("version") == REGISTRY_VERSION else {}
+
+    def _save(self, indexes):
+        # Written next to the registry and renamed, so a crash never leaves a half-written file
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".registry-", dir=os.path.dirname(self.path))
+        with os.fdopen(fd, "w") as f:
+            json.dump({"version": REGISTRY_VERSION, "indexes": indexes}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def find(self, kind, source_hash, model):
+        """Name of a registered index of this kind built from this source with this model, or None."""
+        for name, entry in self.load().items():
+            if (entry["kind"], entry["source_sha256"], entry["embedding_model"]) == (kind, source_hash, model):
+                return name
+        return None
+
+    def register(self, name, kind, source_path, source_hash, model, path=None):
+        """Record an index, replacing an earlier entry of the same name."""
+        with _lock:
+            indexes = self.load()
+            now = _now()
+            indexes[name] = {
+                "kind": kind,
+                "path": path,
+                "source_path": os.path.abspath(source_path),
+                "source_sha256": source_hash,
+                "embedding_model": model,
+                "created_at": now,
+                "last_used_at": now,
+            }
+            self._save(indexes)
+
+    def touch(self, name):
+        """Record that an index was used now."""
+        with _lock:
+            indexes = self.load()
+            if name in indexes:
+                indexes[name]["last_used_at"] = _now()
+                self._save(indexes)
+
+    def remove(self, names):
+        with _lock:
+            indexes = self.load()
+            for name in names:
+                indexes.pop(name, None)
+            self._save(indexes)
+
+
+def chroma_state(chroma_path=CHROMA_PATH):
+    """
+    The collections (name -> id) and segment IDs recorded in Chroma's SQLite database,
+    or None if there is no database.
+    """
+    if not os.path.exists(chroma_path):
+        return None
+    connection = sqlite3.connect(f"file:{chroma_path}?mode=ro", uri=True)
+    try:
+        collections = dict(connection.execute("SELECT name, id FROM collections"))
+        segments = {row[0] for row in connection.execute("SELECT id FROM segments")}
+    finally:
+        connection.close()
+    return {"collections": collections, "segments": segments}
+
+
+def _is_stale(entry, max_age):
+    """Whether the source of an index changed or disappeared, or the index was not used for max_age."""
+    if max_age and datetime.fromisoformat(entry["last_used_at"]) < datetime.now(timezone.utc) - max_age:
+        return True
+    return not os.path.exists(entry["source_path"]) or file_hash(entry["source_path"]) != entry["source_sha256"]
+
+
+def find_garbage(db_dir=DB_DIR, registry=None, max_age=None):
+    """
+    Everything under db_dir no current registered index accounts for.
+
+    Returns a dict of lists: "directories" (orphaned Chroma segment directories and build
+    leftovers), "collections" (unregistered or stale Chroma collections) and "entries"
+    (registry entries whose index is gone or stale).
+    """
+    registry = registry or IndexRegistry(os.path.join(db_dir, "registry.json"))
+    indexes = registry.load()
+    chroma = chroma_state(os.path.join(db_dir, "chroma.sqlite3"))
+    garbage = {"directories": [], "collections": [], "entries": []}
+    if not os.path.isdir(db_dir):
+        return garbage
+
+    for name in sorted(os.listdir(db_dir)):
+        path = os.path.join(db_dir, name)
+        if not os.path.isdir(path):
+            continue
+        if UUID_RE.match(name) and (chroma is None or name not in chroma["segments"]):
+            garbage["directories"].append(path)
+        elif BUILD_LEFTOVER_RE.match(name):
+            garbage["directories"].append(path)
+
+    chroma_collections = chroma["collections"] if chroma else {}
+    for name, entry in indexes.items():
+        if entry["kind"] == "chroma" and name not in chroma_collections:
+            garbage["entries"].append(name)
+        elif entry["kind"] == "ai_act_index" and not os.path.isdir(os.path.join(db_dir, entry["path"])):
+            garbage["entries"].append(name)
+        elif entry["kind"] == "ai_act_index" and _is_stale(entry, None):
+            # Rebuilt on the next run anyway; there is only one, so its age does not matter
+            garbage["entries"].append(name)
+            garbage["directories"].append(os.path.join(db_dir, entry["path"]))
+        elif entry["kind"] == "chroma" and _is_stale(entry, max_age):
+            garbage["entries"].append(name)
+            garbage["collections"].append(name)
+    for name in chroma_collections:
+        if name not in indexes:
+            garbage["collections"].append(name)
+    return garbage
+
+
+def _size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def delete_collections(names, db_dir=DB_DIR):
+    """Delete Chroma collections together with their segment directories."""
+    import chromadb
+
+    client = chromadb.PersistentClient(path=db_dir)
+    for name in names:
+        client.delete_collection(name)
+
+
+def gc_main():
+    parser = argparse.ArgumentParser(description="Find and remove orphaned vector stores under db/.")
+    parser.add_argument("--delete", action="store_true", help="Remove what was found; without it nothing is changed")
+    parser.add_argument("--max-age-days", type=float, help="Also remove collections not used for this many days")
+    parser.add_argument(
+        "--trained-agents-data", action="store_true",
+        help=f"Also remove {os.path.basename(TRAINED_AGENTS_PATH)}, which changes how the agents behave",
+    )
+    args = parser.parse_args()
+
+    registry = IndexRegistry(REGISTRY_PATH)
+    max_age = timedelta(days=args.max_age_days) if args.max_age_days else None
+    garbage = find_garbage(DB_DIR, registry=registry, max_age=max_age)
+    files = [TRAINED_AGENTS_PATH] if args.trained_agents_data and os.path.exists(TRAINED_AGENTS_PATH) else []
+
+    total = 0
+    for path in garbage["directories"] + files:
+        size = _size(path)
+        total += size
+        print(f"{'Removing' if args.delete else 'Would remove'} {os.path.relpath(path, PROJECT_DIR)} ({size / 1e6:.1f} MB)")
+    for name in garbage["collections"]:
+        print(f"{'Removing' if args.delete else 'Would remove'} Chroma collection {name}")
+    for name in garbage["entries"]:
+        print(f"{'Removing' if args.delete else 'Would remove'} registry entry {name}")
+    if not any(garbage.values()) and not files:
+        print("Nothing to remove.")
+        return
+    if not args.delete:
+        print(f"{total / 1e6:.1f} MB can be freed; rerun with --delete to remove it.")
+        return
+
+    if garbage["collections"]:
+        delete_collections(garbage["collections"], DB_DIR)
+    for path in garbage["directories"]:
+        shutil.rmtree(path, ignore_errors=True)
+    for path in files:
+        os.remove(path)
+    registry.remove(garbage["entries"])
+    print(f"Freed {total / 1e6:.1f} MB.")
+
+
+if __name__ == "__main__":
+    gc_main()
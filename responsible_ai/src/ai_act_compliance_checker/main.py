@@ -1,11 +1,20 @@
 #!/usr/bin/env python
+import argparse
 import sys
-from ai_act_compliance_checker.crew import AIComplianceCrew  # Ensure correct import
+from ai_act_compliance_checker.crew import EXECUTION_MODES, AIComplianceCrew  # Ensure correct import
 
 def run():
+    parser = argparse.ArgumentParser(description="Check a project description for compliance with the AI Act.")
+    parser.add_argument('--mode', choices=EXECUTION_MODES, default='sequential',
+                        help="'dag' runs the action plan and the assessment concurrently")
+    parser.add_argument('--merge', action='store_true',
+                        help="In dag mode, merge both outputs into one report in a final task")
+    args = parser.parse_args(sys.argv[1:])
+
     inputs = {
         'path_to_ai_act': './src/ai_act_compliance_checker/data/AIAct.pdf', # https://www.europarl.europa.eu/doceo/document/TA-9-2024-0138_EN.pdf
         'path_to_project_description': './src/ai_act_compliance_checker/data/ProjectDescription.pdf'
     }
-    AIComplianceCrew().crew().kickoff(inputs=inputs)
-
+    crew = AIComplianceCrew(execution_mode=args.mode, merge=args.merge)
+    crew.kickoff(inputs=inputs)
+    print(crew.timer.report())
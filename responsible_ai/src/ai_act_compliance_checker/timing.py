@@ -0,0 +1,62 @@
+import threading
+import time
+
+
+class TaskTimer:
+    """
+    Records when each task of a crew run finishes and derives per-task durations and
+    the critical path from the task dependencies.
+
+    A task starts when its last dependency finishes (or when the run starts if it has
+    none), which is how crewAI schedules both sequential and asynchronous tasks.
+    """
+
+    def __init__(self, dependencies):
+        # dependencies: task name -> names of the tasks it waits for
+        self.dependencies = dependencies
+        self.started = None
+        self.finished = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.started = time.perf_counter()
+
+    def callback_for(self, name):
+        """Return a Task callback recording when the named task finishes."""
+        def record(output):
+            with self._lock:
+                self.finished[name] = time.perf_counter()
+        return record
+
+    def _start_of(self, name):
+        return max((self.finished[dep] for dep in self.dependencies[name]), default=self.started)
+
+    def durations(self):
+        """Seconds spent in each finished task, excluding the wait for its dependencies."""
+        return {name: end - self._start_of(name) for name, end in self.finished.items()}
+
+    def critical_path(self):
+        """The chain of tasks that determined the total run time, first task first."""
+        if not self.finished:
+            return []
+        path = [max(self.finished, key=self.finished.get)]
+        while self.dependencies[path[0]]:
+            path.insert(0, max(self.dependencies[path[0]], key=self.finished.get))
+        return path
+
+    def report(self):
+        """A printable summary of task durations and the critical path."""
+        durations = self.durations()
+        wall = max(self.finished.values()) - self.started if self.finished else 0.0
+        lines = ["Task timings:"]
+        for name, end in sorted(self.finished.items(), key=lambda item: item[1]):
+            lines.append(
+                f"  {name}: {durations[name]:.1f}s (from {self._start_of(name) - self.started:.1f}s to {end - self.started:.1f}s)"
+            )
+        path = self.critical_path()
+        lines.append(
+            "Critical path: " + " -> ".join(f"{name} ({durations[name]:.1f}s)" for name in path)
+            + f" = {sum(durations[name] for name in path):.1f}s of {wall:.1f}s wall time"
+        )
+        lines.append(f"Sum of task durations: {sum(durations.values()):.1f}s")
+        return "\n".join(lines)
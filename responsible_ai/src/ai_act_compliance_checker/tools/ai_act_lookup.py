@@ -0,0 +1,99 @@
+import threading
+from typing import Any, Type
+
+from crewai_tools import BaseTool
+from pydantic import BaseModel, Field
+
+from ai_act_compliance_checker.ai_act_structure import paragraph, parse_references
+from ai_act_compliance_checker.tools.ai_act_search import get_ai_act_search_tool
+
+
+class AIActLookupToolSchema(BaseModel):
+    """Input for AIActLookupTool."""
+
+    reference: str = Field(
+        ...,
+        description="One or more references to the AI Act, e.g. 'Article 6(2)', 'Articles 8 to 15', 'Annex III', 'Recital 27' or 'Chapter III'.",
+    )
+
+
+def _pages(element):
+    first, last = element["pages"]
+    return f"page {first}" if first == last else f"pages {first}-{last}"
+
+
+def _links(element):
+    lines = []
+    for heading, links in (("Refers to", element["references"]), ("Referred to by", element["referenced_by"])):
+        names = [f"Article {number}" for number in links["articles"]] + [f"Annex {number}" for number in links["annexes"]]
+        if names:
+            lines.append(f"{heading}: {', '.join(names)}")
+    return "\n".join(lines)
+
+
+class AIActLookupTool(BaseTool):
+    name: str = "Look up the AI Act"
+    description: str = (
+        "Direct lookup of AI Act articles, paragraphs, annexes, recitals and chapters by their number. "
+        "Returns the exact text with its title, location and cross-references. Use it whenever you know "
+        "which provision you need; use 'Search the AI Act' to find provisions by topic."
+    )
+    args_schema: Type[BaseModel] = AIActLookupToolSchema
+    structure: Any = None  # The AIActStructure of the prebuilt index
+
+    def _run(self, reference: str) -> str:
+        references = parse_references(reference)
+        if not references:
+            return (
+                "No reference recognized. Name an article, annex, recital or chapter by number, "
+                "e.g. 'Article 6(2)' or 'Annex III'."
+            )
+        return "\n\n---\n\n".join(self._lookup(*reference) for reference in dict.fromkeys(references))
+
+    def _lookup(self, kind, label, subdivision):
+        element = self.structure.get(kind, label)
+        if element is None:
+            counts = self.structure.counts()
+            return (
+                f"There is no {kind.capitalize()} {label} in the AI Act "
+                f"({counts['articles']} articles, {counts['annexes']} annexes, {counts['recitals']} recitals, {counts['chapters']} chapters)."
+            )
+        if kind == "chapter":
+            lines = [f"Chapter {label} - {element['title']}"]
+            section_starts = {section["articles"][0]: number for number, section in element["sections"].items() if section["articles"]}
+            for number in element["articles"]:
+                if number in section_starts:
+                    section = section_starts[number]
+                    lines.append(f"Section {section} - {element['sections'][section]['title']}")
+                lines.append(f"  Article {number} - {self.structure.get('article', number)['title']}")
+            return "\n".join(lines)
+        if kind == "recital":
+            return f"Recital {label} ({_pages(element)})\n{element['text']}"
+
+        name, text, note = f"{kind.capitalize()} {label}", element["text"], None
+        if subdivision:
+            part = paragraph(text, subdivision)
+            if part is None:
+                note = f"Paragraph {subdivision} not found, showing the full text."
+            else:
+                name, text = name + subdivision, part
+        location = _pages(element)
+        if kind == "article" and element["section"]:
+            location = f"Chapter {element['chapter']}, Section {element['section']}, {location}"
+        elif kind == "article" and element["chapter"]:
+            location = f"Chapter {element['chapter']}, {location}"
+        heading = f"{name} - {element['title']} ({location})"
+        return "\n".join(part for part in (heading, note, text, _links(element)) if part)
+
+
+_tool = None
+_tool_lock = threading.Lock()
+
+
+def get_ai_act_lookup_tool():
+    """Return the process-wide AI Act lookup tool, sharing the structure of the prebuilt index."""
+    global _tool
+    with _tool_lock:
+        if _tool is None:
+            _tool = AIActLookupTool(structure=get_ai_act_search_tool().index.structure)
+        return _tool
@@ -0,0 +1,50 @@
+import os
+import threading
+from typing import Any, Type
+
+from crewai_tools import BaseTool
+from pydantic import BaseModel, Field
+
+from ai_act_compliance_checker.ai_act_index import embed_texts, load_or_build_index
+
+
+class AIActSearchToolSchema(BaseModel):
+    """Input for AIActSearchTool."""
+
+    query: str = Field(..., description="What to look up in the AI Act, e.g. 'obligations of deployers of high-risk AI systems'.")
+
+
+class AIActSearchTool(BaseTool):
+    name: str = "Search the AI Act"
+    description: str = (
+        "Semantic search over the full text of the EU AI Act. Returns the most relevant passages "
+        "with their page numbers. Use it for any question about the AI Act instead of searching the PDF."
+    )
+    args_schema: Type[BaseModel] = AIActSearchToolSchema
+    index: Any = None  # The prebuilt AIActIndex
+    top_k: int = 5
+
+    def _run(self, query: str) -> str:
+        query_vector = embed_texts([query], model=self.index.model)[0]
+        results = self.index.search(query_vector, k=self.top_k)
+        if not results:
+            return "No relevant passages found in the AI Act."
+        return "\n\n".join(f"[AI Act, page {chunk['page']}]\n{chunk['text']}" for _, chunk in results)
+
+
+_tool = None
+_tool_lock = threading.Lock()
+
+
+def get_ai_act_search_tool(pdf_path=None):
+    """
+    Return the process-wide AI Act search tool, loading (or building) the index on first use.
+    pdf_path selects the AI Act PDF to index, by default the one the stored index was built from.
+    """
+    global _tool
+    with _tool_lock:
+        if _tool is None:
+            _tool = AIActSearchTool(index=load_or_build_index(pdf_path))
+        elif pdf_path and os.path.abspath(pdf_path) != _tool.index.manifest["source_path"]:
+            raise ValueError(f"This process already uses the AI Act index of {_tool.index.manifest['source_path']}.")
+        return _tool
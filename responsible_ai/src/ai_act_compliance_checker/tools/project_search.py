@@ -0,0 +1,25 @@
+from crewai_tools import PDFSearchTool
+
+from ai_act_compliance_checker.ai_act_index import EMBEDDING_MODEL
+from ai_act_compliance_checker.index_registry import DB_DIR, IndexRegistry, collection_name, file_hash
+
+
+def get_project_search_tool(pdf_path, model=EMBEDDING_MODEL):
+    """
+    Return a PDF search tool over one project description, stored in the registered Chroma
+    collection for its content and embedding model. A description checked before is not
+    embedded again: embedchain skips the chunks already in the collection.
+    """
+    registry = IndexRegistry()
+    source_hash = file_hash(pdf_path)
+    name = registry.find("chroma", source_hash, model) or collection_name(source_hash, model)
+    config = {
+        "vectordb": {"provider": "chroma", "config": {"collection_name": name, "dir": DB_DIR}},
+        "embedder": {"provider": "openai", "config": {"model": model}},
+    }
+    tool = PDFSearchTool(pdf=pdf_path, config=config)
+    if name in registry.load():
+        registry.touch(name)
+    else:
+        registry.register(name, "chroma", pdf_path, source_hash, model)
+    return tool
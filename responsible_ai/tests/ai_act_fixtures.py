@@ -0,0 +1,41 @@
+"""
+A miniature AI Act: the page texts of a regulation with recitals, chapters, a section,
+articles and annexes, laid out like the text pypdf extracts from the Official Journal.
+"""
+
+PAGES = [
+    "REGULATION (EU) 2024/1689 OF THE EUROPEAN PARLIAMENT\n"
+    "Whereas:\n"
+    "(1) The purpose of this Regulation is to improve the functioning of the internal \n"
+    "market.\n"
+    "(2) This Regulation applies in accordance with Article 16 TFEU.\n"
+    "HAVE ADOPTED THIS REGULATION:\n"
+    "CHAPTER I\n"
+    "GENERAL PROVISIONS\n"
+    "Article 1\n"
+    "Subject matter\n"
+    "1. This Regulation lays down rules for AI systems.\n"
+    "2. It does not apply to the areas listed in Annex II.\n"
+    "OJ L, 12.7.2024 EN\n"
+    "(1) A footnote of the first page.\n",
+    "CHAPTER II\n"
+    "HIGH-RISK AI SYSTEMS\n"
+    "SECTION 1\n"
+    "Classification\n"
+    "Article 2\n"
+    "Classification rules for high-risk AI \n"
+    "systems\n"
+    "1. An AI system is high-risk where it is listed in Annex II.\n"
+    "2. AI systems referred to in Annex I shall also be considered high-risk, \n"
+    "subject to Article 1(2).\n"
+    "Article 3\n"
+    "Obligations of providers\n"
+    "1. Providers shall comply with Articles 1 to 2 and with Article 5 of Regulation (EU) 2016/679.\n",
+    "Done at Brussels, 13 June 2024.\n"
+    "ANNEX I\n"
+    "List of products\n"
+    "Products covered by Article 2(2).\n"
+    "ANNEX II\n"
+    "High-risk areas\n"
+    "1. Biometrics, as set out in Article 3.\n",
+]
@@ -0,0 +1,176 @@
+import os
+import sys
+
+# Add the src directory to sys.path to ensure imports work correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import importlib.util
+import json
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+from ai_act_fixtures import PAGES
+
+HAS_DEPENDENCIES = all(importlib.util.find_spec(name) for name in ("openai", "pypdf"))
+
+
+def fake_embed(texts, model="fake-model", client=None):
+    """
+    Stands in for embed_texts: one normalized vector per text, derived from its length.
+    """
+    vectors = np.array([[1.0, float(len(text) % 7), float(len(model))] for text in texts], dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def fake_reader(path):
+    """
+    Stands in for pypdf's PdfReader, returning the miniature AI Act whatever the file.
+    """
+    return SimpleNamespace(pages=[SimpleNamespace(extract_text=lambda text=text: text) for text in PAGES])
+
+
+@unittest.skipUnless(HAS_DEPENDENCIES, "the openai and pypdf packages are not installed")
+class TestAIActIndex(unittest.TestCase):
+    """
+    Unit tests for building, reusing and rebuilding the prebuilt AI Act index.
+    """
+
+    def setUp(self):
+        from ai_act_compliance_checker import ai_act_index
+
+        self.ai_act_index = ai_act_index
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.db_dir = os.path.join(self.tmp_dir.name, "db")
+        self.index_dir = os.path.join(self.db_dir, "ai_act_index")
+        self.pdf_path = self.write_pdf("AIAct.pdf", b"first version")
+        for patcher in (
+            patch.object(ai_act_index, "embed_texts", side_effect=fake_embed),
+            patch.object(ai_act_index, "PdfReader", side_effect=fake_reader),
+            patch.dict(os.environ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        os.environ.pop("AI_ACT_EMBEDDING_MODEL", None)
+        self.embed = ai_act_index.embed_texts
+
+    def write_pdf(self, name, data):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def load_or_build(self, **kwargs):
+        return self.ai_act_index.load_or_build_index(index_dir=self.index_dir, **kwargs)
+
+    def test_build_writes_the_index_and_registers_it(self):
+        """
+        Test that a build writes every file of the index, records its source and registers it.
+        """
+        index = self.load_or_build(pdf_path=self.pdf_path, model="fake-model")
+
+        self.assertEqual(sorted(os.listdir(self.index_dir)), ["chunks.json", "manifest.json", "structure.json", "vectors.npy"])
+        self.assertEqual(index.manifest["source_path"], os.path.abspath(self.pdf_path))
+        self.assertEqual(index.manifest["format_version"], self.ai_act_index.INDEX_FORMAT_VERSION)
+        self.assertEqual(len(index), index.manifest["chunks"])
+        self.assertEqual(index.structure.counts()["articles"], 3)
+        self.assertEqual(index.search(fake_embed([index.chunks[0]["text"]])[0], k=1)[0][1], index.chunks[0])
+        with open(os.path.join(self.db_dir, "registry.json")) as f:
+            self.assertEqual(json.load(f)["indexes"]["ai_act_index"]["embedding_model"], "fake-model")
+
+    def test_current_index_is_reused(self):
+        """
+        Test that an index built from the same PDF and model is loaded without embedding anything.
+        """
+        self.load_or_build(pdf_path=self.pdf_path, model="fake-model")
+        self.embed.reset_mock()
+        self.load_or_build(pdf_path=self.pdf_path, model="fake-model")
+        self.embed.assert_not_called()
+
+    def test_rebuild_when_the_pdf_changes(self):
+        """
+        Test that a PDF with different content is reindexed.
+        """
+        first = self.load_or_build(pdf_path=self.pdf_path, model="fake-model").manifest
+        self.write_pdf("AIAct.pdf", b"second version")
+        second = self.load_or_build(pdf_path=self.pdf_path, model="fake-model").manifest
+        self.assertNotEqual(first["source_sha256"], second["source_sha256"])
+        self.assertEqual(self.embed.call_count, 2)
+
+    def test_rebuild_when_the_model_changes(self):
+        """
+        Test that asking for another embedding model rebuilds the index with it.
+        """
+        self.load_or_build(pdf_path=self.pdf_path, model="fake-model")
+        index = self.load_or_build(pdf_path=self.pdf_path, model="other-model")
+        self.assertEqual(index.model, "other-model")
+        self.assertEqual(self.embed.call_count, 2)
+
+    def test_rebuild_when_the_format_version_changes(self):
+        """
+        Test that an index written in an older format is rebuilt.
+        """
+        self.load_or_build(pdf_path=self.pdf_path, model="fake-model")
+        manifest_path = os.path.join(self.index_dir, "manifest.json")
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        manifest["format_version"] = self.ai_act_index.INDEX_FORMAT_VERSION - 1
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f)
+
+        index = self.load_or_build(pdf_path=self.pdf_path, model="fake-model")
+        self.assertEqual(index.manifest["format_version"], self.ai_act_index.INDEX_FORMAT_VERSION)
+        self.assertEqual(self.embed.call_count, 2)
+
+    def test_rebuild_swaps_the_directory_atomically(self):
+        """
+        Test that a rebuild replaces the index without leftovers, and that a failed build
+        leaves the previous index in place.
+        """
+        self.load_or_build(pdf_path=self.pdf_path, model="fake-model")
+        self.load_or_build(pdf_path=self.pdf_path, model="other-model")
+        self.assertEqual(sorted(os.listdir(self.db_dir)), ["ai_act_index", "registry.json"])
+
+        self.embed.side_effect = RuntimeError("rate limited")
+        with self.assertRaises(RuntimeError):
+            self.load_or_build(pdf_path=self.pdf_path, model="third-model")
+        self.assertEqual(sorted(os.listdir(self.db_dir)), ["ai_act_index", "registry.json"])
+        self.assertEqual(self.ai_act_index.AIActIndex(self.index_dir).model, "other-model")
+
+    def test_recorded_source_and_model_are_the_defaults(self):
+        """
+        Test that without a PDF or model the ones recorded in the manifest are used, so a
+        custom build is not rebuilt from the default PDF.
+        """
+        custom_pdf = self.write_pdf("custom.pdf", b"custom")
+        self.load_or_build(pdf_path=custom_pdf, model="custom-model")
+        self.embed.reset_mock()
+
+        index = self.load_or_build()
+        self.embed.assert_not_called()
+        self.assertEqual((index.manifest["source_path"], index.model), (os.path.abspath(custom_pdf), "custom-model"))
+
+    def test_resolve_source(self):
+        """
+        Test the precedence of explicit arguments, AI_ACT_EMBEDDING_MODEL, the manifest and the defaults.
+        """
+        resolve_source = self.ai_act_index.resolve_source
+        manifest = {"source_path": self.pdf_path, "embedding_model": "recorded-model"}
+
+        self.assertEqual(resolve_source(manifest), (self.pdf_path, "recorded-model"))
+        self.assertEqual(resolve_source(manifest, "other.pdf", "given-model"), ("other.pdf", "given-model"))
+        self.assertEqual(
+            resolve_source(None), (self.ai_act_index.AI_ACT_PATH, self.ai_act_index.EMBEDDING_MODEL)
+        )
+        # A recorded PDF that no longer exists falls back to the bundled one
+        self.assertEqual(resolve_source({"source_path": "missing.pdf"})[0], self.ai_act_index.AI_ACT_PATH)
+        os.environ["AI_ACT_EMBEDDING_MODEL"] = "env-model"
+        self.assertEqual(resolve_source(manifest)[1], "env-model")
+
+
+if __name__ == '__main__':
+    unittest.main()
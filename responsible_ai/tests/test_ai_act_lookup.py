@@ -0,0 +1,75 @@
+import os
+import sys
+
+# Add the src directory to sys.path to ensure imports work correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import importlib.util
+import unittest
+
+from ai_act_compliance_checker.ai_act_structure import AIActStructure, parse_structure
+from ai_act_fixtures import PAGES
+
+
+@unittest.skipUnless(importlib.util.find_spec("crewai_tools"), "the crewai_tools package is not installed")
+class TestAIActLookupTool(unittest.TestCase):
+    """
+    Unit tests for the direct lookup of AI Act provisions by number.
+    """
+
+    def setUp(self):
+        from ai_act_compliance_checker.tools.ai_act_lookup import AIActLookupTool
+
+        self.tool = AIActLookupTool(structure=AIActStructure(parse_structure(PAGES)))
+
+    def test_article_paragraph(self):
+        """
+        Test that a paragraph reference returns that paragraph with the article's title, location and links.
+        """
+        result = self.tool._run("Article 2(1)")
+        self.assertTrue(result.startswith(
+            "Article 2(1) - Classification rules for high-risk AI systems (Chapter II, Section 1, page 2)\n"
+            "1. An AI system is high-risk where it is listed in Annex II.\n"
+        ))
+        self.assertNotIn("2. AI systems", result)
+        self.assertIn("Refers to: Article 1, Annex I, Annex II", result)
+        self.assertIn("Referred to by: Article 3, Annex I", result)
+
+    def test_annex_recital_and_chapter(self):
+        """
+        Test lookups of annexes, recitals and chapters.
+        """
+        self.assertTrue(self.tool._run("Annex II").startswith("Annex II - High-risk areas (page 3)\n1. Biometrics"))
+        self.assertEqual(
+            self.tool._run("Recital 2"),
+            "Recital 2 (page 1)\n(2) This Regulation applies in accordance with Article 16 TFEU.",
+        )
+        self.assertEqual(
+            self.tool._run("Chapter II"),
+            "Chapter II - HIGH-RISK AI SYSTEMS\nSection 1 - Classification\n"
+            "  Article 2 - Classification rules for high-risk AI systems\n  Article 3 - Obligations of providers",
+        )
+
+    def test_several_references(self):
+        """
+        Test that every provision of a range is returned once.
+        """
+        result = self.tool._run("Articles 1 to 2, Article 2")
+        self.assertEqual(result.count("\n\n---\n\n"), 1)
+        self.assertTrue(result.startswith("Article 1 - Subject matter"))
+
+    def test_misses(self):
+        """
+        Test the answers for unknown provisions and paragraphs and for text without a reference.
+        """
+        self.assertEqual(
+            self.tool._run("Article 99"),
+            "There is no Article 99 in the AI Act (3 articles, 2 annexes, 2 recitals, 2 chapters).",
+        )
+        self.assertTrue(self.tool._run("Annex XX").startswith("There is no Annex XX in the AI Act"))
+        self.assertIn("Paragraph (7) not found, showing the full text.", self.tool._run("Article 2(7)"))
+        self.assertTrue(self.tool._run("high-risk obligations").startswith("No reference recognized."))
+
+
+if __name__ == '__main__':
+    unittest.main()
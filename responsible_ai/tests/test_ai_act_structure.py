@@ -0,0 +1,184 @@
+import os
+import sys
+
+# Add the src directory to sys.path to ensure imports work correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import tempfile
+import unittest
+
+from ai_act_compliance_checker.ai_act_structure import (
+    AIActStructure,
+    from_roman,
+    load_structure,
+    paragraph,
+    parse_references,
+    parse_structure,
+)
+from ai_act_fixtures import PAGES
+
+
+class TestParseStructure(unittest.TestCase):
+    """
+    Unit tests for splitting the AI Act text into recitals, chapters, sections, articles and annexes.
+    """
+
+    def setUp(self):
+        self.structure = parse_structure(PAGES)
+
+    def test_recitals(self):
+        """
+        Test that recitals are numbered in order, with wrapped lines joined.
+        """
+        recitals = self.structure["recitals"]
+        self.assertEqual(list(recitals), ["1", "2"])
+        self.assertEqual(
+            recitals["1"]["text"],
+            "(1) The purpose of this Regulation is to improve the functioning of the internal market.",
+        )
+
+    def test_chapters_and_sections(self):
+        """
+        Test that chapters and sections get their titles and the articles they contain.
+        """
+        chapters = self.structure["chapters"]
+        self.assertEqual(chapters["I"], {"title": "GENERAL PROVISIONS", "articles": [1], "sections": {}})
+        self.assertEqual(chapters["II"]["title"], "HIGH-RISK AI SYSTEMS")
+        self.assertEqual(chapters["II"]["sections"], {"1": {"title": "Classification", "articles": [2, 3]}})
+
+    def test_articles(self):
+        """
+        Test that articles keep their wrapped title, location and text, without running footers and footnotes.
+        """
+        articles = self.structure["articles"]
+        self.assertEqual(list(articles), ["1", "2", "3"])
+        self.assertEqual(articles["2"]["title"], "Classification rules for high-risk AI systems")
+        self.assertEqual((articles["2"]["chapter"], articles["2"]["section"]), ("II", "1"))
+        self.assertEqual(articles["1"]["section"], None)
+        self.assertEqual(
+            articles["1"]["text"],
+            "1. This Regulation lays down rules for AI systems.\n2. It does not apply to the areas listed in Annex II.",
+        )
+        self.assertNotIn("footnote", articles["1"]["text"])
+        self.assertEqual(articles["1"]["pages"], [1, 1])
+
+    def test_annexes(self):
+        """
+        Test that annexes start after the signature and keep their title and page.
+        """
+        annexes = self.structure["annexes"]
+        self.assertEqual(list(annexes), ["I", "II"])
+        self.assertEqual(annexes["I"]["title"], "List of products")
+        self.assertEqual(annexes["I"]["text"], "Products covered by Article 2(2).")
+        self.assertEqual(annexes["II"]["pages"], [3, 3])
+        self.assertNotIn("Done at", self.structure["articles"]["3"]["text"])
+
+    def test_cross_references(self):
+        """
+        Test that references are linked both ways, with references to other acts left out.
+        """
+        articles, annexes = self.structure["articles"], self.structure["annexes"]
+        self.assertEqual(articles["2"]["references"], {"articles": ["1"], "annexes": ["I", "II"]})
+        # "Articles 1 to 2" is a range; "Article 5 of Regulation (EU) 2016/679" belongs to another act
+        self.assertEqual(articles["3"]["references"], {"articles": ["1", "2"], "annexes": []})
+        self.assertEqual(articles["1"]["referenced_by"], {"articles": ["2", "3"], "annexes": []})
+        self.assertEqual(annexes["II"]["referenced_by"], {"articles": ["1", "2"], "annexes": []})
+
+    def test_numbers_out_of_order_are_not_headings(self):
+        """
+        Test that a line looking like a heading but out of sequence stays in the text.
+        """
+        pages = [PAGES[0].replace("2. It does not apply", "Article 7\n2. It does not apply")] + PAGES[1:]
+        structure = parse_structure(pages)
+        self.assertEqual(list(structure["articles"]), ["1", "2", "3"])
+        self.assertIn("Article 7", structure["articles"]["1"]["text"])
+
+
+class TestParseReferences(unittest.TestCase):
+    """
+    Unit tests for recognizing references to articles, annexes, recitals and chapters.
+    """
+
+    def test_single_references(self):
+        """
+        Test references with and without a subdivision.
+        """
+        self.assertEqual(parse_references("Article 6(2)"), [("article", "6", "(2)")])
+        self.assertEqual(parse_references("see Annex III"), [("annex", "III", "")])
+        self.assertEqual(parse_references("Recital 27 and Chapter IV"), [("recital", "27", ""), ("chapter", "IV", "")])
+        self.assertEqual(parse_references("Article 3(1)(a)"), [("article", "3", "(1)(a)")])
+
+    def test_ranges_and_lists(self):
+        """
+        Test that ranges are expanded and lists give one reference per item.
+        """
+        self.assertEqual(
+            parse_references("Articles 8 to 11"),
+            [("article", "8", ""), ("article", "9", ""), ("article", "10", ""), ("article", "11", "")],
+        )
+        self.assertEqual(parse_references("Annexes I to III"), [("annex", "I", ""), ("annex", "II", ""), ("annex", "III", "")])
+        self.assertEqual(
+            parse_references("Articles 53, 54 and 55(1)"),
+            [("article", "53", ""), ("article", "54", ""), ("article", "55", "(1)")],
+        )
+
+    def test_external_references_are_left_out(self):
+        """
+        Test that articles and annexes of other acts are not taken for the AI Act's own.
+        """
+        self.assertEqual(parse_references("Article 16 TFEU"), [])
+        self.assertEqual(parse_references("Article 5 of Regulation (EU) 2016/679"), [])
+        self.assertEqual(parse_references("Annex I to Directive (EU) 2020/1828"), [])
+        self.assertEqual(parse_references("Article 42(1) and (2) of Regulation (EU) 2019/881"), [])
+
+    def test_mismatched_numerals_are_ignored(self):
+        """
+        Test that annexes need Roman numerals and articles Arabic ones.
+        """
+        self.assertEqual(parse_references("Annex 3"), [])
+        self.assertEqual(parse_references("Article IV"), [])
+        self.assertEqual(from_roman("IIII"), None)
+        self.assertEqual(from_roman("XIV"), 14)
+
+
+class TestAIActStructure(unittest.TestCase):
+    """
+    Unit tests for looking up elements and paragraphs of the parsed structure.
+    """
+
+    def setUp(self):
+        self.structure = AIActStructure(parse_structure(PAGES))
+
+    def test_get(self):
+        """
+        Test lookups by kind and label, including lower-case numerals and misses.
+        """
+        self.assertEqual(self.structure.get("article", 2)["title"], "Classification rules for high-risk AI systems")
+        self.assertEqual(self.structure.get("annex", "ii")["title"], "High-risk areas")
+        self.assertIsNone(self.structure.get("article", 99))
+        self.assertIsNone(self.structure.get("annex", "XX"))
+        self.assertEqual(self.structure.counts(), {"recitals": 2, "chapters": 2, "articles": 3, "annexes": 2})
+
+    def test_paragraph(self):
+        """
+        Test that a paragraph runs up to the next one, and that a missing paragraph is None.
+        """
+        text = self.structure.get("article", 2)["text"]
+        self.assertEqual(paragraph(text, "(1)"), "1. An AI system is high-risk where it is listed in Annex II.")
+        self.assertTrue(paragraph(text, "(2)(a)").startswith("2. AI systems referred to in Annex I"))
+        self.assertIsNone(paragraph(text, "(5)"))
+        self.assertIsNone(paragraph(text, ""))
+        self.assertEqual(paragraph("(1) 'AI system' means a system;\n(2) 'risk' means", "(2)"), "(2) 'risk' means")
+
+    def test_save_and_load(self):
+        """
+        Test that the structure stored with an index is read back, and that an index without one gives None.
+        """
+        with tempfile.TemporaryDirectory() as index_dir:
+            self.assertIsNone(load_structure(index_dir))
+            self.structure.save(os.path.join(index_dir, "structure.json"))
+            self.assertEqual(load_structure(index_dir).structure, self.structure.structure)
+
+
+if __name__ == '__main__':
+    unittest.main()
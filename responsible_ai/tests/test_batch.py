@@ -0,0 +1,127 @@
+import os
+import sys
+
+# Add the src directory to sys.path to ensure imports work correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import importlib.util
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+
+HAS_DEPENDENCIES = all(importlib.util.find_spec(name) for name in ("crewai", "crewai_tools", "openai", "pypdf"))
+
+
+@unittest.skipUnless(HAS_DEPENDENCIES, "the crewai, crewai_tools, openai and pypdf packages are not installed")
+class TestBatch(unittest.TestCase):
+    """
+    Unit tests for the batch runner: resume, result records and the final summary.
+    """
+
+    def setUp(self):
+        from ai_act_compliance_checker import batch
+
+        self.batch = batch
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.output = os.path.join(self.tmp_dir.name, "results.jsonl")
+
+    def write_document(self, name, data=b"%PDF project"):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_result_writer_appends_one_line_per_record(self):
+        """
+        Test that records are appended as JSON lines to what earlier runs wrote.
+        """
+        for status in ("ok", "error"):
+            writer = self.batch.ResultWriter(self.output)
+            writer.write({"path": "a.pdf", "sha256": "1", "status": status})
+            writer.close()
+        with open(self.output) as f:
+            self.assertEqual([json.loads(line)["status"] for line in f], ["ok", "error"])
+
+    def test_completed_documents_resume(self):
+        """
+        Test that only successful results count as done, ignoring a line cut short by an interrupted run.
+        """
+        self.assertEqual(self.batch.completed_documents(self.output), set())
+        with open(self.output, "w") as f:
+            f.write(json.dumps({"path": "a.pdf", "sha256": "1", "status": "ok"}) + "\n")
+            f.write(json.dumps({"path": "b.pdf", "sha256": "2", "status": "error"}) + "\n")
+            f.write(json.dumps({"path": "c.pdf", "status": "error"}) + "\n")
+            f.write('{"path": "d.pdf", "sha2')
+        self.assertEqual(self.batch.completed_documents(self.output), {("a.pdf", "1")})
+
+    def test_check_document(self):
+        """
+        Test the records of a checked, an already checked and a failing document.
+        """
+        path = self.write_document("project.pdf")
+        sha256 = self.batch.file_hash(path)
+        with patch.object(self.batch, "AIComplianceCrew") as crew:
+            crew.return_value.kickoff.return_value = "compliant"
+            record = self.batch.check_document(path, "AIAct.pdf", "sequential", False)
+            self.assertEqual((record["status"], record["sha256"], record["result"]), ("ok", sha256, "compliant"))
+            crew.return_value.kickoff.assert_called_once_with(
+                inputs={"path_to_ai_act": "AIAct.pdf", "path_to_project_description": path}
+            )
+
+            self.assertIsNone(self.batch.check_document(path, "AIAct.pdf", "sequential", False, done={(path, sha256)}))
+
+            crew.return_value.kickoff.side_effect = RuntimeError("rate limited")
+            record = self.batch.check_document(path, "AIAct.pdf", "sequential", False)
+            self.assertEqual((record["status"], record["error"]), ("error", "RuntimeError: rate limited"))
+
+    def test_unreadable_document_does_not_stop_the_batch(self):
+        """
+        Test that a vanished file is recorded as an error while the other documents are checked,
+        and that a rerun only retries the failed one.
+        """
+        first = self.write_document("first.pdf", b"first")
+        missing = os.path.join(self.tmp_dir.name, "missing.pdf")
+        manifest = os.path.join(self.tmp_dir.name, "projects.txt")
+        with open(manifest, "w") as f:
+            f.write(f"{first}\n{missing}\n")
+        argv = ["ai_act_batch", manifest, "--output", self.output, "--workers", "2"]
+
+        with patch.object(self.batch, "AIComplianceCrew") as crew, \
+                patch.object(self.batch, "get_ai_act_search_tool"), \
+                patch.object(sys, "argv", argv), \
+                patch("builtins.print"):
+            crew.return_value.kickoff.return_value = "compliant"
+            self.batch.run_batch()
+            self.batch.run_batch()
+
+        with open(self.output) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(
+            sorted((record["path"], record["status"]) for record in records),
+            [(first, "ok"), (missing, "error"), (missing, "error")],
+        )
+        self.assertIn("FileNotFoundError", records[-1]["error"])
+        self.assertEqual(crew.return_value.kickoff.call_count, 1)
+
+    def test_summarize(self):
+        """
+        Test the throughput and latency percentiles of the final summary.
+        """
+        latencies = [float(seconds) for seconds in range(2, 41, 2)]
+        self.assertEqual(
+            self.batch.summarize(latencies, 2, 60.0),
+            [
+                "Checked 20 documents (2 failed) in 60.0s: 20.0 documents/min",
+                "Latency per document: mean 21.0s, p50 21.0s, p95 39.9s, max 40.0s",
+            ],
+        )
+        self.assertEqual(
+            self.batch.summarize([4.0], 0, 4.0)[1], "Latency per document: mean 4.0s, p50 4.0s, p95 4.0s, max 4.0s"
+        )
+        self.assertEqual(self.batch.summarize([], 0, 0.0), ["Checked 0 documents (0 failed) in 0.0s: 0.0 documents/min"])
+
+
+if __name__ == '__main__':
+    unittest.main()
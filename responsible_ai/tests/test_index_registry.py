@@ -0,0 +1,161 @@
+import os
+import sys
+
+# Add the src directory to sys.path to ensure imports work correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import contextlib
+import io
+import json
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from ai_act_compliance_checker import index_registry
+from ai_act_compliance_checker.index_registry import IndexRegistry, file_hash, find_garbage
+
+LIVE_SEGMENT = "11111111-1111-1111-1111-111111111111"
+ORPHAN_SEGMENT = "22222222-2222-2222-2222-222222222222"
+MODEL = "text-embedding-3-small"
+
+
+class TestGarbageCollection(unittest.TestCase):
+    """
+    Unit tests for finding and removing what no registered index accounts for under db/.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.project_dir = self.tmp_dir.name
+        self.db_dir = os.path.join(self.project_dir, "db")
+        os.makedirs(self.db_dir)
+        self.registry = IndexRegistry(os.path.join(self.db_dir, "registry.json"))
+
+        self.source = self.write(os.path.join(self.project_dir, "project.pdf"), b"%PDF project")
+        self.regulation = self.write(os.path.join(self.project_dir, "ai_act.pdf"), b"%PDF regulation")
+        source_hash = file_hash(self.source)
+
+        # A live collection with its segment, and the current AI Act index
+        self.registry.register("pdf-live", "chroma", self.source, source_hash, MODEL)
+        os.makedirs(os.path.join(self.db_dir, LIVE_SEGMENT))
+        self.registry.register(
+            "ai_act_index", "ai_act_index", self.regulation, file_hash(self.regulation), MODEL, path="ai_act_index"
+        )
+        os.makedirs(os.path.join(self.db_dir, "ai_act_index"))
+        # Garbage: a segment directory Chroma no longer knows, an interrupted index build,
+        # an unregistered collection, a collection built from an older version of its
+        # source and a registry entry whose collection is gone
+        os.makedirs(os.path.join(self.db_dir, ORPHAN_SEGMENT))
+        os.makedirs(os.path.join(self.db_dir, ".ai_act_index-abc123"))
+        self.registry.register("pdf-outdated", "chroma", self.source, "0" * 64, MODEL)
+        self.registry.register("pdf-gone", "chroma", self.source, source_hash, MODEL)
+        self.create_chroma({"pdf-live": "c1", "pdf-stray": "c2", "pdf-outdated": "c3"}, [LIVE_SEGMENT])
+
+        self.trained_agents = self.write(os.path.join(self.project_dir, "trained_agents_data.pkl"), b"trained")
+
+    def write(self, path, data):
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def create_chroma(self, collections, segments):
+        connection = sqlite3.connect(os.path.join(self.db_dir, "chroma.sqlite3"))
+        with connection:
+            connection.execute("CREATE TABLE collections (id TEXT, name TEXT)")
+            connection.execute("CREATE TABLE segments (id TEXT)")
+            connection.executemany("INSERT INTO collections VALUES (?, ?)", [(i, n) for n, i in collections.items()])
+            connection.executemany("INSERT INTO segments VALUES (?)", [(s,) for s in segments])
+        connection.close()
+
+    def set_last_used(self, name, days_ago):
+        with open(self.registry.path) as f:
+            registry = json.load(f)
+        last_used = datetime.now(timezone.utc) - timedelta(days=days_ago)
+        registry["indexes"][name]["last_used_at"] = last_used.isoformat()
+        with open(self.registry.path, "w") as f:
+            json.dump(registry, f)
+
+    def gc(self, *args):
+        """Runs gc_db over the temporary project and returns what it printed."""
+        output = io.StringIO()
+        with contextlib.ExitStack() as stack:
+            for name, value in {
+                "PROJECT_DIR": self.project_dir,
+                "DB_DIR": self.db_dir,
+                "REGISTRY_PATH": self.registry.path,
+                "TRAINED_AGENTS_PATH": self.trained_agents,
+            }.items():
+                stack.enter_context(patch.object(index_registry, name, value))
+            self.delete_collections = stack.enter_context(patch.object(index_registry, "delete_collections"))
+            stack.enter_context(patch.object(sys, "argv", ["gc_db", *args]))
+            stack.enter_context(contextlib.redirect_stdout(output))
+            index_registry.gc_main()
+        return output.getvalue()
+
+    def test_live_indexes_are_never_selected(self):
+        garbage = find_garbage(self.db_dir, self.registry)
+
+        self.assertEqual(garbage, {
+            "directories": [
+                os.path.join(self.db_dir, ".ai_act_index-abc123"),
+                os.path.join(self.db_dir, ORPHAN_SEGMENT),
+            ],
+            "collections": ["pdf-outdated", "pdf-stray"],
+            "entries": ["pdf-outdated", "pdf-gone"],
+        })
+
+    def test_changed_source_invalidates_the_ai_act_index(self):
+        self.write(self.regulation, b"%PDF amended regulation")
+        garbage = find_garbage(self.db_dir, self.registry)
+
+        self.assertIn(os.path.join(self.db_dir, "ai_act_index"), garbage["directories"])
+        self.assertIn("ai_act_index", garbage["entries"])
+
+    def test_max_age_selects_unused_collections(self):
+        self.set_last_used("pdf-live", days_ago=40)
+
+        self.assertNotIn("pdf-live", find_garbage(self.db_dir, self.registry)["collections"])
+        self.assertNotIn("pdf-live", find_garbage(self.db_dir, self.registry, timedelta(days=60))["collections"])
+        self.assertIn("pdf-live", find_garbage(self.db_dir, self.registry, timedelta(days=30))["collections"])
+
+    def test_dry_run_changes_nothing(self):
+        before = sorted(os.listdir(self.db_dir))
+        output = self.gc()
+
+        self.assertIn("Would remove db/" + ORPHAN_SEGMENT, output)
+        self.assertIn("rerun with --delete", output)
+        self.assertNotIn("trained_agents_data.pkl", output)
+        self.assertEqual(sorted(os.listdir(self.db_dir)), before)
+        self.assertEqual(len(self.registry.load()), 4)
+        self.delete_collections.assert_not_called()
+
+    def test_delete_removes_only_the_garbage(self):
+        self.gc("--delete")
+
+        self.assertEqual(
+            sorted(os.listdir(self.db_dir)), sorted(["ai_act_index", "chroma.sqlite3", LIVE_SEGMENT, "registry.json"])
+        )
+        self.delete_collections.assert_called_once_with(["pdf-outdated", "pdf-stray"], self.db_dir)
+        self.assertEqual(sorted(self.registry.load()), ["ai_act_index", "pdf-live"])
+        self.assertTrue(os.path.exists(self.trained_agents))
+
+    def test_delete_with_max_age(self):
+        self.set_last_used("pdf-live", days_ago=40)
+        self.gc("--delete", "--max-age-days", "30")
+
+        self.assertIn("pdf-live", self.delete_collections.call_args.args[0])
+        self.assertEqual(list(self.registry.load()), ["ai_act_index"])
+
+    def test_trained_agents_data_is_only_removed_on_request(self):
+        self.gc("--delete", "--max-age-days", "1")
+        self.assertTrue(os.path.exists(self.trained_agents))
+
+        self.gc("--delete", "--trained-agents-data")
+        self.assertFalse(os.path.exists(self.trained_agents))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sys
+
+# Add the src directory to sys.path to ensure imports work correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import unittest
+from unittest.mock import patch
+
+from ai_act_compliance_checker import timing
+from ai_act_compliance_checker.timing import TaskTimer
+
+DAG = {
+    "ai_compliance_action_planner": [],
+    "ai_compliance_coach": [],
+    "ai_compliance_report_merger": ["ai_compliance_action_planner", "ai_compliance_coach"],
+}
+
+
+class TestTaskTimer(unittest.TestCase):
+    """
+    Unit tests for the task durations and the critical path of a crew run.
+    """
+
+    def run_tasks(self, dependencies, finished_at):
+        """Records a run starting at 0s in which each task finishes at the given second."""
+        timer = TaskTimer(dependencies)
+        with patch.object(timing.time, "perf_counter", return_value=0.0):
+            timer.start()
+        for name, seconds in finished_at:
+            with patch.object(timing.time, "perf_counter", return_value=seconds):
+                timer.callback_for(name)(None)
+        return timer
+
+    def test_parallel_tasks_wait_for_the_slowest_dependency(self):
+        timer = self.run_tasks(DAG, [
+            ("ai_compliance_coach", 4.0),
+            ("ai_compliance_action_planner", 10.0),
+            ("ai_compliance_report_merger", 13.0),
+        ])
+
+        self.assertEqual(timer.durations(), {
+            "ai_compliance_coach": 4.0,
+            "ai_compliance_action_planner": 10.0,
+            "ai_compliance_report_merger": 3.0,
+        })
+        self.assertEqual(timer.critical_path(), ["ai_compliance_action_planner", "ai_compliance_report_merger"])
+        self.assertIn("= 13.0s of 13.0s wall time", timer.report())
+        self.assertIn("Sum of task durations: 17.0s", timer.report())
+
+    def test_sequential_tasks_form_a_single_path(self):
+        timer = self.run_tasks(
+            {"ai_compliance_action_planner": [], "ai_compliance_coach": ["ai_compliance_action_planner"]},
+            [("ai_compliance_action_planner", 5.0), ("ai_compliance_coach", 8.0)],
+        )
+
+        self.assertEqual(timer.durations(), {"ai_compliance_action_planner": 5.0, "ai_compliance_coach": 3.0})
+        self.assertEqual(timer.critical_path(), ["ai_compliance_action_planner", "ai_compliance_coach"])
+
+    def test_no_finished_task(self):
+        timer = self.run_tasks(DAG, [])
+        self.assertEqual(timer.critical_path(), [])
+        self.assertIn("0.0s wall time", timer.report())
+
+
+if __name__ == "__main__":
+    unittest.main()